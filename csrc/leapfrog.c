@@ -7,8 +7,10 @@
 * This is the entire leapfrog-in-C method. It is coded such that it may be
 * linked using "leapfrog.h" or compiled as a shared library (i.e. '.dll', '.so' 
 * etc.). The code is explained with each function but the only functions
-* and variables that are meant to be availble for export are minimize and 
-* N_RESULTS. The rest are helper functions for the optimizaition algorithm.
+* and variables that are meant to be availble for export are minimize, 
+* minimize_batch, N_RESULTS and the ask/tell interface (lf_create, lf_ask, lf_tell, 
+* lf_result and lf_free). The rest are helper functions for the 
+* optimizaition algorithm.
 * 
 * This algorithm is based the Leapfrogging Optimization Algorithm published 
 * by Dr. R. Russell Rhinehart. The following publications explain the technique:
@@ -28,45 +30,136 @@
 #include <stdlib.h>
 #include <time.h>
 #include <math.h>
+#include <string.h>
+#include <stdint.h>
 
 #include "dbg.h"
 
+#ifdef _OPENMP
+    #include <omp.h>
+#endif
+
 #ifdef OUT_EXE
     #include "leapfrog.h"
 #endif
 
-const size_t N_RESULTS = 7;
+const size_t N_RESULTS = 9;
 
 
-typedef struct {
+typedef struct leapfrog_data {
 
     double (*f)(double* x, size_t xlen);   // the objective function
     double (*g)(double* x, size_t xlen);   // the constraint function
     size_t xlen;            // the number of args in f and g
     size_t points;          // the number of points for optimization
 
+    void* arena;            // the single allocation holding the arrays below
     double* lower;          // the lower bounds; length = xlen
     double* upper;          // the upper bounds; length = xlen
-    double** pointset;      // point set; shape = (points, xlen)
-    int free_pointset;      // (bool) free the pointset when done?
+    double* pointset;       // row-major point set; shape = (points, xlen)
     double* objs;           // the objective function values; length = points
+    double* cons;           // the constraint function values; length = points
+    char* feasible;         // (bool) is each point feasible; length = points
+    size_t n_infeasible;    // the number of infeasible points
 
-    size_t* discrete;       // array of discrete indices
-    size_t discretelen;     // length of discrete
+    char* discrete;         // (bool) is each variable discrete; length = xlen
 
     size_t nfev;            // number of function evaluations
+    size_t ncev;            // number of constraint function evaluations
     double maxcv;           // maximum constraint violation
 
     size_t besti;           // the index of the best point
     size_t worsti;          // the index of the worst point
+    size_t* minheap;        // indices of objs in a min heap; length = points
+    size_t* minpos;         // position of each index in minheap
+    size_t* maxheap;        // indices of objs in a max heap; length = points
+    size_t* maxpos;         // position of each index in maxheap
     double error;           // the value of the convergence error
+    double* dists;          // distance of each point to the best; length = points
+    double* norms;          // normalizers taken from the best; length = xlen
+    double dist_sum;        // sum of dists
+    size_t dist_besti;      // the best index dists was built around
+    int dist_stale;         // (bool) must dists be rebuilt?
     double tol;             // convergence tolerance
     double big;             // punishing number. A big, positive number.
+    int synoptic;           // (bool) use synoptic leapfrogging?
+    size_t iters;           // the number of iterations completed
+    uint64_t rng[4];        // xoshiro256** random number generator state
+
+    int initialized;        // (bool) has the point set been evaluated?
+    char* pending;          // (bool) is each row asked but not told
+    size_t n_pending;       // the number of rows asked but not told
+    size_t next_row;        // the next row to ask for
 
 } leapfrog_data;
 
 
-double uniform(double lower, double upper)
+// also declared in leapfrog.h
+#ifndef __LEAPFROG_H__
+typedef struct {
+
+    double (*f)(double* x, size_t xlen);   // the objective function
+    double (*g)(double* x, size_t xlen);   // the constraint function or NULL
+    double* lower;          // the lower bounds; length = xlen
+    double* upper;          // the upper bounds; length = xlen
+    size_t xlen;            // the number of args in f and g
+    size_t seedval;         // random seed
+    double* pointset;       // row-major starting point set or NULL
+    int init_pointset;      // (bool) reinitialize the given pointset?
+    double* solution;       // output; length = xlen + N_RESULTS
+
+} leapfrog_problem;
+#endif
+
+
+uint64_t splitmix64(uint64_t* state)
+{
+/**
+* Advances @param state and @returns the next splitmix64 output. Used to
+* expand a seed into the xoshiro256** state.
+*/
+    uint64_t z = (*state += 0x9e3779b97f4a7c15);
+    z = (z ^ (z >> 30)) * 0xbf58476d1ce4e5b9;
+    z = (z ^ (z >> 27)) * 0x94d049bb133111eb;
+    return z ^ (z >> 31);
+}
+
+
+void seed_random(leapfrog_data* self, size_t seedval)
+{
+/**
+* Seeds the random number generator of @param self with @param seedval.
+* A seed of 0 seeds from the time and the address of @param self so that
+* unseeded optimizations running at the same time differ.
+*/
+    uint64_t state = seedval;
+    if(!seedval) state = (uint64_t)time(0) ^ (uint64_t)(uintptr_t)self;
+    for(size_t i = 0; i < 4; i++) self->rng[i] = splitmix64(&state);
+}
+
+
+uint64_t next_random(leapfrog_data* self)
+{
+/**
+* @returns the next 64 random bits from the xoshiro256** generator of
+* @param self. Each optimization owns its generator so concurrent 
+* optimizations neither interfere nor lose reproducibility.
+*/
+    uint64_t* s = self->rng;
+    uint64_t result = s[1] * 5;
+    result = ((result << 7) | (result >> 57)) * 9;
+    uint64_t t = s[1] << 17;
+    s[2] ^= s[0];
+    s[3] ^= s[1];
+    s[1] ^= s[2];
+    s[0] ^= s[3];
+    s[2] ^= t;
+    s[3] = (s[3] << 45) | (s[3] >> 19);
+    return result;
+}
+
+
+double uniform(leapfrog_data* self, double lower, double upper)
 {
 /**
 * @returns a random double between
@@ -74,7 +167,7 @@ double uniform(double lower, double upper)
 * uniform distribution.
 */
     check(lower <= upper, "Invalid input! %f, %f", lower, upper);
-    double frac = 1.0 * rand() / RAND_MAX;
+    double frac = (next_random(self) >> 11) * 0x1.0p-53;
     return (upper - lower) * frac + lower;
 
 error:
@@ -82,55 +175,116 @@ error:
 }
 
 
-double** zeros(size_t rows, size_t columns)
+double* point(leapfrog_data* self, size_t row)
 {
 /**
-* Allocs a 2d array initialized with zeros. 
-* Returns a pointer to the array.
+* @returns a pointer to the first coordinate of @param row of the point set.
 */
-    check(rows > 0 && columns > 0,
-        "'rows' and 'columns' must be greater than 0.");
-    size_t i;
-    size_t j;
-    double**  the_array = (double**)  malloc(rows*sizeof(double*));
+    return self->pointset + row * self->xlen;
+}
+
+
+void free_data(leapfrog_data* self)
+{
+/**
+* Frees all mallocs associated with @function alloc_leapfrog and the 
+* leapfrog_data struct itself.
+*/
+    if(!self) return;
+    if(self->arena) free(self->arena);
+    free(self);
+}
+
+
+int heap_before(leapfrog_data* self, size_t i, size_t j, int reverse)
+{
+/**
+* @returns true if index @param i belongs above index @param j in the
+* min heap (or the max heap if @param reverse). Ties go to the lowest index.
+*/
+    if(self->objs[i] == self->objs[j]) return i < j;
+    if(reverse) return self->objs[i] > self->objs[j];
+    return self->objs[i] < self->objs[j];
+}
+
 
-    for (i = 0; i < rows; i++){
-        the_array[i] = (double*) malloc(columns*sizeof(double));
-        for (j = 0; j < columns; j++){
-            the_array[i][j] = 0.0;
+void heap_swap(size_t* heap, size_t* pos, size_t a, size_t b)
+{
+/**
+* Swaps the heap entries at positions @param a and @param b.
+*/
+    size_t tmp = heap[a];
+    heap[a] = heap[b];
+    heap[b] = tmp;
+    pos[heap[a]] = a;
+    pos[heap[b]] = b;
+}
+
+
+void heap_sift_down(leapfrog_data* self, size_t* heap, size_t* pos, 
+                    size_t k, int reverse)
+{
+/**
+* Moves the entry at position @param k of @param heap down until it is
+* in heap order with its children.
+*/
+    size_t child;
+    while(1){
+        child = 2 * k + 1;
+        if(child >= self->points) break;
+        if(child + 1 < self->points && 
+                heap_before(self, heap[child + 1], heap[child], reverse)){
+            child++;
         }
+        if(!heap_before(self, heap[child], heap[k], reverse)) break;
+        heap_swap(heap, pos, k, child);
+        k = child;
     }
+}
 
-    return the_array;
 
-error:
-    return NULL;
+void heap_sift(leapfrog_data* self, size_t* heap, size_t* pos, 
+               size_t k, int reverse)
+{
+/**
+* Moves the entry at position @param k of @param heap up or down until
+* the heap order is restored.
+*/
+    size_t parent, start = k;
+    while(k > 0){
+        parent = (k - 1) / 2;
+        if(!heap_before(self, heap[k], heap[parent], reverse)) break;
+        heap_swap(heap, pos, k, parent);
+        k = parent;
+    }
+    if(k == start) heap_sift_down(self, heap, pos, k, reverse);
 }
 
 
-void free_array_2d(double** array, size_t rows)
+void init_heaps(leapfrog_data* self)
 {
 /**
-* Frees all mallocs associated with @fuction zeros thereby freeing
-* @param array.
+* Builds the min and max heaps over all of the objective function values.
 */
-    for (size_t i = 0; i < rows; i++){
-        if (array[i]) free(array[i]);
+    for(size_t i = 0; i < self->points; i++){
+        self->minheap[i] = self->minpos[i] = i;
+        self->maxheap[i] = self->maxpos[i] = i;
+    }
+    for(size_t k = self->points / 2; k-- > 0;){
+        heap_sift_down(self, self->minheap, self->minpos, k, 0);
+        heap_sift_down(self, self->maxheap, self->maxpos, k, 1);
     }
-    if(array) free(array);
 }
 
 
-void free_data(leapfrog_data* self)
+void update_heaps(leapfrog_data* self, size_t row)
 {
 /**
-* Frees all mallocs associated with @function init_leapfrog
-* will free an allocated leapfrog_data struct.
+* Restores the order of the min and max heaps after the objective
+* function value of @param row has changed. O(log(points))
 */
-    if(self->objs) free(self->objs);
-    if(self->pointset && self->free_pointset) 
-            free_array_2d(self->pointset, self->points);
-    if(self) free(self);
+    heap_sift(self, self->minheap, self->minpos, self->minpos[row], 0);
+    heap_sift(self, self->maxheap, self->maxpos, self->maxpos[row], 1);
 }
 
 
@@ -139,29 +293,77 @@ void eval_best_worst(leapfrog_data* self)
 /**
 * Evaluates and adjusts @param self's best and worst
 * attributes to the best and worst indices in the pointset.
+* The current best (or worst) is kept when it ties with the top of
+* the heap; otherwise the lowest index with the best (or worst) value 
+* is taken.
 */
-    for(size_t i = 0; i < self->points; i++){
-        if(self->objs[i] < self->objs[self->besti]){
-            self->besti = i;
-        }
-        if(self->objs[i] > self->objs[self->worsti]){
-            self->worsti = i;
-        }
+    size_t best = self->minheap[0], worst = self->maxheap[0];
+    if(self->objs[best] < self->objs[self->besti]) self->besti = best;
+    if(self->objs[worst] > self->objs[self->worsti]) self->worsti = worst;
+}
+
+
+void enforce_discrete(leapfrog_data* self, double* x, size_t j)
+{
+/**
+* Enforces discrete variables by changing element @param j of @param x
+* to a whole double value if it is discrete. O(1)
+*/
+    if(self->discrete[j]) x[j] = (double)(int)x[j];
+}
+
+
+double heap_top_except(leapfrog_data* self, size_t* heap, size_t row, 
+                       int reverse)
+{
+/**
+* Returns the smallest (or the largest if @param reverse) objective 
+* function value in @param heap other than that of @param row, whose 
+* value may have changed since the heap was last ordered. Every other 
+* entry is still in heap order so this is one of the top three. O(1)
+*/
+    if(heap[0] != row || self->points < 2) return self->objs[heap[0]];
+    if(self->points == 2 || heap_before(self, heap[1], heap[2], reverse)){
+        return self->objs[heap[1]];
     }
+    return self->objs[heap[2]];
 }
 
 
-void enforce_discrete(leapfrog_data* self, size_t i, size_t j)
+double max_abs_objective(leapfrog_data* self, size_t row)
 {
 /**
-* Enforces discrete variables by changing all applicable
-* values to whole double values.
+* Returns the largest absolute objective function value in the point set
+* after the value of @param row has changed and before the heaps are 
+* updated. The extremes of the other rows are read from the tops of the
+* min and max heaps so this is O(1).
 */
-    if(!self->discrete) return;
-    for(size_t dis = 0; dis < self->discretelen; dis++){
-        if(self->discrete[dis] == j){
-            self->pointset[i][j] = (double)(int)self->pointset[i][j];
-        }
+    double big = fabs(self->objs[row]);
+    double lo = fabs(heap_top_except(self, self->minheap, row, 0));
+    double hi = fabs(heap_top_except(self, self->maxheap, row, 1));
+    if(lo > big) big = lo;
+    if(hi > big) big = hi;
+    return big;
+}
+
+
+void apply_constraint(leapfrog_data* self, size_t row, double constraint_value)
+{
+/**
+* Caches @param constraint_value for @param row and punishes the row if
+* it is infeasible. See enforce_constraints.
+*/
+    char feasible = !(constraint_value > 0.0);
+    if(feasible != self->feasible[row]){
+        if(feasible) self->n_infeasible--;
+        else self->n_infeasible++;
+    }
+    self->cons[row] = constraint_value;
+    self->feasible[row] = feasible;
+    if(!feasible){
+        if(constraint_value > self->maxcv) self->maxcv = constraint_value;
+        self->big = max_abs_objective(self, row);
+        self->objs[row] = self->big + constraint_value;
     }
 }
 
@@ -185,34 +387,83 @@ void enforce_constraints(leapfrog_data* self, size_t row)
 * This means a return value > 0 from the constraint function
 * indicates the constraint has been violated, otherwise the point
 * is feasible.
+*
+* The constraint value and feasibility of @param row are cached in
+* self->cons and self->feasible so that the constraint function is
+* only called when a point changes. The punishing number self->big is the
+* largest absolute objective function value, read from the best/worst 
+* heaps in O(1) rather than by scanning the point set.
 */
     if(!self->g) return;
-    double big = 0.0, mbig, constraint_value;
-    for(size_t i = 0; i < self->points; i++){
-        mbig = fabs(self->objs[i]);
-        if(mbig > big) big = mbig;
+    double constraint_value = self->g(point(self, row), self->xlen);
+    self->ncev++;
+    apply_constraint(self, row, constraint_value);
+}
+
+
+double row_distance(leapfrog_data* self, size_t row)
+{
+/**
+* @returns the normalized distance between @param row and the best
+* point that self->dists was built around.
+*/
+    double dist = 0.0;
+    double* best = point(self, self->dist_besti);
+    for(size_t j = 0; j < self->xlen; j++){
+        dist += fabs((best[j] - point(self, row)[j])/self->norms[j]);
     }
-    constraint_value = self->g(self->pointset[row], self->xlen);
-    if(constraint_value > 0.0){
-        if(constraint_value > self->maxcv) self->maxcv = constraint_value;
-        self->objs[row] = big + constraint_value;
+    return dist;
+}
+
+
+void rescan_distance(leapfrog_data* self)
+{
+/**
+* Rebuilds the distance of every point to the current best point.
+* O(points * xlen)
+*/
+    self->dist_besti = self->besti;
+    self->dist_stale = 0;
+    self->dist_sum = 0.0;
+    for(size_t j = 0; j < self->xlen; j++){
+        if(fabs(point(self, self->besti)[j]) < self->tol){
+            self->norms[j] = self->tol;
+        }
+        else self->norms[j] = point(self, self->besti)[j];
+    }
+    for(size_t i = 0; i < self->points; i++){
+        self->dists[i] = row_distance(self, i);
+        self->dist_sum += self->dists[i];
     }
 }
 
 
-void leapfrog(leapfrog_data* self)
+void update_distance(leapfrog_data* self, size_t row)
 {
 /**
-* Core step in the leapfrogging algorithm. Takes a best and worst
-* index of the 'pointset' and generates a new point in place of
-* the worst by "leapfrogging" over the point corresponding to the
-* 'best' index.
+* Updates the distance sum after @param row has been replaced. O(xlen)
+*/
+    double dist;
+    if(row == self->dist_besti) self->dist_stale = 1;
+    if(self->dist_stale) return;
+    dist = row_distance(self, row);
+    self->dist_sum += dist - self->dists[row];
+    self->dists[row] = dist;
+}
+
+
+void leap_into(leapfrog_data* self, size_t row, double* x)
+{
+/**
+* Writes to @param x a point drawn uniformly between the best point and
+* the reflection of @param row over it, clipped to the bounds. @param x
+* may be the row itself.
 */
     double b1, b2;
     for(size_t j = 0; j < self->xlen; j++){
-        b1 = self->pointset[self->besti][j];
-        b2 = 2.0 * self->pointset[self->besti][j] -\
-            self->pointset[self->worsti][j];
+        b1 = point(self, self->besti)[j];
+        b2 = 2.0 * point(self, self->besti)[j] -\
+            point(self, row)[j];
         if(b2 < b1){
             b1 = b1 + b2;
             b2 = b1 - b2;
@@ -220,12 +471,62 @@ void leapfrog(leapfrog_data* self)
         }
         if(b1 < self->lower[j]) b1 = self->lower[j];
         if(b2 > self->upper[j]) b2 = self->upper[j];
-        self->pointset[self->worsti][j] = uniform(b1, b2);
-        enforce_discrete(self, self->worsti, j);
+        x[j] = uniform(self, b1, b2);
+        enforce_discrete(self, x, j);
     }
-    self->objs[self->worsti] = self->f(self->pointset[self->worsti], self->xlen);
+}
+
+
+void leap(leapfrog_data* self, size_t row)
+{
+/**
+* Replaces the coordinates of @param row with a leap over the best point.
+*/
+    leap_into(self, row, point(self, row));
+}
+
+
+void evaluate(leapfrog_data* self, size_t row)
+{
+/**
+* Evaluates the objective and constraint functions at @param row and 
+* updates the best/worst heaps and the distance sum to match.
+*/
+    self->objs[row] = self->f(point(self, row), self->xlen);
     self->nfev++;
-    enforce_constraints(self, self->worsti);
+    enforce_constraints(self, row);
+    update_heaps(self, row);
+    update_distance(self, row);
+}
+
+
+void leapfrog(leapfrog_data* self)
+{
+/**
+* Core step in the leapfrogging algorithm. Takes a best and worst
+* index of the 'pointset' and generates a new point in place of
+* the worst by "leapfrogging" over the point corresponding to the
+* 'best' index.
+*/
+    leap(self, self->worsti);
+    evaluate(self, self->worsti);
+}
+
+
+void synoptic_leapfrog(leapfrog_data* self)
+{
+/**
+* Synoptic leapfrogging step. Every point except the best leaps over 
+* the best, then the whole generation is evaluated before the best and
+* worst are updated.
+*/
+    size_t i;
+    for(i = 0; i < self->points; i++){
+        if(i != self->besti) leap(self, i);
+    }
+    for(i = 0; i < self->points; i++){
+        if(i != self->besti) evaluate(self, i);
+    }
 }
 
 
@@ -238,104 +539,214 @@ void calculate_convergence(leapfrog_data* self)
 * the best point and summing the two values together. This
 * convergence value is taken as the error of the optimization
 * and once the error <= tolerance the optimization ends.
+*
+* The distance sum is kept up to date by update_distance and is only
+* rebuilt when the best point changes, since every distance is normalized
+* by it, or when the sum is small enough to decide convergence so 
+* round-off from the running updates never decides termination.
 */
     double objective_best = self->objs[self->besti];
     double objective_worst = self->objs[self->worsti];
-    double norm1, err_obj, dist_sum = 0.0, constraint_penalty = 0.0;
+    double norm1, err_obj, constraint_penalty = 0.0;
 
     if(fabs(objective_best) < self->tol) norm1 = self->tol;
     else norm1 = objective_best;
     err_obj = fabs((objective_worst - objective_best)/norm1);
-    for(size_t i = 0; i < self->points; i++){
-        if(self->g && self->g(self->pointset[i], self->xlen) > 0.0){
-            constraint_penalty = 2.0 * self->tol;
-        }
-        for(size_t j = 0; j < self->xlen; j++){
-            if(fabs(self->pointset[self->besti][j]) < self->tol){
-                norm1 = self->tol;
-            }
-            else norm1 = self->pointset[self->besti][j];
-            dist_sum += fabs(
-                (self->pointset[self->besti][j] - self->pointset[i][j])/norm1);
-        }
+    if(self->n_infeasible) constraint_penalty = 2.0 * self->tol;
+    if(self->dist_stale || self->dist_besti != self->besti || 
+            self->dist_sum < self->tol){
+        rescan_distance(self);
     }
-    // log_info("\nERRS: obj: %f dst: %f", err_obj, dist_sum);
-    self->error = err_obj + dist_sum + constraint_penalty;
+    // log_info("\nERRS: obj: %f dst: %f", err_obj, self->dist_sum);
+    self->error = err_obj + self->dist_sum + constraint_penalty;
 }
 
 
-void iterate(leapfrog_data* self)
+void end_iteration(leapfrog_data* self)
 {
 /**
-* Completes one iteration of the leapfrog optimization algorithm.
+* Finds the new best and worst and updates the convergence error.
 */
-    leapfrog(self);
     eval_best_worst(self);
     calculate_convergence(self);
+    self->iters++;
 }
 
 
-leapfrog_data* init_leapfrog(double (*fptr)(double* x, size_t xlen), 
-                            double* lower, double* upper, size_t xlen, size_t points,
-                            double (*gptr)(double* x, size_t xlen), 
-                            size_t* discrete, size_t discretelen, double tol,
-                            double** pointset, int init_pointset)
+void iterate(leapfrog_data* self)
 {
 /**
-* Allocates memory for and initializes the main leapfrog_data struct
-* to be used in the optimization.
+* Completes one iteration of the leapfrog optimization algorithm.
+* In synoptic mode one iteration is a whole generation of leaps.
+*/
+    if(self->synoptic) synoptic_leapfrog(self);
+    else leapfrog(self);
+    end_iteration(self);
+}
+
+
+leapfrog_data* alloc_leapfrog(double* lower, double* upper, size_t xlen, 
+                              size_t points, size_t* discrete, 
+                              size_t discretelen, double tol, size_t seedval,
+                              double* pointset, int init_pointset)
+{
+/**
+* Allocates memory for the main leapfrog_data struct and fills in the 
+* starting point set. The point set is not evaluated.
+*
+* Every array is carved out of one zeroed allocation (self->arena) with 
+* the doubles first, then the size_t arrays and then the flags so each 
+* array stays aligned. @param lower and @param upper are copied into it
+* and the indices in @param discrete are turned into a byte mask with one
+* flag per variable. @param pointset is used in place when it is given 
+* and is allocated in the arena otherwise.
 */
+    size_t n_doubles = 3 * points + 3 * xlen + (pointset ? 0 : points * xlen);
+    size_t n_indices = 4 * points;
     leapfrog_data* self = (leapfrog_data*) malloc(sizeof(leapfrog_data));
-    self->f = fptr;
-    self->g = gptr;
+    self->arena = calloc(1, 
+        n_doubles * sizeof(double) + n_indices * sizeof(size_t) + 2 * points + 
+        xlen);
+
+    double* doubles = (double*) self->arena;
+    self->objs = doubles;
+    self->cons = doubles + points;
+    self->dists = doubles + 2 * points;
+    self->lower = doubles + 3 * points;
+    self->upper = self->lower + xlen;
+    self->norms = self->upper + xlen;
+    self->pointset = pointset ? pointset : self->norms + xlen;
+
+    size_t* indices = (size_t*) (doubles + n_doubles);
+    self->minheap = indices;
+    self->minpos = indices + points;
+    self->maxheap = indices + 2 * points;
+    self->maxpos = indices + 3 * points;
+
+    char* flags = (char*) (indices + n_indices);
+    self->feasible = flags;
+    self->pending = flags + points;
+    self->discrete = flags + 2 * points;
+
+    self->f = NULL;
+    self->g = NULL;
     self->xlen = xlen;
     self->points = points;
-    self->pointset = !pointset ? zeros(points, self->xlen + 1) : pointset;
-    self->free_pointset = !pointset ? 1 : 0;
-    self->objs = (double*) malloc(sizeof(double) * self->points);
+    memset(self->feasible, 1, sizeof(char) * self->points);
+    self->n_infeasible = 0;
+    self->dist_sum = 0.0;
+    self->dist_besti = 0;
+    self->dist_stale = 1;
+    self->synoptic = 0;
+    self->iters = 0;
+    seed_random(self, seedval);
+    self->initialized = 0;
+    self->n_pending = 0;
+    self->next_row = 0;
     self->nfev = 0;
+    self->ncev = 0;
     self->maxcv = 0.0;
     self->besti = 0;
     self->worsti = 0;
     self->error = 100.0;
-    self->lower = lower;
-    self->upper = upper;
-    self->discrete = discrete;
-    self->discretelen = discretelen;
+    memcpy(self->lower, lower, sizeof(double) * xlen);
+    memcpy(self->upper, upper, sizeof(double) * xlen);
     self->tol = tol;
 
-    if(discrete){
-        for(size_t i = 0; i < discretelen; i++){
-            self->lower[self->discrete[i]] = \
-                ((double)(int)self->lower[self->discrete[i]]) +  0.999;
+    for(size_t i = 0; i < discretelen; i++){
+        if(discrete[i] < xlen) self->discrete[discrete[i]] = 1;
+    }
+    for(size_t j = 0; j < xlen; j++){
+        if(self->discrete[j]){
+            self->lower[j] = ((double)(int)self->lower[j]) +  0.999;
         }
     }
     for(size_t i = 0; i < self->points; i++){
         for(size_t j = 0; j < self->xlen; j++){
             if(!pointset || init_pointset)
-                self->pointset[i][j] = uniform(self->lower[j], self->upper[j]);
-            else self->pointset[i][j] = pointset[i][j];
-            enforce_discrete(self, i, j);
+                point(self, i)[j] = uniform(
+                    self, self->lower[j], self->upper[j]);
+            enforce_discrete(self, point(self, i), j);
         }
-        self->objs[i] = self->f(self->pointset[i], self->xlen);
-        self->nfev++;
     }
+    return self;
+}
+
+
+void finish_init(leapfrog_data* self)
+{
+/**
+* Finds the initial best and worst once every objective function value
+* of the point set is known and enforces the constraints. Constraint
+* values told through lf_tell are taken from self->cons.
+*/
+    init_heaps(self);
     eval_best_worst(self);
     for(size_t i = 0; i < self->points; i++){
-        enforce_constraints(self, i);
+        if(self->g) enforce_constraints(self, i);
+        else apply_constraint(self, i, self->cons[i]);
+        update_heaps(self, i);
     }
     eval_best_worst(self);
+    self->initialized = 1;
+}
+
+
+leapfrog_data* init_leapfrog(double (*fptr)(double* x, size_t xlen), 
+                            double* lower, double* upper, size_t xlen, size_t points,
+                            double (*gptr)(double* x, size_t xlen), 
+                            size_t* discrete, size_t discretelen, double tol,
+                            size_t seedval, double* pointset, int init_pointset)
+{
+/**
+* Allocates memory for and initializes the main leapfrog_data struct
+* to be used in the optimization.
+*/
+    leapfrog_data* self = alloc_leapfrog(
+        lower, upper, xlen, points, discrete, discretelen, tol, seedval,
+        pointset, init_pointset
+    );
+    self->f = fptr;
+    self->g = gptr;
+    for(size_t i = 0; i < self->points; i++){
+        self->objs[i] = self->f(point(self, i), self->xlen);
+        self->nfev++;
+    }
+    finish_init(self);
     return self;
 }
 
 
+void write_solution(leapfrog_data* self, double status, size_t iters, 
+                    double* solution)
+{
+/**
+* Copies the optimization output to @param solution. See minimize for
+* the layout.
+*/
+    size_t xlen = self->xlen;
+    for(size_t i = 0; i < xlen; i++){
+        solution[i] = point(self, self->besti)[i];
+    }
+    solution[xlen + 0] = status;                     // opt exit status                        
+    solution[xlen + 1] = self->objs[self->besti];    // best objective funciton value     
+    solution[xlen + 2] = iters;                      // number of iterations
+    solution[xlen + 3] = self->error;                // the final error
+    solution[xlen + 4] = self->maxcv;                // the max constraint violaion
+    solution[xlen + 5] = self->besti;                // the index of the best player
+    solution[xlen + 6] = self->worsti;               // the index of the worst player
+    solution[xlen + 7] = self->ncev;                 // constraint evaluations
+    solution[xlen + 8] = self->nfev;                 // objective evaluations
+}
+
+
 void minimize(
         double (*fptr)(double*, size_t), double* lower, double* upper,
         size_t xlen, size_t points, double (*gptr)(double*, size_t),
         size_t* discrete, size_t discretelen, size_t maxit,
-        double tol, size_t seedval, double** pointset,
+        double tol, size_t seedval, double* pointset,
         int init_pointset, void (*callback)(double*, size_t),
-        double* solution)
+        int synoptic, double* solution)
 {
 /**
 * Minimizes a function until the convergence criteria are
@@ -363,14 +774,20 @@ void minimize(
 *                   the bounded space remains the same
 * - maxit         : maximum iterations
 * - tol           : convergence tolerance
-* - seedval       : random seed
-* - pointset      : starting point set of shape (points, xlen); 
-                    if given, it will be changed.
+* - seedval       : random seed for the optimizer's own xoshiro256** 
+*                   generator; 0 seeds from the time
+* - pointset      : starting point set of shape (points, xlen) stored
+*                   row-major in one contiguous array; if given, it will 
+*                   be changed and holds the final point set on return.
 * - init_pointset : (bool) flag to say whether to use the given pointset
-                    or to reinitialize the pointset before optimizing.
+*                   or to reinitialize the pointset before optimizing.
 * - callback      : function to be called after each iteration; has
 *                   signature: void callback(double*)
-* - solution      : double array of length = xlen + 6 to which output
+* - synoptic      : (bool) use synoptic leapfrogging where each iteration
+*                   moves every point except the best over the best and
+*                   evaluates the whole generation before updating the
+*                   best and worst
+* - solution      : double array of length = xlen + N_RESULTS to which output
 *                   is copied.
 *
 * ## Returns
@@ -386,10 +803,12 @@ void minimize(
 *  - solution[xlen + 2]: the number of iterations (value should be a
 *       whole number > 0 and <= maxit)
 *   - solution[xlen + 3]: the final error of the optimization
-*   - solution[xlen + 6]: the maximum constraint violation that occurred during
+*   - solution[xlen + 4]: the maximum constraint violation that occurred during
 *       the optimization. If the function pointer is NULL then it is set to 0.0
-*   - solution[xlen + 4]: the index of the best player
-*   - solution[xlen + 5]: the index of the worst player
+*   - solution[xlen + 5]: the index of the best player
+*   - solution[xlen + 6]: the index of the worst player
+*   - solution[xlen + 7]: the number of constraint function evaluations
+*   - solution[xlen + 8]: the number of objective function evaluations
 */
 
 /***************** SANITIZE INPUT ********************/
@@ -401,30 +820,219 @@ void minimize(
 /***************** END SANITIZE INPUT ****************/
     size_t iters;
 
-    if(seedval) srand(seedval);
-    else srand(time(0));
-
     self = init_leapfrog(
         fptr, lower, upper, xlen, points, gptr, discrete, discretelen, 
-        tol, pointset, init_pointset
+        tol, seedval, pointset, init_pointset
     );
+    self->synoptic = synoptic;
     for(iters = 1; iters <= maxit; iters++) {
         iterate(self);
         if(self->error < tol)  break;
-        if(callback) callback(self->pointset[self->besti], self->xlen);
+        if(callback) callback(point(self, self->besti), self->xlen);
     }
     if(iters >= maxit) log_warn("Maximum iterations exceeded.");
-    
-    for(size_t i = 0; i < self->xlen; i++){
-        solution[i] = self->pointset[self->besti][i];
+    write_solution(self, iters >= maxit ? 1.0 : 0.0, iters, solution);
+error:
+    if(self) free_data(self);
+}
+
+
+void minimize_batch(
+        leapfrog_problem* problems, size_t n_problems, size_t points,
+        size_t* discrete, size_t discretelen, size_t maxit, double tol,
+        int synoptic, int n_threads)
+{
+/**
+* Solves @param n_problems independent problems in one call. Each
+* leapfrog_problem in @param problems gives the functions, bounds, seed,
+* optional starting point set and solution array of one problem; the 
+* other parameters are shared and are those of minimize. The output of 
+* each problem is written to its solution array as described in minimize.
+*
+* When compiled with OpenMP the problems are solved by @param n_threads 
+* threads (0 uses the OpenMP default). Without OpenMP they are solved one
+* after another. Each problem has its own random number generator so the
+* results do not depend on the number of threads.
+*/
+    check(problems, "Invalid NULL passed in.");
+    long i, n = (long)n_problems;
+#ifdef _OPENMP
+    if(n_threads <= 0) n_threads = omp_get_max_threads();
+    #pragma omp parallel for schedule(dynamic) num_threads(n_threads)
+#endif
+    for(i = 0; i < n; i++){
+        leapfrog_problem* problem = problems + i;
+        minimize(
+            problem->f, problem->lower, problem->upper, problem->xlen, 
+            points, problem->g, discrete, discretelen, maxit, tol, 
+            problem->seedval, problem->pointset, problem->init_pointset, 
+            NULL, synoptic, problem->solution
+        );
     }
-    solution[xlen + 0] = iters >= maxit ? 1.0 : 0.0; // opt exit status                        
-    solution[xlen + 1] = self->objs[self->besti];    // best objective funciton value     
-    solution[xlen + 2] = iters;                      // number of iterations
-    solution[xlen + 3] = self->error;                // the final error
-    solution[xlen + 4] = self->maxcv;                // the max constraint violaion
-    solution[xlen + 5] = self->besti;                // the index of the best player
-    solution[xlen + 6] = self->worsti;               // the index of the worst player
 error:
+    return;
+}
+
+
+leapfrog_data* lf_create(
+        double* lower, double* upper, size_t xlen, size_t points,
+        size_t* discrete, size_t discretelen, double tol, size_t seedval, 
+        double* pointset, int init_pointset, int synoptic)
+{
+/**
+* Creates a leapfrog optimizer whose evaluations are scheduled by the 
+* caller through lf_ask and lf_tell. The parameters are those of minimize.
+* The returned handle must be freed with lf_free. @returns NULL on invalid
+* input.
+*/
+    check(lower && upper && xlen && points && tol, "Invalid NULL passed in.");
+
+    leapfrog_data* self = alloc_leapfrog(
+        lower, upper, xlen, points, discrete, discretelen, tol, seedval,
+        pointset, init_pointset
+    );
+    self->synoptic = synoptic;
+    return self;
+
+error:
+    return NULL;
+}
+
+
+size_t lf_ask(leapfrog_data* self, size_t k, double* xs)
+{
+/**
+* Writes up to @param k new points to be evaluated to @param xs, row by
+* row, and @returns the number written. Until the point set has been
+* evaluated these are the rows of the starting point set. In synoptic
+* mode they are the leaps of the current generation and a new generation
+* starts once the last one has been told. Otherwise each point is a leap
+* of the current worst over the current best. A @param k of 0 asks for
+* every row of the point set or generation still available (at most 
+* points rows) or one leap in sequential mode.
+*/
+    size_t count = 0, row;
+    check(self && xs, "Invalid NULL passed in.");
+    if(self->initialized && !self->synoptic){
+        if(!k) k = 1;
+        for(; count < k; count++){
+            leap_into(self, self->worsti, xs + count * self->xlen);
+        }
+        return count;
+    }
+    if(self->initialized && self->next_row == self->points && 
+            !self->n_pending){
+        self->next_row = 0;
+    }
+    while(self->next_row < self->points && (!k || count < k)){
+        row = self->next_row++;
+        if(self->initialized){
+            if(row == self->besti) continue;
+            leap(self, row);
+        }
+        self->pending[row] = 1;
+        self->n_pending++;
+        memcpy(xs + count * self->xlen, point(self, row), 
+               sizeof(double) * self->xlen);
+        count++;
+    }
+    return count;
+
+error:
+    return 0;
+}
+
+
+void count_told(leapfrog_data* self, double* cons)
+{
+/**
+* Counts the evaluations of one point accepted by lf_tell.
+*/
+    self->nfev++;
+    if(cons) self->ncev++;
+}
+
+
+int lf_tell(leapfrog_data* self, size_t k, double* xs, double* values,
+            double* cons)
+{
+/**
+* Passes the objective function @param values and the constraint function
+* values @param cons (which may be NULL) of the @param k points in 
+* @param xs back to the optimizer. The points are normally ones returned 
+* by lf_ask and may be told in any order. In sequential mode any other 
+* point is accepted too and replaces the current worst.
+* @returns 1 once the tolerance condition is satisfied, 0 if it is not 
+* and -1 if a point was not asked for. The points before a rejected one
+* are kept and counted as evaluations; the rest are not.
+*/
+    size_t i, row;
+    double* x;
+    check(self && xs && values, "Invalid NULL passed in.");
+
+    for(i = 0; i < k; i++){
+        x = xs + i * self->xlen;
+        if(self->initialized && !self->synoptic){
+            count_told(self, cons);
+            row = self->worsti;
+            memcpy(point(self, row), x, sizeof(double) * self->xlen);
+            self->objs[row] = values[i];
+            apply_constraint(self, row, cons ? cons[i] : 0.0);
+            update_heaps(self, row);
+            update_distance(self, row);
+            end_iteration(self);
+            continue;
+        }
+
+        for(row = 0; row < self->points; row++){
+            if(self->pending[row] && !memcmp(
+                    point(self, row), x, sizeof(double) * self->xlen)) break;
+        }
+        check(row < self->points, "Point %zu was not asked for.", i);
+        count_told(self, cons);
+        self->pending[row] = 0;
+        self->n_pending--;
+        self->objs[row] = values[i];
+        if(self->initialized){
+            apply_constraint(self, row, cons ? cons[i] : 0.0);
+            update_heaps(self, row);
+            update_distance(self, row);
+        }
+        else self->cons[row] = cons ? cons[i] : 0.0;
+
+        if(!self->n_pending && self->next_row == self->points){
+            if(self->initialized) end_iteration(self);
+            else finish_init(self);
+        }
+    }
+    return self->initialized && self->error < self->tol;
+
+error:
+    return -1;
+}
+
+
+void lf_result(leapfrog_data* self, double* solution)
+{
+/**
+* Copies the current state to @param solution in the same layout as 
+* minimize. The status is 0 once the tolerance condition is satisfied
+* and 1 otherwise.
+*/
+    check(self && solution, "Invalid NULL passed in.");
+    write_solution(
+        self, self->initialized && self->error < self->tol ? 0.0 : 1.0,
+        self->iters, solution
+    );
+error:
+    return;
+}
+
+
+void lf_free(leapfrog_data* self)
+{
+/**
+* Frees an optimizer created by lf_create.
+*/
     if(self) free_data(self);
 }
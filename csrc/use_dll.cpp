@@ -93,8 +93,8 @@ int main(void)
     typedef void ext_func(
                 double (*)(double*, size_t), double*, double*, size_t,
                 size_t, double (*)(double*, size_t), size_t*, size_t,
-                size_t, double, size_t, double**, int,
-                void (*)(double*, size_t), double*);
+                size_t, double, size_t, double*, int,
+                void (*)(double*, size_t), int, double*);
     typedef size_t nr;
 
     HINSTANCE handle = dlopen(DLL_PATH, RTLD_NOW);
@@ -119,11 +119,10 @@ int main(void)
     size_t* discrete = new size_t[discretelen];
     double* best = new double[xlen + N_RESULTS];
 
-    double** start_ptr = new double*[points];
+    double* start_ptr = new double[points*xlen];
     for (size_t row = 0; row < points; row ++){
-        start_ptr[row] = new double[xlen];
         for (size_t col = 0; col < xlen; col ++){
-            start_ptr[row][col] = start_pts[row][col];
+            start_ptr[row*xlen + col] = start_pts[row][col];
         }
     }
 
@@ -136,7 +135,7 @@ int main(void)
     }
 
     minimize(fptr, lower, upper, xlen, points, gptr, discrete, discretelen,
-             maxit, tol, seedval, start_ptr, false, cbptr, best);
+             maxit, tol, seedval, start_ptr, false, cbptr, false, best);
 
     printf("SOLUTION: \n");
     for(i = 0; i < xlen + N_RESULTS; i++){
@@ -145,7 +144,7 @@ int main(void)
     printf("\n");
     for(i = 0; i < points; i++){
         for(j = 0; j < xlen; j++){
-            printf("%f ", start_ptr[i][j]);
+            printf("%f ", start_ptr[i*xlen + j]);
         }
         printf("\n");
     }
@@ -154,9 +153,6 @@ int main(void)
     delete[] discrete;
     delete[] lower;
     delete[] upper;
-    for (size_t row = 0; row < points; row ++){
-        delete[] start_ptr[row];
-    }
     delete[] start_ptr;
 
     dlclose(handle);
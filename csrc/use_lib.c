@@ -84,12 +84,11 @@ int main(int argc, char** argv)
     size_t* discrete = (size_t*)malloc(sizeof(size_t)*discretelen);
     double* best = (double*)malloc(sizeof(double)*(xlen + N_RESULTS));
 
-    double** start_ptr = (double**)malloc(sizeof(double*)*points);
+    double* start_ptr = (double*)malloc(sizeof(double)*points*xlen);
 
     for (size_t row = 0; row < points; row ++){
-        start_ptr[row] = (double*)malloc(sizeof(double)*xlen);
         for (size_t col = 0; col < xlen; col ++){
-            start_ptr[row][col] = start_pts[row][col];
+            start_ptr[row*xlen + col] = start_pts[row][col];
         }
     }
 
@@ -102,7 +101,7 @@ int main(int argc, char** argv)
     }
     
     minimize(fptr, lower, upper, xlen, points, gptr, discrete, discretelen,
-             maxit, tol, seedval, start_ptr, false, cbptr, best);
+             maxit, tol, seedval, start_ptr, false, cbptr, false, best);
 
     for(i = 0; i < xlen + N_RESULTS; i++){
         printf("%f ", best[i]);
@@ -113,9 +112,6 @@ int main(int argc, char** argv)
     free(discrete);
     free(lower);
     free(upper);
-    for (size_t row = 0; row < points; row++) {
-        if(start_ptr[row]) free(start_ptr[row]);
-    }
     free(start_ptr);
 
     return 0;
@@ -17,14 +17,69 @@ void minimize(
     size_t maxit,
     double tol, 
     size_t seedval, 
-    double** pointset,
+    double* pointset,
     int init_pointset, 
     void (*callback)(double*, size_t),
+    int synoptic,
     double* solution
 );
 
 const size_t N_RESULTS;
 
+typedef struct {
+    double (*f)(double*, size_t);
+    double (*g)(double*, size_t);
+    double* lower;
+    double* upper;
+    size_t xlen;
+    size_t seedval;
+    double* pointset;
+    int init_pointset;
+    double* solution;
+} leapfrog_problem;
+
+void minimize_batch(
+    leapfrog_problem* problems, 
+    size_t n_problems, 
+    size_t points,
+    size_t* discrete, 
+    size_t discretelen, 
+    size_t maxit, 
+    double tol,
+    int synoptic, 
+    int n_threads
+);
+
+typedef struct leapfrog_data leapfrog_data;
+
+leapfrog_data* lf_create(
+    double* lower, 
+    double* upper, 
+    size_t xlen, 
+    size_t points,
+    size_t* discrete, 
+    size_t discretelen, 
+    double tol, 
+    size_t seedval, 
+    double* pointset, 
+    int init_pointset, 
+    int synoptic
+);
+
+size_t lf_ask(leapfrog_data* self, size_t k, double* xs);
+
+int lf_tell(
+    leapfrog_data* self, 
+    size_t k, 
+    double* xs, 
+    double* values,
+    double* cons
+);
+
+void lf_result(leapfrog_data* self, double* solution);
+
+void lf_free(leapfrog_data* self);
+
 #ifdef __cplusplus
 }
 #endif
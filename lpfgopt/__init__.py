@@ -24,12 +24,35 @@ This package exposes the following API to make using the Leapfrogging
 Optimization Algorithm easier:
 
  - minimize() [function]: a general-use wrapper for optimization.
+ - minimize_async() [coroutine function]: a wrapper for optimization of 
+    coroutine (e.g. I/O-bound) objectives with several evaluations in 
+    flight at once.
+ - minimize_many() [function]: runs the optimization from many random 
+    seeds in a process pool and returns the best run with a summary of 
+    all runs. iminimize_many() yields each run as it finishes.
  - c_minimize() [function]: a wrapper for optimization explicitly using the 
     C library instead of the Python LeapFrog class.
+ - c_minimize_batch() [function]: solves many independent problems that 
+    share an objective in one call to the C library.
+ - CLeapFrog() [class]: the ask and tell interface of the C library for
+    evaluations scheduled by the caller.
+ - compile_expression() [function]: compiles an objective or constraint 
+    written as an expression string into a native function for the C 
+    library. Expression strings may also be passed straight to c_minimize.
  - load_leapfrog_lib() [function]: a function that returns a reference to the 
-    leapfrog C library to avoid loading the library multiple times.
+    leapfrog C library. The library is loaded once and the same reference 
+    is returned by every call.
  - LeapFrog() [class]: a class for step-by-step analysis of leapfrog 
-    optimization.
+    optimization. Its 'ask' and 'tell' methods let the caller schedule the
+    evaluations and 'steps' yields a read-only view of each iteration.
+ - NumpyLeapFrog() [class]: a LeapFrog class that stores the point set in a
+    numpy array and vectorizes each step. Requires numpy.
+ - EvaluationStore() [class]: a persistent SQLite store of objective 
+    function values shared by runs in many processes; pass it or its path
+    as 'store'.
+ - SharedMemoryPool() [class]: a pool of persistent worker processes that
+    evaluate batches through shared memory; pass it as 'workers'. Requires
+    numpy and Python 3.8 or later.
  - leapfrog_method() [function]: a wrapper function to allow the leapfrog method
     to be used with "scipy.optimize.minimize". Pass this function into the 
     'method' parameter to use it with scipy.
@@ -37,8 +60,19 @@ Optimization Algorithm easier:
 
 from __future__ import print_function
 from lpfgopt.leapfrog import LeapFrog
+from lpfgopt.np_leapfrog import NumpyLeapFrog
+try:
+    # shared memory needs Python 3.8
+    from lpfgopt.process_pool import SharedMemoryPool
+except ModuleNotFoundError:
+    pass
 from lpfgopt.c_leapfrog import minimize as c_minimize, load_leapfrog_lib
+from lpfgopt.c_leapfrog import CLeapFrog
+from lpfgopt.c_leapfrog import minimize_batch as c_minimize_batch
+from lpfgopt.expression import compile_expression
+from lpfgopt.eval_store import EvaluationStore
 from lpfgopt.scipy_min import leapfrog_method
+from lpfgopt.multistart import minimize_many, iminimize_many
 
 # get version of lpfgopt
 import os
@@ -50,7 +84,10 @@ del os
 
 def minimize(fun, bounds, args=(), points=20, fconstraint=None, discrete=[],
              maxit=10000, tol=1e-5, seedval=None, pointset=None, callback=None,
-             use_c_lib=False, cdll_ptr=None):
+             use_c_lib=False, cdll_ptr=None, use_numpy=False,
+             vectorized=False, synoptic=False, workers=None, chunks=None,
+             cache_size=None, store=None, fingerprint=None,
+             checkpoint_path=None, checkpoint_every=None):
     """
     General-use wrapper function to interface with the LeapFrog optimizer class.
     Contains the data and methods necessary to run a LeapFrog optimization.
@@ -74,6 +111,67 @@ def minimize(fun, bounds, args=(), points=20, fconstraint=None, discrete=[],
         - seedval     : {int} random seed
         - pointset    : {array-like with shape=(m, n)} starting point set
         - callback    : {callable} function to be called after each iteration
+        - use_c_lib   : {bool} run the optimization with the C library.
+                        'fun', 'fconstraint' and 'callback' may then also be 
+                        compiled C functions (see 'c_minimize')
+        - cdll_ptr    : {ctypes.CDLL} a previously loaded leapfrog C library
+        - use_numpy   : {bool} run the optimization with the numpy-backed
+                        NumpyLeapFrog class. The array-like members of the
+                        solution are returned as numpy arrays. With 
+                        'use_c_lib' the functions are also passed numpy
+                        views of the C arrays (see 'c_minimize').
+        - vectorized  : {bool} if True, 'fun' and 'fconstraint' take a 2-d
+                        array-like with shape (k, n) and return k values so
+                        that whole batches of points are evaluated in one 
+                        call. The batch is a numpy array when 'use_numpy' is 
+                        set and a list of lists otherwise.
+        - synoptic    : {bool} use synoptic leapfrogging: each iteration
+                        every player except the best leaps over the best
+                        and the whole generation is evaluated as a batch
+                        before the best and worst are updated
+        - workers     : {int, concurrent.futures.Executor or 
+                        SharedMemoryPool} evaluate the independent points
+                        of a batch (the initial point set and synoptic 
+                        generations) concurrently. An int starts a thread 
+                        pool of that size for the run. A SharedMemoryPool 
+                        runs pure-Python objectives in persistent worker 
+                        processes that may be reused across many runs. 
+                        Results are the same for a given seed regardless of
+                        the number of workers. Ignored by the C library.
+        - chunks      : {int} the number of slices a vectorized batch is 
+                        split into for 'workers'. Defaults to 'workers' if
+                        it is an int and to one row per slice otherwise. 
+                        Ignored by the C library.
+        - cache_size  : {int} keep the objective function values of up to
+                        this many decision vectors in a least recently used
+                        cache so that points generated again (e.g. on the
+                        integer lattice of discrete variables) are not
+                        evaluated again
+        - store       : {str or EvaluationStore} the path of an SQLite 
+                        database of objective function values consulted
+                        before each evaluation and updated after it. The
+                        database may be shared by concurrent runs in many
+                        processes on one host and survives between them
+                        (see lpfgopt.eval_store)
+        - fingerprint : {str} names the problem in 'store'. Defaults to a 
+                        fingerprint of the code of 'fun' and of 'args'.
+                        Also names the objective of a checkpoint, which 
+                        is otherwise identified by the code of 'fun' 
+                        alone so an objective whose state changes (e.g. a
+                        simulator counting its calls) can be resumed
+        - checkpoint_path  : {str} save the state of the run to this file
+                             every 'checkpoint_every' iterations. If the 
+                             file exists the run resumes from it and 
+                             follows the same path it would have without 
+                             stopping. The cache and store counters cover
+                             only the resumed part. A checkpoint of another
+                             problem (objective, 'bounds', 'points', 
+                             'discrete', 'seedval', 'synoptic' or 
+                             'vectorized') raises ValueError. The file is 
+                             removed when the run finishes. Ignored by the
+                             C library.
+        - checkpoint_every : {int} the number of iterations between 
+                             checkpoints
     
     returns:
         - solution    : a dictionary-like object containing the results of the 
@@ -95,6 +193,9 @@ def minimize(fun, bounds, args=(), points=20, fconstraint=None, discrete=[],
             - nfev        : {int}
                             The number of function evaluations of the objective
                             function
+            - ncev        : {int}
+                            The number of evaluations of the constraint
+                            function
             - nit         : {int}
                             The number of iterations performed
             - maxcv       : {float}
@@ -123,6 +224,18 @@ def minimize(fun, bounds, args=(), points=20, fconstraint=None, discrete=[],
                             
                             where n is the number of decision variables and m 
                             is the number of points in the search population.
+            - cache_hits  : {int} with 'cache_size' only
+                            The number of objective function values found
+                            in the cache
+            - cache_misses: {int} with 'cache_size' only
+                            The number of objective function values not 
+                            found in the cache
+            - store_hits  : {int} with 'store' only
+                            The number of objective function values found
+                            in the store
+            - store_misses: {int} with 'store' only
+                            The number of objective function values not 
+                            found in the store
     """
     options = {
         "fun"         : fun, 
@@ -137,15 +250,66 @@ def minimize(fun, bounds, args=(), points=20, fconstraint=None, discrete=[],
         "pointset"    : pointset,
         "callback"    : callback,
         "use_c_lib"   : use_c_lib,
-        "cdll_ptr"    : cdll_ptr
+        "cdll_ptr"    : cdll_ptr,
+        "vectorized"  : vectorized,
+        "synoptic"    : synoptic,
+        "workers"     : workers,
+        "chunks"      : chunks,
+        "cache_size"  : cache_size,
+        "store"       : store,
+        "fingerprint" : fingerprint,
+        "checkpoint_path"  : checkpoint_path,
+        "checkpoint_every" : checkpoint_every
         }
     
     if use_c_lib:
-        return c_minimize(**options)
-    lf = LeapFrog(**options)
+        return c_minimize(
+            use_numpy=use_numpy, as_list=not use_numpy, **options)
+    lf_class = NumpyLeapFrog if use_numpy else LeapFrog
+    lf = None
+    if checkpoint_path is not None:
+        try:
+            lf = lf_class.resume(checkpoint_path, **options)
+        except FileNotFoundError:
+            pass
+    if lf is None:
+        lf = lf_class(**options)
     return lf.minimize()
 
 
+async def minimize_async(fun, bounds, args=(), points=20, fconstraint=None,
+                         discrete=[], maxit=10000, tol=1e-5, seedval=None,
+                         pointset=None, callback=None, use_numpy=False,
+                         vectorized=False, synoptic=False, concurrency=1,
+                         cache_size=None, store=None, fingerprint=None):
+    """
+    Asynchronous counterpart of 'minimize' for objectives that wait on I/O,
+    such as a simulation service reached over a socket. 'fun' and 
+    'fconstraint' may be coroutine functions or plain functions. Many 
+    optimizations may be awaited at once in the same event loop.
+    
+    parameters:
+        All of the parameters of 'minimize' except 'use_c_lib', 'cdll_ptr'
+        and 'workers', plus:
+        - concurrency : {int} the maximum number of evaluations in flight.
+                        Each finished leap replaces the worst member of the
+                        point set as it stands when the result arrives. 
+                        With a concurrency of 1 the result is the same as 
+                        'minimize' for a given seed.
+    
+    returns:
+        - solution    : the same result as 'minimize'
+    """
+    lf_class = NumpyLeapFrog if use_numpy else LeapFrog
+    lf = lf_class(
+        fun, bounds, args=args, points=points, fconstraint=fconstraint,
+        discrete=discrete, maxit=maxit, tol=tol, seedval=seedval,
+        pointset=pointset, callback=callback, vectorized=vectorized,
+        synoptic=synoptic, cache_size=cache_size, store=store,
+        fingerprint=fingerprint)
+    return await lf.minimize_async(concurrency)
+
+
 def test_install():
     print(">>> lpfgopt.__version__\n", __version__)
     print(
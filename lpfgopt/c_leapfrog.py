@@ -22,12 +22,23 @@ by Dr. R. Russell Rhinehart. The following publications explain the technique:
   Processes”, Computers & Chemical Engineering, Vol. 68, 4 Sept 2014, pp 1-6.
 """
 import os
+import threading
 
-from ctypes import c_size_t, c_int, c_double, c_void_p, c_long
-from ctypes import cast, CFUNCTYPE, POINTER
+from array import array
+from itertools import chain
+
+from ctypes import c_size_t, c_int, c_double, c_void_p
+from ctypes import cast, CFUNCTYPE, POINTER, Structure, _CFuncPtr
 from ctypes import cdll as cdll_
 
 from lpfgopt.opt_result import OptimizeResult
+from lpfgopt.expression import compile_expression
+from lpfgopt.eval_cache import EvaluationCache
+from lpfgopt.eval_store import chain_caches, open_store
+try:
+    import numpy as np
+except ModuleNotFoundError:
+    np = None
 
 WIN_LIB = ".dll"
 UNIX_LIB = ".so"
@@ -38,32 +49,151 @@ MESSAGES = [
     "another error occured"
 ]
 
+# the C types of the objective and constraint functions and of the callback
+DOUBLE_FUN = CFUNCTYPE(c_double, POINTER(c_double), c_size_t)
+VOID_FUN = CFUNCTYPE(c_void_p, POINTER(c_double), c_size_t)
+DOUBLES = POINTER(c_double)
+INDICES = POINTER(c_size_t)
+
+
+class _Problem(Structure):
+    """
+    Mirrors the leapfrog_problem struct of the C library.
+    """
+    _fields_ = [
+        ("f", c_void_p),
+        ("g", c_void_p),
+        ("lower", POINTER(c_double)),
+        ("upper", POINTER(c_double)),
+        ("xlen", c_size_t),
+        ("seedval", c_size_t),
+        ("pointset", POINTER(c_double)),
+        ("init_pointset", c_int),
+        ("solution", POINTER(c_double)),
+        ]
+
+
+# the return and argument types of each function of the library
+PROTOTYPES = {
+    "minimize" : (None, [
+        DOUBLE_FUN, DOUBLES, DOUBLES, c_size_t, c_size_t, DOUBLE_FUN, INDICES,
+        c_size_t, c_size_t, c_double, c_size_t, DOUBLES, c_int, VOID_FUN, 
+        c_int, DOUBLES]),
+    "minimize_batch" : (None, [
+        POINTER(_Problem), c_size_t, c_size_t, INDICES, c_size_t, c_size_t,
+        c_double, c_int, c_int]),
+    "lf_create" : (c_void_p, [
+        DOUBLES, DOUBLES, c_size_t, c_size_t, INDICES, c_size_t, c_double, 
+        c_size_t, DOUBLES, c_int, c_int]),
+    "lf_ask" : (c_size_t, [c_void_p, c_size_t, DOUBLES]),
+    "lf_tell" : (c_int, [c_void_p, c_size_t, DOUBLES, DOUBLES, DOUBLES]),
+    "lf_result" : (None, [c_void_p, DOUBLES]),
+    "lf_free" : (None, [c_void_p]),
+    }
+
+_lib = None
+_lib_lock = threading.Lock()
+
 
 def load_leapfrog_lib():
     """
-    Loads the leapfrog dynamic library for later use.
+    Loads the leapfrog dynamic library for later use. The library is 
+    only loaded (and its prototypes declared) by the first call; later 
+    calls return the same handle.
     @returns a reference to the ctypes library.
     """
-    root = os.path.dirname(os.path.abspath(__file__))
-    ext = WIN_LIB if os.name == 'nt' else UNIX_LIB
-    filename = root + "/leapfrog_c" + ext
-    cdll = cdll_.LoadLibrary(filename)
+    global _lib
+    if _lib is None:
+        with _lib_lock:
+            if _lib is None:
+                root = os.path.dirname(os.path.abspath(__file__))
+                ext = WIN_LIB if os.name == 'nt' else UNIX_LIB
+                filename = root + "/leapfrog_c" + ext
+                _lib = _declare_prototypes(cdll_.LoadLibrary(filename))
+    return _lib
+
+
+def _get_lib(cdll_ptr=None):
+    """
+    @returns @param cdll_ptr ready for use, or the cached library if it 
+    is None.
+    """
+    if cdll_ptr is None:
+        return load_leapfrog_lib()
+    return _declare_prototypes(cdll_ptr)
+
+
+def _declare_prototypes(cdll):
+    """
+    Declares the return and argument types of the functions of the 
+    library @param cdll (see PROTOTYPES) and stores N_RESULTS as 
+    'cdll.n_results' so neither is looked up again. @returns @param cdll
+    """
+    if "n_results" not in vars(cdll):
+        for name, (restype, argtypes) in PROTOTYPES.items():
+            function = getattr(cdll, name)
+            function.restype = restype
+            function.argtypes = argtypes
+        cdll.n_results = c_size_t.in_dll(cdll, "N_RESULTS").value
     return cdll
 
 
 def minimize(fun, bounds, args=(), points=20, fconstraint=None,
             discrete=[], maxit=10000, tol=1e-5, seedval=None, 
-            pointset=None, callback=None, cdll_ptr=None, **kwargs):
+            pointset=None, callback=None, cdll_ptr=None, vectorized=False,
+            synoptic=False, use_numpy=False, as_list=False, cache_size=None,
+            store=None, fingerprint=None, **kwargs):
     """
     Loads the compiled shared library named "leapfrog.dll" or
     "leapfrog.so" (depending on the operating system), runs
     the "leapfrog" function and returns the results.
+
+    If @param vectorized is True 'fun' and 'fconstraint' are called with a
+    batch of one decision vector ([x]) and must return a sequence of one 
+    value since the C library evaluates one point at a time.
+
+    If @param synoptic is True each iteration leapfrogs every point except
+    the best over the best (synoptic leapfrogging).
+
+    If @param use_numpy is True the Python functions receive a read-only 
+    numpy array viewing the C array instead of a new list, so the cost of
+    a call does not grow with the number of variables. One view is made 
+    for each C array and reused. A view is only valid during the call; 
+    copy it to keep it. With @param vectorized the batch is a (1, n) view.
+
+    'x', 'best', 'worst' and 'pointset' are returned as numpy arrays over
+    the C arrays, without a copy per element, unless @param as_list is 
+    True or numpy is not installed, in which case they are lists. A numpy
+    @param pointset is passed to C in one block.
+
+    @param fun, @param fconstraint and @param callback may also be compiled
+    C functions, given as a ctypes function, a (library_path, symbol) 
+    tuple or the function's address as an int. Native objectives and 
+    constraints have the signature 'double f(double* x, size_t xlen)' and
+    a native callback 'void cb(double* x, size_t xlen)'. They are called
+    directly by the C library, which never re-enters the interpreter (or
+    takes the GIL) for them. A native objective cannot take @param args.
+    @param fun and @param fconstraint may also be expression strings over
+    'x' such as "x[0]**2 + sin(x[1])", which are compiled to native 
+    functions (see lpfgopt.expression).
+
+    If @param cache_size is given the values of up to that many decision
+    vectors of a Python objective are cached (see LeapFrog). 'nfev' then
+    counts only the evaluations made and the result gains 'cache_hits' 
+    and 'cache_misses'. Likewise a Python objective is looked up in the
+    EvaluationStore @param store (or one opened at that path under 
+    @param fingerprint) before it is called and the result gains 
+    'store_hits' and 'store_misses'.
     """
 
-    cdll = load_leapfrog_lib() if cdll_ptr is None else cdll_ptr
+    cdll = _get_lib(cdll_ptr)
     xlen = len(bounds)
     
-    fptr, gptr, cbp = _setup_fun_ptrs(fun, args, fconstraint, callback)
+    cache = EvaluationCache(cache_size) if cache_size else None
+    store = open_store(store, fun, args, fingerprint)
+    fptr, gptr, cbp = _setup_fun_ptrs(
+        fun, args, fconstraint, callback, vectorized, use_numpy, 
+        [cache, store])
     lowerp, upperp, solution = _setup_req_c_arrays(cdll, bounds, xlen)
 
     c_opt_arrs = _setup_opt_c_arrays(discrete, pointset, points, xlen)
@@ -75,94 +205,367 @@ def minimize(fun, bounds, args=(), points=20, fconstraint=None,
     cpoints = c_size_t(points)
     cmaxit = c_size_t(maxit)
     ctol = c_double(tol)
+    csynoptic = c_int(1 if synoptic else 0)
 
     cdll.minimize(
         fptr, lowerp, upperp, cxlen, cpoints, gptr, cdiscrete, discretelen, 
-        cmaxit, ctol, cseedval, cpointset, init_pointset, cbp, solution
+        cmaxit, ctol, cseedval, cpointset, init_pointset, cbp, csynoptic,
+        solution
     )
 
-    final_pointset = [[row[i] for i in range(xlen)] for row in list(cpointset)]
-    output = list(solution)
+    result = _make_result(solution, cpointset, xlen, as_list=as_list)
+    if cache is not None:
+        result.nfev -= cache.hits
+        result.cache_hits = cache.hits
+        result.cache_misses = cache.misses
+    if store is not None:
+        result.nfev -= store.hits
+        result.store_hits = store.hits
+        result.store_misses = store.misses
+    return result
+
+
+def minimize_batch(fun, problems, points=20, fconstraint=None, discrete=[], 
+                   maxit=10000, tol=1e-5, cdll_ptr=None, vectorized=False,
+                   synoptic=False, n_threads=1, use_numpy=False, as_list=False,
+                   **kwargs):
+    """
+    Solves many independent problems sharing the objective @param fun in
+    one call to the C library and @returns a list of OptimizeResults in 
+    the order of @param problems.
+
+    Each problem is a dict with the key "bounds" and optionally "args", 
+    "seedval" and "pointset" which have the same meaning as in 'minimize'.
+    The other parameters are shared by every problem. Problems given the
+    same 'args' object share one set of function pointers. The results
+    hold numpy arrays unless @param as_list is True (see 'minimize').
+
+    If the library was built with OpenMP ('make all OPENMP=1') the problems
+    are solved by @param n_threads threads (0 uses the OpenMP default). 
+    Python objectives hold the GIL while they run so threads only help 
+    objectives that release it, such as native functions (see 'minimize').
+    """
+    cdll = _get_lib(cdll_ptr)
+    cdiscrete = _c_array(c_size_t, discrete, len(discrete))
+
+    fun_ptrs = {}
+    keep = []
+    cproblems = (_Problem * len(problems))()
+    for cproblem, problem in zip(cproblems, problems):
+        args = problem.get("args", ())
+        if id(args) not in fun_ptrs:
+            fun_ptrs[id(args)] = _setup_fun_ptrs(
+                fun, args, fconstraint, None, vectorized, use_numpy)
+        fptr, gptr, cbp = fun_ptrs[id(args)]
+
+        bounds = problem["bounds"]
+        xlen = len(bounds)
+        lowerp, upperp, solution = _setup_req_c_arrays(cdll, bounds, xlen)
+        _, _, cpointset, init_pointset = _setup_opt_c_arrays(
+            [], problem.get("pointset"), points, xlen)
+        seedval = problem.get("seedval")
+
+        cproblem.f = cast(fptr, c_void_p)
+        cproblem.g = cast(gptr, c_void_p)
+        cproblem.lower = lowerp
+        cproblem.upper = upperp
+        cproblem.xlen = xlen
+        cproblem.seedval = 0 if seedval is None else seedval
+        cproblem.pointset = cpointset
+        cproblem.init_pointset = init_pointset
+        cproblem.solution = solution
+        keep.append((args, lowerp, upperp, solution, cpointset, xlen))
+
+    cdll.minimize_batch(
+        cproblems, c_size_t(len(problems)), c_size_t(points), cdiscrete, 
+        c_size_t(len(discrete)), c_size_t(maxit), c_double(tol), 
+        c_int(1 if synoptic else 0), c_int(n_threads)
+    )
+
+    return [
+        _make_result(solution, cpointset, xlen, as_list=as_list)
+        for args, lowerp, upperp, solution, cpointset, xlen in keep
+        ]
+
+
+def _make_result(solution, cpointset, xlen, messages=MESSAGES, 
+                 as_list=True):
+    """
+    @returns an OptimizeResult built from the C @param solution array and
+    point set @param cpointset. @param messages gives the message for each
+    status code. The arrays of the result are numpy arrays viewing the C 
+    arrays unless @param as_list is True or numpy is not installed.
+    """
+    if as_list or np is None:
+        flat = list(cpointset)
+        final_pointset = [
+            flat[i:i + xlen] for i in range(0, len(flat), xlen)
+            ]
+        output = list(solution)
+    else:
+        final_pointset = np.ctypeslib.as_array(cpointset).reshape(-1, xlen)
+        output = np.ctypeslib.as_array(solution)
 
     return OptimizeResult(
             x           = output[:xlen],
             success     = not bool(output[xlen]),
-            status      = output[xlen],
-            message     = MESSAGES[int(output[xlen])],
-            fun         = output[xlen + 1],
-            nfev        = int(output[xlen + 2] + points),
+            status      = float(output[xlen]),
+            message     = messages[int(output[xlen])],
+            fun         = float(output[xlen + 1]),
+            nfev        = int(output[xlen + 8]),
             nit         = int(output[xlen + 2]),
-            final_error = output[xlen + 3],
-            maxcv       = output[xlen + 4],
+            ncev        = int(output[xlen + 7]),
+            final_error = float(output[xlen + 3]),
+            maxcv       = float(output[xlen + 4]),
             best        = final_pointset[int(output[xlen + 5])], 
             worst       = final_pointset[int(output[xlen + 6])], 
             pointset    = final_pointset
         )
 
 
-def _setup_fun_ptrs(fun, args=(), fconstraint=None, callback=None):
+class CLeapFrog():
+    """
+    The ask and tell interface of the leapfrog C library, for evaluations
+    scheduled by the caller. Takes the same parameters as LeapFrog except
+    the functions and the iteration options. 'ask', 'tell' and 'result' 
+    behave like those of LeapFrog with points returned as lists. The 
+    optimizer is freed by 'close' or when the object is deleted.
+    """
+    def __init__(self, bounds, points=20, discrete=[], tol=1e-5, 
+                 seedval=None, pointset=None, synoptic=False, cdll_ptr=None):
+        self.cdll = _get_lib(cdll_ptr)
+        self.xlen = len(bounds)
+        self.points = points
+        self.handle = None
+
+        lowerp, upperp, self.solution = _setup_req_c_arrays(
+            self.cdll, bounds, self.xlen)
+        c_opt_arrs = _setup_opt_c_arrays(discrete, pointset, points, self.xlen)
+        cdiscrete, discretelen, self.cpointset, init_pointset = c_opt_arrs
+
+        self.handle = self.cdll.lf_create(
+            lowerp, upperp, c_size_t(self.xlen), c_size_t(points), cdiscrete,
+            discretelen, c_double(tol), 
+            c_size_t(0) if seedval is None else c_size_t(seedval),
+            self.cpointset, init_pointset, c_int(1 if synoptic else 0)
+        )
+        if not self.handle:
+            raise ValueError("invalid leapfrog options")
+
+
+    def __del__(self):
+        self.close()
+
+
+    def ask(self, k=None):
+        """
+        @returns a list of up to @param k decision vectors to evaluate.
+        See LeapFrog.ask.
+        """
+        rows = max(k or self.points, 1)
+        xs = (c_double * (rows * self.xlen))()
+        n = self.cdll.lf_ask(self.handle, k or 0, xs)
+        return [xs[i * self.xlen:(i + 1) * self.xlen] for i in range(n)]
+
+
+    def tell(self, points, values, constraint_values=None):
+        """
+        Passes the objective function @param values (and optionally the
+        constraint function @param constraint_values) of @param points 
+        back to the optimizer. @returns True once the tolerance condition
+        is satisfied. See LeapFrog.tell.
+        """
+        k = len(values)
+        xs = (c_double * (k * self.xlen))(*[xi for x in points for xi in x])
+        cvalues = (c_double * k)(*values)
+        cons = None if constraint_values is None else \
+            (c_double * k)(*constraint_values)
+        status = self.cdll.lf_tell(self.handle, k, xs, cvalues, cons)
+        if status < 0:
+            raise ValueError("a point was told that was not asked for")
+        return bool(status)
+
+
+    def result(self):
+        """
+        @returns an OptimizeResult describing the current state.
+        """
+        self.cdll.lf_result(self.handle, self.solution)
+        return _make_result(
+            self.solution, self.cpointset, self.xlen, 
+            [MESSAGES[0], "the tolerance condition is not satisfied"])
+
+
+    def close(self):
+        """
+        Frees the C optimizer.
+        """
+        if self.handle:
+            self.cdll.lf_free(self.handle)
+            self.handle = None
+
+
+def _setup_fun_ptrs(fun, args=(), fconstraint=None, callback=None,
+                    vectorized=False, use_numpy=False, caches=()):
     """
     Makes C-compatible function pointers from Python function
-    wrappers. @returns these pointers as a tuple fptr, gptr, cbp
+    wrappers. Native functions (see '_native_fun') are passed through 
+    unwrapped. The Python functions receive each C array as a list or, if
+    @param use_numpy, as a cached numpy view. A Python objective is only 
+    called for points not found in any of the EvaluationCaches (or 
+    EvaluationStores) in @param caches. @returns these pointers as a tuple
+    fptr, gptr, cbp
     """
-    
+    if isinstance(fun, str):
+        fun = compile_expression(fun)
+    if isinstance(fconstraint, str):
+        fconstraint = compile_expression(fconstraint)
+    native_f = _native_fun(fun, DOUBLE_FUN)
+    native_g = _native_fun(fconstraint, DOUBLE_FUN)
+    native_cb = _native_fun(callback, VOID_FUN)
+    if native_f is not None and args:
+        raise ValueError("'args' cannot be passed to a native function")
+
+    as_x = _view_maker() if use_numpy else _as_list
+    if vectorized:
+        fun = _unbatched(fun)
+        fconstraint = None if fconstraint is None else _unbatched(fconstraint)
+
+    caches = [cache for cache in caches if cache is not None]
+
     def f(x, xlen):
-        return fun([x[i] for i in range(xlen)], *args)
+        if not caches:
+            return fun(as_x(x, xlen), *args)
+        evaluate = lambda xs: [fun(as_x(x, xlen), *args)]
+        return chain_caches(caches, evaluate)([x[:xlen]])[0]
 
     def g(x, xlen):
         if fconstraint is None: return
-        return fconstraint([x[i] for i in range(xlen)])
+        return fconstraint(as_x(x, xlen))
 
     def cb(x, xlen):
         if callback is None: return
-        return callback([x[i] for i in range(xlen)])
+        return callback(as_x(x, xlen))
 
-    dprototype = CFUNCTYPE(c_double, POINTER(c_double), c_size_t)
-    vprototype = CFUNCTYPE(c_void_p, POINTER(c_double), c_size_t)
-
-    fptr = dprototype(f)
-    gptr = POINTER(c_double)() if fconstraint is None else dprototype(g)
-    cbp = POINTER(c_void_p)() if callback is None else vprototype(cb)
+    fptr = DOUBLE_FUN(f) if native_f is None else native_f
+    gptr = DOUBLE_FUN() if fconstraint is None else \
+        DOUBLE_FUN(g) if native_g is None else native_g
+    cbp = VOID_FUN() if callback is None else \
+        VOID_FUN(cb) if native_cb is None else native_cb
     
     return fptr, gptr, cbp
 
 
+def _native_fun(fun, prototype):
+    """
+    @returns @param fun as a C function pointer of type @param prototype
+    if it is already compiled code: a ctypes function, a 
+    (library_path, symbol) tuple or the address of the function as an int.
+    @returns None for Python callables (and None).
+    """
+    if isinstance(fun, tuple):
+        path, symbol = fun
+        fun = getattr(cdll_.LoadLibrary(path), symbol)
+    elif isinstance(fun, int) and not isinstance(fun, bool):
+        return prototype(fun)
+    if isinstance(fun, _CFuncPtr):
+        # the cast keeps a reference to fun and through it the library
+        return cast(fun, prototype)
+    return None
+
+
+def _as_list(x, xlen):
+    """
+    @returns a list copy of the C array @param x of length @param xlen.
+    """
+    return [x[i] for i in range(xlen)]
+
+
+def _view_maker():
+    """
+    @returns a function like '_as_list' that returns a read-only numpy 
+    view of the C array instead. The views are cached by address so each
+    C array is only wrapped once.
+    """
+    if np is None:
+        raise ImportError("use_numpy requires numpy to be installed")
+    views = {}
+
+    def as_view(x, xlen):
+        key = (cast(x, c_void_p).value, xlen)
+        view = views.get(key)
+        if view is None:
+            view = views[key] = np.ctypeslib.as_array(x, shape=(xlen,))
+            view.flags.writeable = False
+        return view
+    return as_view
+
+
+def _unbatched(batch_fun):
+    """
+    Wraps a vectorized function so it may be called with a single
+    decision vector. A numpy vector is passed as a (1, n) view.
+    """
+    def single(x, *args):
+        batch = x[np.newaxis] if np is not None and \
+            isinstance(x, np.ndarray) else [x]
+        return batch_fun(batch, *args)[0]
+    return single
+
+
 def _setup_req_c_arrays(cdll, bounds, xlen):
     """
     Converts the given, required Python array-likes into C array 
     pointers. @Returns pointers to lower, upper and solution arrays
     respectively.
     """
+    if np is not None:
+        bounds = np.asarray(bounds, dtype=np.float64)
+        lowerp = _c_array(c_double, bounds[:, 0], xlen)
+        upperp = _c_array(c_double, bounds[:, 1], xlen)
+    else:
+        lowerp = _c_array(c_double, [i[0] for i in bounds], xlen)
+        upperp = _c_array(c_double, [i[1] for i in bounds], xlen)
 
-    lower = [i[0] for i in bounds]
-    upper = [i[1] for i in bounds]
-    lowerp = (c_double * xlen)(*lower)
-    upperp = (c_double * xlen)(*upper)
-
-    n_results = cast(cdll.N_RESULTS, POINTER(c_long)).contents.value
-
-    solution = (c_double * (len(lower) + n_results))(*[
-        0.0 for i in range(len(lower) + n_results)
-    ])
+    solution = (c_double * (xlen + cdll.n_results))()
 
     return lowerp, upperp, solution
 
 
 def _setup_opt_c_arrays(discrete, pointset, points, xlen):
-
-    cdiscrete = (c_size_t * len(discrete))(*discrete)
+    """
+    Converts the optional Python arguments into C arrays. The point set is
+    passed to C as one contiguous row-major array of points * xlen doubles.
+    @Returns the discrete array, its length, the point set and the 
+    init_pointset flag.
+    """
+    cdiscrete = _c_array(c_size_t, discrete, len(discrete))
     discretelen = c_size_t(len(discrete))
 
     if pointset is None:
-        pointset = [[0.0 for i in range(xlen)] for row in range(points)]
-        init_pointset = c_int(1)
-    else:
-        init_pointset = c_int(0)
+        return cdiscrete, discretelen, (c_double * (points * xlen))(), c_int(1)
 
-    pointset_list = [(c_double * xlen)(*row) for row in pointset]
-    cpointset = (POINTER(c_double) * points)(*pointset_list)
+    if np is None:
+        pointset = chain.from_iterable(pointset)
+    cpointset = _c_array(c_double, pointset, points * xlen)
+    return cdiscrete, discretelen, cpointset, c_int(0)
 
-    return cdiscrete, discretelen, cpointset, init_pointset
+
+def _c_array(ctype, values, n):
+    """
+    @returns a new ctypes array of @param n elements of @param ctype 
+    (c_double or c_size_t) holding the flattened @param values. The values
+    are copied in one block through the buffer protocol of a numpy array,
+    or of an array.array when numpy is not installed.
+    """
+    array_type = ctype * n
+    if np is not None:
+        dtype = np.float64 if ctype is c_double else np.uintp
+        return array_type.from_buffer(
+            np.array(values, dtype=dtype).reshape(-1))
+    if ctype is c_double:
+        return array_type.from_buffer(array("d", values))
+    return array_type(*values)
 
 
 def _main():
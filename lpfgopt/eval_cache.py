@@ -0,0 +1,130 @@
+"""
+filename: eval_cache.py
+Package: lpfgopt
+Author: Mark Redd
+Email: redddogjr@gmail.com
+Website: http://www.r3eda.com/
+About:
+Contains the EvaluationCache class, a bounded least-recently-used cache of
+objective function values keyed on the decision vector. Discrete variables
+put the players on an integer lattice so late in a run the same points
+are generated again and again; with a cache each repeat costs a dictionary
+lookup instead of an objective function evaluation.
+"""
+from collections import OrderedDict
+try:
+    import numpy as np
+except ModuleNotFoundError:
+    np = None
+
+MISSING = object()
+
+
+class EvaluationCache():
+    """
+    A least-recently-used cache of at most 'maxsize' objective function
+    values keyed on the decision vector.
+
+    parameters:
+        - maxsize : the number of values kept. Once full, the value used
+                    least recently is dropped for each new one.
+
+    'hits' and 'misses' count the lookups that were and were not found.
+    """
+    def __init__(self, maxsize):
+        if maxsize < 1:
+            raise ValueError("the cache size must be at least 1")
+        self.maxsize = maxsize
+        self.values  = OrderedDict()
+        self.hits    = 0
+        self.misses  = 0
+
+
+    def __len__(self):
+        return len(self.values)
+
+
+    @staticmethod
+    def key(x):
+        """
+        Returns the hashable key of the decision vector @param x.
+        """
+        return tuple(x.tolist()) if hasattr(x, "tolist") else tuple(x)
+
+
+    def get(self, x, default=MISSING):
+        """
+        Returns the cached value at @param x, or @param default if there
+        is none.
+        """
+        value = self.lookup(self.key(x))
+        if value is MISSING:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return value
+
+
+    def put(self, x, value):
+        """
+        Caches @param value as the value at @param x.
+        """
+        self.save([(self.key(x), value)])
+
+
+    def lookup(self, key):
+        """
+        Returns the value stored under @param key or MISSING.
+        """
+        value = self.values.get(key, MISSING)
+        if value is not MISSING:
+            self.values.move_to_end(key)
+        return value
+
+
+    def save(self, items):
+        """
+        Stores each (key, value) pair of @param items, dropping the least
+        recently used values beyond 'maxsize'.
+        """
+        for key, value in items:
+            self.values[key] = value
+            self.values.move_to_end(key)
+        while len(self.values) > self.maxsize:
+            self.values.popitem(last=False)
+
+
+    def map(self, xs, evaluate):
+        """
+        Returns the values at every decision vector in @param xs. Those
+        that are not cached, once each, are passed in order to
+        @param evaluate, which must return their values in a sequence.
+        A numpy batch is passed on as a numpy array.
+        """
+        values = [None for x in xs]
+        todo = OrderedDict()
+        for i, x in enumerate(xs):
+            key = self.key(x)
+            value = MISSING if key in todo else self.lookup(key)
+            if value is not MISSING:
+                self.hits += 1
+                values[i] = value
+            elif key in todo:
+                self.hits += 1
+                todo[key].append(i)
+            else:
+                self.misses += 1
+                todo[key] = [i]
+
+        if todo:
+            first = [rows[0] for rows in todo.values()]
+            if np is not None and isinstance(xs, np.ndarray):
+                batch = xs[first]
+            else:
+                batch = [xs[i] for i in first]
+            new_values = list(evaluate(batch))
+            for rows, value in zip(todo.values(), new_values):
+                for i in rows:
+                    values[i] = value
+            self.save(zip(todo.keys(), new_values))
+        return values
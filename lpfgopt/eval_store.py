@@ -0,0 +1,341 @@
+"""
+filename: eval_store.py
+Package: lpfgopt
+Author: Mark Redd
+Email: redddogjr@gmail.com
+Website: http://www.r3eda.com/
+About:
+Contains the EvaluationStore class, a persistent record of objective
+function values kept in an SQLite database and shared by every run,
+thread and process that opens the same file. Values are keyed on a
+fingerprint of the problem and the exact bits of the decision vector, so
+a restarted or repeated study (another seed, a multistart, a tighter
+tolerance) never pays twice for a point already evaluated.
+
+Example usage:
+
+    from lpfgopt import minimize
+
+    solution = minimize(simulation, bounds, store="evaluations.db")
+
+The database runs in write-ahead log mode so readers never block the
+writer and concurrent writers wait for each other instead of failing. This
+is only safe on a local file system.
+"""
+import hashlib
+import inspect
+import os
+import sqlite3
+import threading
+from array import array
+from functools import partial
+
+from lpfgopt.eval_cache import EvaluationCache, MISSING
+try:
+    import numpy as np
+except ModuleNotFoundError:
+    np = None
+
+TIMEOUT = 60.0
+
+_SCHEMA = """CREATE TABLE IF NOT EXISTS evaluations (
+    fingerprint TEXT NOT NULL,
+    x           BLOB NOT NULL,
+    value       REAL,
+    PRIMARY KEY (fingerprint, x)
+) WITHOUT ROWID"""
+
+
+class EvaluationStore(EvaluationCache):
+    """
+    Objective function values of one problem stored in the SQLite
+    database at 'path'. Has the same interface as EvaluationCache and is
+    consulted after it, so values found in memory never touch the disk.
+
+    parameters:
+        - path        : the database file, created if it does not exist
+        - fingerprint : {str} names the problem. Values stored under
+                        another fingerprint are never returned. See
+                        'problem_fingerprint'.
+        - timeout     : seconds to wait for another writer before failing
+
+    'hits' and 'misses' count the lookups that were and were not found.
+    A store may be passed to other processes; each opens its own
+    connection.
+    """
+    def __init__(self, path, fingerprint, timeout=TIMEOUT):
+        self.path        = os.fspath(path)
+        self.fingerprint = fingerprint
+        self.timeout     = timeout
+        self.hits        = 0
+        self.misses      = 0
+        self.lock        = threading.Lock()
+        self.connection  = None
+        self.pid         = None
+
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.update(lock=None, connection=None, pid=None)
+        return state
+
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
+
+
+    def __len__(self):
+        with self.lock:
+            return self.connect().execute(
+                "SELECT COUNT(*) FROM evaluations WHERE fingerprint = ?",
+                (self.fingerprint,)).fetchone()[0]
+
+
+    def connect(self):
+        """
+        @returns this process's connection to the database, opening it
+        on first use. Must be called holding 'lock'.
+        """
+        if self.connection is None or self.pid != os.getpid():
+            connection = sqlite3.connect(
+                self.path, timeout=self.timeout, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            with connection:
+                connection.execute(_SCHEMA)
+            self.connection, self.pid = connection, os.getpid()
+        return self.connection
+
+
+    def close(self):
+        """
+        Closes this process's connection. The store reopens it if used
+        again.
+        """
+        with self.lock:
+            if self.connection is not None and self.pid == os.getpid():
+                self.connection.close()
+            self.connection, self.pid = None, None
+
+
+    @staticmethod
+    def key(x):
+        """
+        Returns the bytes of @param x as float64 values, so the key of a
+        point is the same whichever engine generated it.
+        """
+        return array("d", x.tolist() if hasattr(x, "tolist") else x).tobytes()
+
+
+    def lookup(self, key):
+        with self.lock:
+            row = self.connect().execute(
+                "SELECT value FROM evaluations "
+                "WHERE fingerprint = ? AND x = ?",
+                (self.fingerprint, key)).fetchone()
+        if row is None:
+            return MISSING
+        # SQLite stores NaN as NULL
+        return float("nan") if row[0] is None else row[0]
+
+
+    def save(self, items):
+        rows = [(self.fingerprint, key, float(value)) for key, value in items]
+        if not rows:
+            return
+        with self.lock:
+            connection = self.connect()
+            with connection:
+                # another process may have stored the point meanwhile
+                connection.executemany(
+                    "INSERT OR IGNORE INTO evaluations VALUES (?, ?, ?)",
+                    rows)
+
+
+def problem_fingerprint(fun, args=()):
+    """
+    @returns a fingerprint of the objective @param fun called with
+    @param args. It is built from the function's module, name and
+    compiled code and from the values it closes over and its defaults,
+    so editing the function or making it from other values starts a new
+    set of stored values; upgrading Python may do the same. Arrays are 
+    hashed by their bytes. Global variables the function reads are not
+    part of the fingerprint. An expression string is its own 
+    fingerprint. Raises ValueError for a function or value that cannot be
+    hashed reliably, such as a callable without Python code, which needs
+    a fingerprint chosen by the caller.
+    """
+    try:
+        if isinstance(fun, str):
+            parts = ["expression", fun.strip()]
+        else:
+            parts = _callable_parts(fun, set())
+        parts += _value_parts(tuple(args), set())
+    except ValueError as error:
+        raise ValueError(
+            f"cannot fingerprint {fun!r} ({error}); "
+            "pass 'fingerprint' explicitly") from error
+    return hashlib.sha256("\0".join(parts).encode()).hexdigest()
+
+
+def code_fingerprint(fun):
+    """
+    @returns a fingerprint of the code of the objective @param fun only:
+    the module, name and compiled code of the function, method or 
+    '__call__' and the class of the instance it is bound to, but none of
+    the values it closes over, its defaults or the state of the instance.
+    It is unchanged by the call counters and cached results of a 
+    stateful objective, so it identifies the same problem in a new 
+    process. Raises ValueError for a callable without Python code.
+    """
+    try:
+        parts = _callable_parts(fun, set(), values=False)
+    except ValueError as error:
+        raise ValueError(
+            f"cannot fingerprint {fun!r} ({error}); "
+            "pass 'fingerprint' explicitly") from error
+    return hashlib.sha256("\0".join(parts).encode()).hexdigest()
+
+
+def _callable_parts(fun, seen, values=True):
+    """
+    @returns the parts of the fingerprint of the callable @param fun.
+    @param seen holds the ids of the callables being fingerprinted so a
+    function that refers to itself does not recurse forever. Without
+    @param values only the code and classes are included.
+    """
+    if id(fun) in seen:
+        return ["recursive"]
+    seen = seen | {id(fun)}
+
+    if isinstance(fun, partial):
+        parts = ["partial"] + _callable_parts(fun.func, seen, values)
+        if values:
+            parts += _value_parts(fun.args, seen) + \
+                _value_parts(fun.keywords, seen)
+        return parts
+    if inspect.ismethod(fun):
+        return ["method"] + _callable_parts(fun.__func__, seen, values) + \
+            _object_parts(fun.__self__, seen, values)
+
+    code = getattr(fun, "__code__", None)
+    if code is None:
+        call = getattr(type(fun), "__call__", None)
+        if getattr(call, "__code__", None) is None:
+            raise ValueError("it has no Python code")
+        return ["callable"] + _callable_parts(call, seen, values) + \
+            _object_parts(fun, seen, values)
+
+    parts = [
+        getattr(fun, "__module__", None) or "",
+        getattr(fun, "__qualname__", None) or "",
+        ] + _code_parts(code)
+    if not values:
+        return parts
+    for cell in getattr(fun, "__closure__", None) or ():
+        try:
+            contents = cell.cell_contents
+        except ValueError:
+            parts.append("empty cell")
+            continue
+        parts += _value_parts(contents, seen)
+    parts += _value_parts(getattr(fun, "__defaults__", None), seen)
+    parts += _value_parts(getattr(fun, "__kwdefaults__", None), seen)
+    return parts
+
+
+def _object_parts(obj, seen, values=True):
+    """
+    @returns the parts of the fingerprint of the instance @param obj: its
+    class and, with @param values, its attributes.
+    """
+    parts = [type(obj).__module__, type(obj).__qualname__]
+    if not values:
+        return parts
+    if not hasattr(obj, "__dict__"):
+        raise ValueError(f"cannot hash a {type(obj).__qualname__}")
+    return parts + _value_parts(vars(obj), seen)
+
+
+def _value_parts(value, seen):
+    """
+    @returns the parts of the fingerprint of @param value. Raises 
+    ValueError for a value whose repr does not identify it.
+    """
+    if value is None or value is Ellipsis or isinstance(
+            value, (bool, int, float, complex, str, bytes)):
+        return [type(value).__name__, repr(value)]
+    if np is not None and isinstance(value, np.ndarray):
+        if value.dtype.hasobject:
+            raise ValueError("cannot hash an array of objects")
+        data = np.ascontiguousarray(value).tobytes()
+        return ["ndarray", value.dtype.str, repr(value.shape),
+                hashlib.sha256(data).hexdigest()]
+    if np is not None and isinstance(value, np.generic):
+        return _value_parts(value.item(), seen)
+    if isinstance(value, (tuple, list)):
+        parts = [type(value).__name__, str(len(value))]
+        for item in value:
+            parts += _value_parts(item, seen)
+        return parts
+    if isinstance(value, dict):
+        items = sorted(
+            ("\0".join(_value_parts(key, seen)), _value_parts(item, seen))
+            for key, item in value.items())
+        parts = ["dict", str(len(items))]
+        for key, item in items:
+            parts += [key] + item
+        return parts
+    if isinstance(value, (set, frozenset)):
+        # set order depends on the process's hash seed
+        return ["set"] + sorted(
+            "\0".join(_value_parts(item, seen)) for item in value)
+    if inspect.ismodule(value):
+        return ["module", value.__name__]
+    if inspect.isclass(value):
+        return ["class", value.__module__, value.__qualname__]
+    if callable(value):
+        return _callable_parts(value, seen)
+    raise ValueError(f"cannot hash a {type(value).__qualname__}")
+
+
+def _code_parts(code):
+    """
+    @returns the parts of @param code and the code nested in it that do
+    not change between processes.
+    """
+    parts = [code.co_code.hex()]
+    for const in code.co_consts:
+        if inspect.iscode(const):
+            parts += _code_parts(const)
+        else:
+            parts += _value_parts(const, set())
+    return parts
+
+
+def open_store(store, fun, args=(), fingerprint=None):
+    """
+    @returns @param store unchanged if it is None or an EvaluationStore,
+    otherwise an EvaluationStore at that path for @param fun with
+    @param args under @param fingerprint or the 'problem_fingerprint'.
+    """
+    if store is None or isinstance(store, EvaluationStore):
+        return store
+    if fingerprint is None:
+        fingerprint = problem_fingerprint(fun, args)
+    return EvaluationStore(store, fingerprint)
+
+
+def chain_caches(caches, evaluate):
+    """
+    @returns a batch evaluator that looks each decision vector up in the
+    caches of @param caches in order (None entries are skipped) and passes
+    only those found in none of them to @param evaluate. Values evaluated
+    are put in every cache.
+    """
+    for cache in reversed(caches):
+        if cache is not None:
+            evaluate = partial(cache.map, evaluate=evaluate)
+    return evaluate
+
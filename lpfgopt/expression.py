@@ -0,0 +1,274 @@
+"""
+filename: expression.py
+Package: lpfgopt
+Author: Mark Redd
+Email: redddogjr@gmail.com
+Website: http://www.r3eda.com/
+About:
+Contains compile_expression which turns a closed-form objective or
+constraint written as a Python expression string into a native function
+for the leapfrog C library. The expression is checked against a small
+whitelist of Python syntax, translated to C, built with the system C
+compiler into a shared library and loaded with ctypes. Libraries are
+cached on disk under a hash of the generated source so each expression is
+only compiled once.
+
+Example usage:
+
+    from lpfgopt import c_minimize
+
+    solution = c_minimize(
+        "(1 - x[0])**2 + 100 * (x[1] - x[0]**2)**2",
+        [[-5.0, 5.0], [-5.0, 5.0]],
+        fconstraint="x[0]**2 + x[1]**2 - 2")
+
+The expression may use the decision variables x[0], x[1], ..., numbers,
+the operators + - * / **, the functions in FUNCTIONS (optionally written
+as math.sin or np.sin) and the constants pi and e. The C compiler is taken
+from the CC environment variable, then 'cc' or 'gcc' on the path.
+"""
+import ast
+import hashlib
+import math
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+
+from ctypes import c_double, c_size_t, POINTER
+from ctypes import cdll as cdll_
+
+WIN_LIB = ".dll"
+UNIX_LIB = ".so"
+SYMBOL = "lpfg_expression"
+
+# Python name -> (C function, number of arguments or None for any >= 2)
+FUNCTIONS = {
+    "sin"   : ("sin", 1),   "cos"   : ("cos", 1),   "tan"   : ("tan", 1),
+    "asin"  : ("asin", 1),  "acos"  : ("acos", 1),  "atan"  : ("atan", 1),
+    "sinh"  : ("sinh", 1),  "cosh"  : ("cosh", 1),  "tanh"  : ("tanh", 1),
+    "exp"   : ("exp", 1),   "log"   : ("log", 1),   "log10" : ("log10", 1),
+    "sqrt"  : ("sqrt", 1),  "abs"   : ("fabs", 1),  "fabs"  : ("fabs", 1),
+    "floor" : ("floor", 1), "ceil"  : ("ceil", 1),  "atan2" : ("atan2", 2),
+    "pow"   : ("pow", 2),   "hypot" : ("hypot", 2), "min"   : ("fmin", None),
+    "max"   : ("fmax", None),
+    }
+CONSTANTS = {"pi" : math.pi, "e" : math.e}
+MODULES = {"math", "np", "numpy"}
+
+_SOURCE = """#include <math.h>
+#include <stddef.h>
+
+double {symbol}(double* x, size_t xlen)
+{{
+    if(xlen <= {max_index}) return NAN;
+    return {body};
+}}
+"""
+
+_loaded = {}
+_lock = threading.Lock()
+
+
+def compile_expression(expression, cache_dir=None):
+    """
+    Compiles @param expression, a Python expression string over the
+    decision vector 'x', into a native function of the form
+    'double f(double* x, size_t xlen)'. The function returns NaN if 'x'
+    is shorter than the largest index in the expression.
+
+    parameters:
+        - expression : {str} the objective or constraint expression
+        - cache_dir  : {str} the directory of the compiled libraries.
+                       Defaults to $XDG_CACHE_HOME/lpfgopt or
+                       ~/.cache/lpfgopt.
+
+    returns:
+        - fun : {ctypes function} may be passed as 'fun' or 'fconstraint'
+                to 'c_minimize'
+
+    raises:
+        - ValueError   : if the expression uses unsupported syntax
+        - RuntimeError : if no C compiler is found or the build fails
+    """
+    source = to_c(expression)
+    key = hashlib.sha256(source.encode()).hexdigest()[:24]
+    with _lock:
+        if key not in _loaded:
+            path = _build(source, key, cache_dir or _default_cache_dir())
+            fun = getattr(cdll_.LoadLibrary(path), SYMBOL)
+            fun.restype = c_double
+            fun.argtypes = [POINTER(c_double), c_size_t]
+            _loaded[key] = fun
+        return _loaded[key]
+
+
+def to_c(expression):
+    """
+    @returns the C source of the native function for @param expression.
+    Raises ValueError if the expression uses unsupported syntax.
+    """
+    try:
+        tree = ast.parse(expression.strip(), mode="eval")
+    except SyntaxError as error:
+        raise ValueError(f"invalid expression {expression!r}: {error}")
+    translator = _Translator()
+    body = translator.visit(tree.body)
+    return _SOURCE.format(
+        symbol=SYMBOL, max_index=translator.max_index, body=body)
+
+
+class _Translator(ast.NodeVisitor):
+    """
+    Translates a whitelisted Python expression tree to a C expression.
+    Any node without a visit method is rejected.
+    """
+    OPERATORS = {ast.Add : "+", ast.Sub : "-", ast.Mult : "*", ast.Div : "/"}
+
+    def __init__(self):
+        self.max_index = 0
+
+
+    def generic_visit(self, node):
+        raise ValueError(
+            f"unsupported syntax in expression: {type(node).__name__}")
+
+
+    def visit_BinOp(self, node):
+        left, right = self.visit(node.left), self.visit(node.right)
+        if isinstance(node.op, ast.Pow):
+            return f"pow({left}, {right})"
+        if type(node.op) not in self.OPERATORS:
+            self.generic_visit(node.op)
+        return f"({left} {self.OPERATORS[type(node.op)]} {right})"
+
+
+    def visit_UnaryOp(self, node):
+        if isinstance(node.op, ast.USub):
+            return f"(-{self.visit(node.operand)})"
+        if isinstance(node.op, ast.UAdd):
+            return self.visit(node.operand)
+        self.generic_visit(node.op)
+
+
+    def visit_Constant(self, node):
+        return self.number(node.value)
+
+
+    def visit_Num(self, node):
+        return self.number(node.n)
+
+
+    def number(self, value):
+        if isinstance(value, bool) or not isinstance(value, (int, float)) \
+                or not math.isfinite(value):
+            raise ValueError(f"unsupported constant in expression: {value!r}")
+        return repr(float(value))
+
+
+    def visit_Name(self, node):
+        if node.id in CONSTANTS:
+            return self.number(CONSTANTS[node.id])
+        raise ValueError(f"unknown name in expression: {node.id}")
+
+
+    def visit_Subscript(self, node):
+        index = node.slice
+        if isinstance(index, getattr(ast, "Index", ())):
+            index = index.value
+        value = getattr(index, "value", getattr(index, "n", None))
+        if not (isinstance(node.value, ast.Name) and node.value.id == "x") \
+                or isinstance(value, bool) or not isinstance(value, int) \
+                or value < 0:
+            raise ValueError(
+                "only x[i] with a non-negative integer i may be indexed")
+        self.max_index = max(self.max_index, value)
+        return f"x[{value}]"
+
+
+    def visit_Attribute(self, node):
+        if isinstance(node.value, ast.Name) and node.value.id in MODULES \
+                and node.attr in CONSTANTS:
+            return self.number(CONSTANTS[node.attr])
+        raise ValueError(f"unsupported attribute in expression: {node.attr}")
+
+
+    def visit_Call(self, node):
+        function = node.func
+        if isinstance(function, ast.Attribute) and \
+                isinstance(function.value, ast.Name) and \
+                function.value.id in MODULES:
+            name = function.attr
+        elif isinstance(function, ast.Name):
+            name = function.id
+        else:
+            raise ValueError("unsupported function call in expression")
+        if name not in FUNCTIONS or node.keywords:
+            raise ValueError(f"unsupported function in expression: {name}")
+
+        c_name, n_args = FUNCTIONS[name]
+        args = [self.visit(arg) for arg in node.args]
+        if n_args is None:
+            if len(args) < 2:
+                raise ValueError(f"{name} takes at least 2 arguments")
+            # fold min and max over any number of arguments
+            result = args[0]
+            for arg in args[1:]:
+                result = f"{c_name}({result}, {arg})"
+            return result
+        if len(args) != n_args:
+            raise ValueError(f"{name} takes {n_args} argument(s)")
+        return f"{c_name}({', '.join(args)})"
+
+
+def _default_cache_dir():
+    """
+    @returns the default directory of the compiled libraries.
+    """
+    root = os.environ.get("XDG_CACHE_HOME") or \
+        os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(root, "lpfgopt")
+
+
+def _compiler():
+    """
+    @returns the command of the C compiler. Raises RuntimeError if none
+    is found.
+    """
+    compiler = os.environ.get("CC") or shutil.which("cc") or \
+        shutil.which("gcc")
+    if not compiler:
+        raise RuntimeError("compile_expression requires a C compiler")
+    return compiler
+
+
+def _build(source, key, cache_dir):
+    """
+    Builds @param source into the shared library named after @param key in
+    @param cache_dir unless it is already there. @returns its path.
+    """
+    ext = WIN_LIB if os.name == 'nt' else UNIX_LIB
+    path = os.path.join(cache_dir, f"expr_{key}{ext}")
+    if os.path.exists(path):
+        return path
+
+    os.makedirs(cache_dir, exist_ok=True)
+    with tempfile.TemporaryDirectory(dir=cache_dir) as build_dir:
+        source_path = os.path.join(build_dir, "expr.c")
+        lib_path = os.path.join(build_dir, "expr" + ext)
+        with open(source_path, "w") as source_file:
+            source_file.write(source)
+        # no fused multiply-adds so results match the Python expression
+        command = [
+            _compiler(), "-O2", "-ffp-contract=off", "-shared", "-fPIC",
+            source_path, "-o", lib_path, "-lm"]
+        build = subprocess.run(
+            command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+        if build.returncode:
+            raise RuntimeError(
+                "compiling the expression failed:\n" +
+                build.stdout.decode(errors="replace"))
+        # another process may have built it meanwhile; either copy will do
+        os.replace(lib_path, path)
+    return path
@@ -0,0 +1,99 @@
+"""
+filename: indexed_heap.py
+Package: lpfgopt
+Author: Mark Redd
+Email: redddogjr@gmail.com
+Website: http://www.r3eda.com/
+About:
+Contains the IndexedHeap class used to track the best and worst members of
+a LeapFrog point set without scanning the whole population every iteration.
+"""
+
+
+class IndexedHeap():
+    """
+    A binary heap over the indices 0 ... n-1 ordered by the value
+    'key(i)' that supports changing the value of any index in O(log n).
+
+    The heap does not store the values; it calls 'key' when comparing
+    indices and must be told with 'update(i)' whenever 'key(i)' changes.
+
+    parameters:
+        - n       : the number of indices in the heap
+        - key     : a callable returning the value of an index
+        - reverse : if True the top of the heap is the largest value,
+                    otherwise it is the smallest value
+
+    Ties are always broken in favor of the lowest index so that 'top()'
+    returns the first occurrence of the minimum (or maximum) value.
+    """
+    def __init__(self, n, key, reverse=False):
+        self.key     = key
+        self.reverse = reverse
+        self.heap    = list(range(n))
+        self.pos     = list(range(n))
+        for k in range(len(self.heap) // 2 - 1, -1, -1):
+            self._sift_down(k)
+
+
+    def __len__(self):
+        return len(self.heap)
+
+
+    def top(self):
+        """
+        Returns the index with the smallest (largest if 'reverse') value.
+        """
+        return self.heap[0]
+
+
+    def update(self, i):
+        """
+        Restores the heap order after 'key(i)' has changed.
+        """
+        k = self.pos[i]
+        if k > 0 and self._before(i, self.heap[(k - 1) // 2]):
+            self._sift_up(k)
+        else:
+            self._sift_down(k)
+
+
+    def _before(self, i, j):
+        """
+        Returns True if index @param i belongs above index @param j.
+        """
+        vi, vj = self.key(i), self.key(j)
+        if vi == vj:
+            return i < j
+        return vi > vj if self.reverse else vi < vj
+
+
+    def _swap(self, a, b):
+        heap = self.heap
+        heap[a], heap[b] = heap[b], heap[a]
+        self.pos[heap[a]] = a
+        self.pos[heap[b]] = b
+
+
+    def _sift_up(self, k):
+        while k > 0:
+            parent = (k - 1) // 2
+            if not self._before(self.heap[k], self.heap[parent]):
+                break
+            self._swap(k, parent)
+            k = parent
+
+
+    def _sift_down(self, k):
+        n = len(self.heap)
+        while True:
+            child = 2 * k + 1
+            if child >= n:
+                break
+            if child + 1 < n and \
+                    self._before(self.heap[child + 1], self.heap[child]):
+                child += 1
+            if not self._before(self.heap[child], self.heap[k]):
+                break
+            self._swap(k, child)
+            k = child
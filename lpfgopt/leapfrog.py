@@ -23,8 +23,30 @@ by Dr. R. Russell Rhinehart. The following publications explain the technique:
 
 Example usage:
 """
-from random import seed, uniform
+import os
+import asyncio
+import inspect
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import partial
+import pickle
+from random import Random
 from lpfgopt.opt_result import OptimizeResult
+from lpfgopt.indexed_heap import IndexedHeap
+from lpfgopt.eval_cache import EvaluationCache, MISSING
+from lpfgopt.eval_store import chain_caches, open_store, code_fingerprint
+from lpfgopt.step_view import StepView, SequenceView
+try:
+    # shared memory needs Python 3.8
+    from lpfgopt.process_pool import SharedMemoryPool
+except ModuleNotFoundError:
+    SharedMemoryPool = None
+
+CHECKPOINT_VERSION = 2
+# the options that define the problem and the path of a run; a checkpoint 
+# is only resumed by an optimizer with the same values
+PROBLEM_OPTIONS = (
+    "bounds", "points", "discrete", "seedval", "synoptic", "vectorized")
+
 
 class LeapFrog():
     """
@@ -48,6 +70,68 @@ class LeapFrog():
         - seedval     : random seed
         - pointset    : starting point set
         - callback    : function to be called after each iteration
+        - vectorized  : if True, 'fun' and 'fconstraint' are called with a
+                        2-d array-like of shape (k, n) holding k decision
+                        vectors and must return k values. LeapFrog passes
+                        a list of lists; NumpyLeapFrog passes a numpy array.
+        - synoptic    : if True, use synoptic leapfrogging where each 
+                        iteration moves every player except the best over
+                        the best and evaluates the whole generation as one
+                        batch
+        - workers     : an int, a concurrent.futures.Executor or a 
+                        SharedMemoryPool used to run independent 
+                        evaluations (the initial point set and synoptic 
+                        generations) concurrently. An int starts a thread 
+                        pool of that size that is shut down when 'minimize'
+                        returns; a SharedMemoryPool is left running so it 
+                        can be reused. Results do not depend on the number 
+                        of workers.
+        - chunks      : {int} the number of slices a vectorized batch is 
+                        split into for 'workers'. Defaults to 'workers' 
+                        when it is an int and to one row per slice for an
+                        executor, whose size is not known.
+        - cache_size  : if given, the objective function values of up to 
+                        this many decision vectors are kept in a least 
+                        recently used cache so a point that is generated 
+                        again (as happens on the integer lattice of 
+                        discrete variables) is not evaluated again. 'nfev'
+                        counts only the evaluations made; the result gains
+                        'cache_hits' and 'cache_misses'.
+        - store       : an EvaluationStore or the path of its SQLite 
+                        database. Objective function values are looked up 
+                        there (after the cache) before evaluating and every
+                        new value is saved, so runs in any process on the 
+                        host share their evaluations. 'nfev' counts only 
+                        the evaluations made; the result gains 
+                        'store_hits' and 'store_misses'.
+        - fingerprint : {str} names the problem in a 'store' given as a 
+                        path. Defaults to a fingerprint of 'fun' and 'args'
+                        (see lpfgopt.eval_store.problem_fingerprint).
+                        Also names the objective of a checkpoint, which 
+                        otherwise is identified by the code of 'fun' 
+                        only (see 'problem_id').
+        - checkpoint_path  : the file 'minimize' saves the state of the run
+                             to (see 'checkpoint'). It is removed when the
+                             run finishes.
+        - checkpoint_every : the number of iterations between checkpoints
+    
+    A run saved with 'checkpoint' continues from where it stopped with
+    'resume', following the same path as if it had never stopped:
+    
+        lf = LeapFrog.resume("run.ckpt", f)
+        solution = lf.minimize()
+    
+    'fun' and 'fconstraint' may also be coroutine functions, in which case
+    the point set is evaluated by 'minimize_async' instead of the
+    constructor. 'fun' may be None when the evaluations are scheduled by
+    the caller through 'ask' and 'tell':
+    
+        lf = LeapFrog(None, bounds, seedval=1)
+        converged = False
+        while not converged:
+            xs = lf.ask()
+            converged = lf.tell(xs, [f(x) for x in xs])
+        solution = lf.result()
     """
     def __init__(
                 self, 
@@ -62,6 +146,16 @@ class LeapFrog():
                 seedval=None,
                 pointset=None,
                 callback=None,
+                vectorized=False,
+                synoptic=False,
+                workers=None,
+                chunks=None,
+                cache_size=None,
+                store=None,
+                fingerprint=None,
+                checkpoint_path=None,
+                checkpoint_every=None,
+                resume_state=None,
                 **kwargs):
                 
         self.fun         = fun
@@ -70,41 +164,79 @@ class LeapFrog():
         self.points      = points
         self.fconstraint = fconstraint
         self.discrete    = discrete
+        self.discrete_idx = self.discrete_indices(discrete)
         self.maxit       = maxit
         self.tol         = tol
         self.seed        = seedval
         self.callback    = callback
+        self.vectorized  = vectorized
+        self.synoptic    = synoptic
+        self.workers     = workers
+        self.chunks      = chunks
+        self.executor    = None
+        self.cache       = EvaluationCache(cache_size) if cache_size else None
+        self.store       = open_store(store, fun, args, fingerprint)
+        self.fingerprint = fingerprint
+        self.checkpoint_path  = checkpoint_path
+        self.checkpoint_every = checkpoint_every
         self.nfev        = 0
+        self.ncev        = 0
         self.maxcv       = 0
         self.total_iters = 0
+        self.resumed_iters = 0
         self.error       = None
 
         
-        # seed the random number generator
-        seed(self.seed)
+        if checkpoint_every is not None and (
+                checkpoint_path is None or checkpoint_every < 1):
+            raise ValueError(
+                "'checkpoint_every' must be at least 1 with a "
+                "'checkpoint_path'")
+        if checkpoint_path is not None:
+            # an objective that cannot be fingerprinted fails before any 
+            # evaluations rather than at the first checkpoint
+            self.problem_id()
+        
+        # each optimizer draws from its own random number generator
+        self.random = Random(self.seed)
         
         # build the point set
         self.n_columns = len(self.bounds) + 1
+        self.pointset = self.init_pointset(pointset)
+        self.init_constraint_cache()
+        self.init_distance_cache()
+        self.besti, self.worsti = None, None
+        self.initialized = False
+        self.init_ask_tell()
         
-        self.pointset = [
-            [0.0 for i in range(self.n_columns)] for j in range(self.points)
-            ]
-        
-        for row in range(points):
-            for column in range(1, self.n_columns):
-                if pointset is None:
-                    self.pointset[row][column] = uniform(*self.bounds[column-1])
-                else:
-                   self.pointset[row][column] = pointset[row][column-1] 
-            
-            self.pointset[row][1:] = self.enforce_discrete(
-                                                    self.pointset[row][1:])
-            self.pointset[row][0] = self.f(self.pointset[row][1:])
-        
+        # coroutine functions can only be awaited by 'minimize_async' and
+        # without a function the caller evaluates through 'ask' and 'tell'
+        self.is_async = _is_coroutine_function(fun) or \
+            _is_coroutine_function(fconstraint)
+        if resume_state is not None:
+            self.set_state(resume_state)
+        elif fun is not None and not self.is_async:
+            self.initialize()
+    
+    
+    def initialize(self):
+        """
+        Evaluates the starting point set and finds the initial best and
+        worst members.
+        """
+        self.evaluate_pointset()
         self.enforce_constraints()
-        
-        # get the initial best and worst
+        self.init_best_worst()
+    
+    
+    def init_best_worst(self):
+        """
+        Builds the best and worst heaps over the evaluated point set.
+        """
+        self.best_heap  = IndexedHeap(self.points, self.objective)
+        self.worst_heap = IndexedHeap(self.points, self.objective, reverse=True)
         self.besti, self.worsti = self.get_best_worst()
+        self.initialized = True
     
     
     def __repr__(self):
@@ -113,6 +245,7 @@ Leap Frog Optimizer State:
  best obj      : {self.pointset[self.besti][0]}
  best point    : {self.pointset[self.besti][1:]}
  fun evals     : {self.nfev}
+ constr evals  : {self.ncev}
  iterations    : {self.total_iters}
  maxcv         : {self.maxcv}
  best          : {self.pointset[self.besti]}
@@ -120,11 +253,193 @@ Leap Frog Optimizer State:
  current error : {self.error}
  """
     
+    def init_pointset(self, pointset=None):
+        """
+        Returns a new point set with shape (points, n + 1). The decision
+        variables are copied from @param pointset when it is given and
+        drawn uniformly from the bounds otherwise. The objective column
+        is left at zero to be filled in by the caller.
+        """
+        new_pointset = [
+            [0.0 for i in range(self.n_columns)] for j in range(self.points)
+            ]
+        
+        for row in range(self.points):
+            for column in range(1, self.n_columns):
+                if pointset is None:
+                    new_pointset[row][column] = self.random.uniform(
+                        *self.bounds[column-1])
+                else:
+                    new_pointset[row][column] = pointset[row][column-1]
+            
+            new_pointset[row][1:] = self.enforce_discrete(new_pointset[row][1:])
+        
+        return new_pointset
+    
+    
+    def init_constraint_cache(self):
+        """
+        Initializes the cached constraint value and feasibility flag of
+        every member of the point set. All members start out feasible
+        with a constraint value of 0.0.
+        """
+        self.constraint_values = [0.0 for i in range(self.points)]
+        self.feasible = [True for i in range(self.points)]
+        self.n_infeasible = 0
+        self.last_constraint_value = 0.0
+    
+    
+    def evaluate_pointset(self):
+        """
+        Fills in the objective column of the whole point set in one
+        batch.
+        """
+        self.set_objectives(self.f_batch(self.decision_rows()))
+    
+    
+    def set_objectives(self, values):
+        """
+        Fills in the objective column of the point set with @param values.
+        """
+        for row, value in zip(self.pointset, values):
+            row[0] = value
+    
+    
+    def decision_rows(self):
+        """
+        Returns the decision variables of every member of the point set
+        as a 2-d array-like with shape (points, n).
+        """
+        return [row[1:] for row in self.pointset]
+    
+    
+    def as_batch(self, x):
+        """
+        Returns @param x wrapped as a batch of one decision vector.
+        """
+        return [x]
+    
+    
     def f(self, x):
+        """
+        Returns the objective function value at @param x, taken from the 
+        cache or the store if there is one.
+        """
+        if self.cache is not None or self.store is not None:
+            return chain_caches([self.cache, self.store], 
+                                lambda xs: [self.f_uncached(xs[0])])([x])[0]
+        return self.f_uncached(x)
+    
+    
+    def f_uncached(self, x):
+        """
+        Evaluates the objective function at @param x.
+        """
         self.nfev += 1
+        if self.vectorized:
+            return self.fun(self.as_batch(x), *self.args)[0]
         return self.fun(x, *self.args)
     
     
+    def f_batch(self, xs):
+        """
+        Returns a list of objective function values for each decision
+        vector in @param xs. Only the points that are not cached or stored
+        are evaluated.
+        """
+        return chain_caches(
+            [self.cache, self.store], self.f_batch_uncached)(xs)
+    
+    
+    def f_batch_uncached(self, xs):
+        """
+        Evaluates the objective function at every decision vector in 
+        @param xs. A vectorized objective is called once for the whole 
+        batch.
+        """
+        if self.workers is not None:
+            self.nfev += len(xs)
+            return self.map_batch(self.fun, self.args, xs)
+        if not self.vectorized:
+            return [self.f_uncached(x) for x in xs]
+        self.nfev += len(xs)
+        return list(self.fun(xs, *self.args))
+    
+    
+    def g(self, x):
+        """
+        Returns the constraint function value at @param x.
+        """
+        self.ncev += 1
+        if self.vectorized:
+            return self.fconstraint(self.as_batch(x))[0]
+        return self.fconstraint(x)
+    
+    
+    def g_batch(self, xs):
+        """
+        Returns a list of constraint function values for each decision
+        vector in @param xs.
+        """
+        if self.workers is not None:
+            self.ncev += len(xs)
+            return self.map_batch(self.fconstraint, (), xs)
+        if not self.vectorized:
+            return [self.g(x) for x in xs]
+        self.ncev += len(xs)
+        return list(self.fconstraint(xs))
+    
+    
+    def get_executor(self):
+        """
+        Returns the executor used for batch evaluations, starting a thread
+        pool if 'self.workers' is an int.
+        """
+        if isinstance(self.workers, Executor):
+            return self.workers
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=self.workers)
+        return self.executor
+    
+    
+    def close(self):
+        """
+        Shuts down the thread pool started for 'self.workers', if any. 
+        A new pool is started if more batches are evaluated afterwards.
+        """
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+    
+    
+    def map_batch(self, fun, args, xs):
+        """
+        Evaluates @param fun at every decision vector in @param xs on the
+        worker pool and returns the values in order. A vectorized 
+        function is called once for each of 'self.chunks' slices of the 
+        batch.
+        """
+        if len(xs) == 0:
+            return []
+        if SharedMemoryPool is not None and \
+                isinstance(self.workers, SharedMemoryPool):
+            return self.workers.evaluate(fun, args, xs, self.vectorized)
+        
+        executor = self.get_executor()
+        call = partial(_call, fun, args)
+        if not self.vectorized:
+            return list(executor.map(call, xs))
+        
+        n_chunks = self.chunks
+        if n_chunks is None:
+            n_chunks = len(xs) if isinstance(self.workers, Executor) \
+                else self.workers
+        size = -(-len(xs) // min(len(xs), n_chunks))
+        chunks = [xs[i:i + size] for i in range(0, len(xs), size)]
+        values = executor.map(call, chunks)
+        return [value for chunk in values for value in chunk]
+    
+    
     def enforce_constraints(self):
         """
         Enforces the constraint penalties on any infeasible member of the 
@@ -143,40 +458,90 @@ Leap Frog Optimizer State:
         This means a return value > 0 from the constraint function
         indicates the constraint has been violated, otherwise the point
         is feasible.
+        
+        The constraint values are kept in 'self.constraint_values' and
+        'self.feasible' so they are only evaluated again when a member
+        of the point set is replaced.
         """
         if self.fconstraint is not None:
-            big = max([abs(i[0]) for i in self.pointset])
-            for i in range(self.points):
-                constraint_value = self.fconstraint(self.pointset[i][1:])
-                if constraint_value > 0:
-                    if constraint_value > self.maxcv:
-                        self.maxcv = constraint_value
-                    self.pointset[i][0] = big + constraint_value
+            self.penalize(self.g_batch(self.decision_rows()))
+    
+    
+    def penalize(self, constraint_values):
+        """
+        Caches @param constraint_values, one per member of the point set,
+        and penalizes the infeasible members as described in 
+        'enforce_constraints'.
+        """
+        big = max([abs(i[0]) for i in self.pointset])
+        for i, constraint_value in enumerate(constraint_values):
+            self.set_constraint_value(i, constraint_value)
+            if constraint_value > 0:
+                if constraint_value > self.maxcv:
+                    self.maxcv = constraint_value
+                self.pointset[i][0] = big + constraint_value
+    
+    
+    def set_constraint_value(self, i, constraint_value):
+        """
+        Caches the constraint value and feasibility of member @param i of
+        the point set.
+        """
+        feasible = not constraint_value > 0
+        if feasible != self.feasible[i]:
+            self.n_infeasible += -1 if feasible else 1
+        self.constraint_values[i] = constraint_value
+        self.feasible[i] = feasible
+    
+    
+    def replace_point(self, i, point, constraint_value=0.0):
+        """
+        Replaces member @param i of the point set with @param point and
+        updates its cached constraint value.
+        """
+        self.pointset[i] = point
+        self.set_constraint_value(i, constraint_value)
+        self.best_heap.update(i)
+        self.worst_heap.update(i)
+        self.update_distance(i)
+    
+    
+    def discrete_indices(self, discrete):
+        """
+        Returns the indices in @param discrete sorted and without repeats.
+        Built once so that 'enforce_discrete' touches only the discrete
+        columns of each new point.
+        """
+        return sorted(set(int(i) for i in discrete))
     
     
     def enforce_discrete(self, args):
         """
-        Returns a copy of @param args with the indices in the class
-        parameter 'self.discrete' made to be integer values by
-        truncating the float value.
+        Returns a copy of @param args with the indices in 
+        'self.discrete_idx' made to be integer values by truncating the 
+        float value.
         """
         args = args.copy()
-        for i in self.discrete:
+        for i in self.discrete_idx:
             args[i] = int(args[i])
         return args
     
     
+    def objective(self, i):
+        """
+        Returns the objective function value of member @param i of the 
+        point set.
+        """
+        return self.pointset[i][0]
+    
+    
     def get_best_worst(self):
-        best, worst = 0, 0
-        
-        for i in range(self.points):
-            if self.pointset[i][0] < self.pointset[best][0]:
-                best = i
-        
-            if self.pointset[i][0] > self.pointset[worst][0]:
-                worst = i
-        
-        return best, worst
+        """
+        Returns the indices of the best and worst members of the point 
+        set. Both are kept in indexed heaps that are updated whenever a
+        member is replaced so this is O(1). Ties go to the lowest index.
+        """
+        return self.best_heap.top(), self.worst_heap.top()
         
 
     def leapfrog(self, besti, worsti):
@@ -187,29 +552,14 @@ Leap Frog Optimizer State:
         'best' index.       
         """
         
-        punish = abs(self.pointset[worsti][0])
-        new_point = [0.0 for i in range(self.n_columns)]
-        
-        for i in range(self.n_columns-1):
-            new_bound = sorted([
-                self.pointset[self.besti][i+1], 
-                self.pointset[self.besti][i+1] * 2 -\
-                    self.pointset[self.worsti][i+1]
-                ])
-            
-            if new_bound[0] < self.bounds[i][0]:
-                new_bound[0] = self.bounds[i][0]
-            
-            if new_bound[1] > self.bounds[i][1]:
-                new_bound[1] = self.bounds[i][1]
-            
-            new_point[i+1] = uniform(*new_bound)
-        
-        new_point[1:] = self.enforce_discrete(new_point[1:])       
+        punish = self.punishment()
+        new_point = [0.0] + self.leap(self.besti, self.worsti)
         new_point[0]  = self.f(new_point[1:])
         
+        self.last_constraint_value = 0.0
         if self.fconstraint is not None:
-            constraint_value = self.fconstraint(new_point[1:])
+            constraint_value = self.g(new_point[1:])
+            self.last_constraint_value = constraint_value
             if constraint_value > 0:
                 if constraint_value > self.maxcv:
                         self.maxcv = constraint_value
@@ -218,6 +568,93 @@ Leap Frog Optimizer State:
         return new_point
     
     
+    def leap(self, besti, i):
+        """
+        Returns a new decision vector drawn uniformly between the point 
+        at index @param besti and the reflection of the point at index 
+        @param i over it, clipped to the bounds.
+        """
+        new_x = [0.0 for j in range(self.n_columns-1)]
+        
+        for j in range(self.n_columns-1):
+            new_bound = sorted([
+                self.pointset[besti][j+1], 
+                self.pointset[besti][j+1] * 2 -\
+                    self.pointset[i][j+1]
+                ])
+            
+            if new_bound[0] < self.bounds[j][0]:
+                new_bound[0] = self.bounds[j][0]
+            
+            if new_bound[1] > self.bounds[j][1]:
+                new_bound[1] = self.bounds[j][1]
+            
+            new_x[j] = self.random.uniform(*new_bound)
+        
+        return self.enforce_discrete(new_x)
+    
+    
+    def leap_generation(self, besti, players):
+        """
+        Returns a batch of new decision vectors, one for each index in 
+        @param players, leapfrogging over the point at @param besti.
+        """
+        return [self.leap(besti, i) for i in players]
+    
+    
+    def make_point(self, value, x):
+        """
+        Returns a point set row with objective @param value at @param x.
+        """
+        return [value] + list(x)
+    
+    
+    def synoptic_leapfrog(self):
+        """
+        Synoptic leapfrogging step. Every player except the best leaps 
+        over the best at once and the whole generation is evaluated as 
+        one batch before any player is replaced.
+        """
+        besti = self.besti
+        players = [i for i in range(self.points) if i != besti]
+        punish = self.punishment()
+        
+        candidates = self.leap_generation(besti, players)
+        values = self.f_batch(candidates)
+        if self.fconstraint is not None:
+            constraint_values = self.g_batch(candidates)
+        else:
+            constraint_values = [0.0 for i in players]
+        
+        for i, x, value, constraint_value in zip(
+                players, candidates, values, constraint_values):
+            point = self.penalized_point(x, value, constraint_value, punish)
+            self.replace_point(i, point, constraint_value)
+    
+    
+    def punishment(self):
+        """
+        Returns the number added to the objective of an infeasible leap:
+        the magnitude of the worst objective function value. It is read 
+        from the top of the worst heap so a leap's constraint handling is
+        O(1) rather than a scan of the point set.
+        """
+        return abs(self.objective(self.worst_heap.top()))
+    
+    
+    def penalized_point(self, x, value, constraint_value, punish):
+        """
+        Returns a point set row at @param x with objective @param value,
+        adding @param constraint_value and @param punish to the objective
+        when the constraint is violated.
+        """
+        if constraint_value > 0:
+            if constraint_value > self.maxcv:
+                self.maxcv = constraint_value
+            value += constraint_value + punish
+        return self.make_point(value, x)
+    
+    
     def calculate_convergence(self):
         """
         Calculates a convergence value by calculating the relative 
@@ -226,10 +663,14 @@ Leap Frog Optimizer State:
         the best point and summing the two values together. This
         convergence value is taken as the error of the optimization
         and once the error <= tolerance the optimization ends.
+        
+        The distance sum is kept up to date by 'update_distance' as 
+        members are replaced and is only rebuilt from scratch when the
+        best point changes, since every distance is normalized by it, or
+        when the sum is small enough to decide convergence so round-off 
+        from the running updates never decides termination.
         """
         obj_best = self.pointset[self.besti][0]
-        point_best = self.pointset[self.besti][1:]
-        
         obj_worst = self.pointset[self.worsti][0]
 
         if abs(obj_best) < self.tol:
@@ -239,33 +680,81 @@ Leap Frog Optimizer State:
 
         err_obj = abs((obj_worst - obj_best)/norm1) 
         
-        dist_sum = 0.0
         constraint_penalty = 0.0
-        for point in self.pointset:
-            vars = point[1:]
-            
-            if self.fconstraint is not None and self.fconstraint(vars) > 0.0:
-                    constraint_penalty = 2 * self.tol
-                
-            for i in range(self.n_columns-1):
-                if abs(point_best[i]) < self.tol:
-                    norm1 = self.tol        
-                else:
-                    norm1 = point_best[i]
-                dist_sum += abs((point_best[i] - vars[i])/norm1)
+        if self.n_infeasible > 0:
+            constraint_penalty = 2 * self.tol
         
-        return err_obj + dist_sum + constraint_penalty
+        if self.dist_besti != self.besti or self.dist_sum < self.tol:
+            self.rescan_distance()
+        
+        return err_obj + self.dist_sum + constraint_penalty
+    
+    
+    def init_distance_cache(self):
+        """
+        Initializes the cached distances between each member of the point 
+        set and the best point. The cache starts out stale.
+        """
+        self.dist_rows  = [0.0 for i in range(self.points)]
+        self.dist_norms = []
+        self.dist_besti = None
+        self.dist_sum   = 0.0
+    
+    
+    def row_distance(self, i):
+        """
+        Returns the normalized distance between member @param i of the 
+        point set and the best point the cache was built around.
+        """
+        point_best = self.pointset[self.dist_besti]
+        point = self.pointset[i]
+        dist = 0.0
+        for j, norm1 in enumerate(self.dist_norms, 1):
+            dist += abs((point_best[j] - point[j])/norm1)
+        return dist
+    
+    
+    def rescan_distance(self):
+        """
+        Rebuilds the cached distances around the current best point.
+        O(points * n)
+        """
+        self.dist_besti = self.besti
+        self.dist_norms = [
+            self.tol if abs(value) < self.tol else value
+            for value in self.pointset[self.besti][1:]
+            ]
+        self.dist_rows = [self.row_distance(i) for i in range(self.points)]
+        self.dist_sum = sum(self.dist_rows)
+    
+    
+    def update_distance(self, i):
+        """
+        Updates the cached distance sum after member @param i of the point
+        set has been replaced. O(n)
+        """
+        if i == self.dist_besti:
+            self.dist_besti = None
+        if self.dist_besti is None:
+            return
+        dist = self.row_distance(i)
+        self.dist_sum += dist - self.dist_rows[i]
+        self.dist_rows[i] = dist
     
 
     def iterate(self):
         """
         Completes one iteration of a leapfrog optimization initialized 
-        in the class constructor.
+        in the class constructor. In synoptic mode one iteration is a 
+        whole generation of leaps.
         """
-        self.pointset[self.worsti] = self.leapfrog(self.besti, self.worsti)
-        self.besti, self.worsti = self.get_best_worst()
-        self.error = self.calculate_convergence()
-        self.total_iters += 1
+        if self.synoptic:
+            self.synoptic_leapfrog()
+        else:
+            new_point = self.leapfrog(self.besti, self.worsti)
+            self.replace_point(
+                self.worsti, new_point, self.last_constraint_value)
+        self.end_iteration()
         
     
     
@@ -275,25 +764,98 @@ Leap Frog Optimizer State:
         satisfied or the number of iterations exceeds 
         'self.maxit'.
         """
+        steps = self.steps()
+        try:
+            while True:
+                next(steps)
+        except StopIteration as done:
+            return done.value
+    
+    
+    def steps(self):
+        """
+        Generator running the optimization one iteration at a time. Each
+        iteration yields the same read-only StepView of the optimizer, 
+        which reads the state only when its members are accessed; copy 
+        what must be kept past the next iteration. Sending a true value 
+        (steps.send(True)) stops the run. The generator returns (as 
+        StopIteration.value) the OptimizeResult 'minimize' would.
+        
+            steps = lf.steps()
+            for step in steps:
+                if step.nit % 100 == 0:
+                    print(step.nit, step.fun)
+        """
+        if self.is_async:
+            raise TypeError(
+                "coroutine functions must be run with 'minimize_async'")
+        if self.fun is None:
+            raise TypeError(
+                "no objective function was given; use 'ask' and 'tell'")
+        
+        view = StepView(self)
         success, status, message = False, 1, "Maximum Iterations Exceeded"
-        for iters in range(self.maxit):
-            self.iterate()
-            
-            if self.error < self.tol:
-                success, status = True, 0, 
-                message  = "Tolerance condition satisfied"
-                break
+        try:
+            # a resumed run only makes the iterations it had left
+            start, self.resumed_iters = self.resumed_iters, 0
+            for iters in range(start, self.maxit):
+                self.iterate()
+                
+                if self.error < self.tol:
+                    success, status = True, 0, 
+                    message  = "Tolerance condition satisfied"
+                    yield view
+                    break
 
-            if self.callback is not None:
-                self.callback(self.pointset[self.besti][1:])
+                if self.callback is not None:
+                    self.callback(self.pointset[self.besti][1:])
+                
+                if self.checkpoint_every is not None and \
+                        self.total_iters % self.checkpoint_every == 0:
+                    self.checkpoint(self.checkpoint_path)
+                
+                if (yield view):
+                    status, message = 2, "Stopped by the caller"
+                    break
+        finally:
+            self.close()
         
-        return OptimizeResult(
+        # a finished run leaves nothing to resume
+        if self.checkpoint_every is not None and status != 2:
+            try:
+                os.remove(self.checkpoint_path)
+            except FileNotFoundError:
+                pass
+        return self.make_result(success, status, message)
+    
+    
+    def row_view(self, i, start=0):
+        """
+        Returns a read-only view of member @param i of the point set from
+        column @param start on.
+        """
+        return SequenceView(self.pointset[i], start)
+    
+    
+    def pointset_view(self):
+        """
+        Returns a read-only view of the point set.
+        """
+        return SequenceView(self.pointset, nested=True)
+    
+    
+    def make_result(self, success, status, message):
+        """
+        Returns an OptimizeResult describing the current state.
+        """
+        result = OptimizeResult(
             x           = self.pointset[self.besti][1:],
             success     = success,
             status      = status,
             message     = message,
             fun         = self.pointset[self.besti][0],
             nfev        = self.nfev,
+            ncev        = self.ncev,
             nit         = self.total_iters,
             maxcv       = self.maxcv,
             best        = self.pointset[self.besti],
@@ -301,9 +863,508 @@ Leap Frog Optimizer State:
             final_error = self.error,
             pointset    = self.pointset
         )
+        if self.cache is not None:
+            result.cache_hits   = self.cache.hits
+            result.cache_misses = self.cache.misses
+        if self.store is not None:
+            result.store_hits   = self.store.hits
+            result.store_misses = self.store.misses
+        return result
+    
+    
+    def state(self):
+        """
+        Returns a dict holding the problem definition and everything that
+        changes during a run: the point set, the random number generator,
+        the counters and the cached constraint values and distances 
+        (whose running sum carries its own round-off). The functions,
+        workers, cache and store are not part of the state; the objective
+        is identified by its fingerprint (see 'problem_id').
+        """
+        return {
+            "version"     : CHECKPOINT_VERSION,
+            "engine"      : type(self).__name__,
+            "fingerprint" : self.problem_id(),
+            "options"     : self.state_options(),
+            "random"      : self.rng_state(),
+            "pointset"    : self.pointset,
+            "initialized" : self.initialized,
+            "counters"    : (self.nfev, self.ncev, self.maxcv, 
+                             self.total_iters, self.error),
+            "constraints" : (self.constraint_values, self.feasible,
+                             self.n_infeasible, self.last_constraint_value),
+            "distances"   : (self.dist_rows, self.dist_norms, 
+                             self.dist_besti, self.dist_sum),
+            "ask_tell"    : (self.asked, self.next_row, self.n_asked,
+                             self.gen_besti, self.gen_punish,
+                             self.told_constraint_values),
+            }
+    
+    
+    def state_options(self):
+        """
+        Returns the constructor options saved with the state.
+        """
+        return {
+            "bounds"     : self.bounds,
+            "args"       : self.args,
+            "points"     : self.points,
+            "discrete"   : self.discrete,
+            "maxit"      : self.maxit,
+            "tol"        : self.tol,
+            "seedval"    : self.seed,
+            "vectorized" : self.vectorized,
+            "synoptic"   : self.synoptic,
+            }
+    
+    
+    def problem_id(self):
+        """
+        Returns the fingerprint that ties a checkpoint to its objective:
+        the 'fingerprint' option if it was given, otherwise the 
+        'code_fingerprint' of 'fun', which leaves out the state of the 
+        objective so a stateful simulator resumes in a new process. 
+        Raises ValueError for an objective without Python code, which 
+        needs the 'fingerprint' option. None without an objective.
+        """
+        if self.fingerprint is not None:
+            return self.fingerprint
+        if self.fun is None:
+            return None
+        return code_fingerprint(self.fun)
+    
+    
+    def set_state(self, state):
+        """
+        Restores the run saved in @param state by 'state'. The best and 
+        worst heaps are rebuilt; ties go to the lowest index so they 
+        yield the same best and worst. Raises ValueError if the state was
+        saved by another engine or for another problem: another objective
+        or other values of the PROBLEM_OPTIONS.
+        """
+        if state.get("version") != CHECKPOINT_VERSION or \
+                state.get("engine") != type(self).__name__:
+            raise ValueError(
+                f"cannot resume a {state.get('engine')} checkpoint "
+                f"(version {state.get('version')}) with {type(self).__name__}")
+        
+        current = self.state_options()
+        changed = [
+            key for key in PROBLEM_OPTIONS
+            if _comparable(current[key]) != _comparable(state["options"][key])
+            ]
+        if changed:
+            raise ValueError(
+                f"the checkpoint was saved with other values of {changed}")
+        if state["fingerprint"] != self.problem_id():
+            raise ValueError(
+                "the checkpoint was saved for another objective function")
+        
+        self.set_rng_state(state["random"])
+        self.pointset = state["pointset"]
+        (self.nfev, self.ncev, self.maxcv, self.total_iters, 
+         self.error) = state["counters"]
+        self.resumed_iters = self.total_iters
+        (self.constraint_values, self.feasible, self.n_infeasible, 
+         self.last_constraint_value) = state["constraints"]
+        (self.dist_rows, self.dist_norms, self.dist_besti, 
+         self.dist_sum) = state["distances"]
+        (self.asked, self.next_row, self.n_asked, self.gen_besti,
+         self.gen_punish, self.told_constraint_values) = state["ask_tell"]
+        self.initialized = False
+        if state["initialized"]:
+            self.init_best_worst()
+    
+    
+    def rng_state(self):
+        """
+        Returns the state of the random number generator.
+        """
+        return self.random.getstate()
+    
+    
+    def set_rng_state(self, rng_state):
+        """
+        Restores the random number generator to @param rng_state.
+        """
+        self.random.setstate(rng_state)
+    
+    
+    def checkpoint(self, path):
+        """
+        Saves the state of the run (see 'state') to the file @param path
+        in pickle's binary format. The file is replaced in one step so an
+        interrupted checkpoint leaves the previous one intact.
+        """
+        path = os.fspath(path)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as file:
+            pickle.dump(self.state(), file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+    
+    
+    @classmethod
+    def resume(cls, path, fun, **kwargs):
+        """
+        Returns an optimizer continuing the run saved to @param path by
+        'checkpoint' with the objective @param fun. The point set is not
+        evaluated again. The problem definition is read from the file;
+        @param kwargs supply 'fconstraint', 'callback' and the other 
+        options that are not saved, or change 'maxit' or 'tol'.
+        Raises ValueError if @param fun or any of the PROBLEM_OPTIONS in
+        @param kwargs differ from the saved run. Only resume checkpoints
+        from a trusted source: loading one can run arbitrary code.
+        """
+        with open(path, "rb") as file:
+            state = pickle.load(file)
+        options = dict(state["options"], **kwargs)
+        return cls(fun, resume_state=state, **options)
+    
+    
+    def init_ask_tell(self):
+        """
+        Initializes the bookkeeping for 'ask' and 'tell'. 'self.asked' maps
+        each outstanding candidate (as a tuple) to the rows it replaces.
+        """
+        self.asked = {}
+        self.next_row = 0
+        self.n_asked = 0
+        self.gen_besti = None
+        self.gen_punish = 0.0
+        self.told_constraint_values = [0.0 for i in range(self.points)]
+    
+    
+    def ask(self, k=None):
+        """
+        Returns up to @param k new decision vectors to be evaluated by the
+        caller and passed back to 'tell' in any order. Before the point 
+        set has been evaluated the rows of the starting point set are 
+        returned. In synoptic mode the leaps of the current generation 
+        are returned and a new generation starts once the last one has 
+        been told. Otherwise each candidate is a leap of the current 
+        worst over the current best. By default all of the rows or leaps
+        of the generation that are still available are returned, or a 
+        single leap in sequential mode.
+        """
+        if self.initialized and not self.synoptic:
+            return [self.leap(self.besti, self.worsti)
+                    for i in range(1 if k is None else k)]
+        
+        # a point set evaluated by the constructor has no generation yet
+        if self.initialized and (self.gen_besti is None or (
+                self.next_row == self.points and self.n_asked == 0)):
+            self.next_row = 0
+            self.gen_besti = self.besti
+            self.gen_punish = self.punishment()
+        
+        rows = []
+        while self.next_row < self.points and (k is None or len(rows) < k):
+            if not self.initialized or self.next_row != self.gen_besti:
+                rows.append(self.next_row)
+            self.next_row += 1
+        
+        if self.initialized:
+            xs = self.leap_generation(self.gen_besti, rows)
+        else:
+            xs = [self.decision_rows()[i] for i in rows]
+        for i, x in zip(rows, xs):
+            self.asked.setdefault(tuple(x), []).append(i)
+        self.n_asked += len(rows)
+        return xs
+    
+    
+    def tell(self, points, values, constraint_values=None):
+        """
+        Passes the objective function @param values (and optionally the
+        constraint function @param constraint_values) of the decision 
+        vectors @param points back to the optimizer. The points are
+        normally ones returned by 'ask'. In sequential mode any other 
+        point is accepted too and replaces the current worst. 
+        @returns True once the tolerance condition is satisfied. Raises
+        ValueError for a point that was not asked for; the points before
+        it are kept and counted as evaluations, the rest are not.
+        """
+        has_constraint = constraint_values is not None
+        if not has_constraint:
+            constraint_values = [0.0 for value in values]
+        
+        for x, value, constraint_value in zip(
+                points, values, constraint_values):
+            rows = self.asked.get(tuple(x))
+            if not rows and (not self.initialized or self.synoptic):
+                raise ValueError(f"{list(x)} was not asked for")
+            self.nfev += 1
+            if has_constraint:
+                self.ncev += 1
+            if not rows:
+                self.accept(x, value, constraint_value)
+                self.end_iteration()
+                continue
+            
+            i = rows.pop()
+            if not rows:
+                del self.asked[tuple(x)]
+            self.n_asked -= 1
+            
+            if self.initialized:
+                point = self.penalized_point(
+                    x, value, constraint_value, self.gen_punish)
+                self.replace_point(i, point, constraint_value)
+            else:
+                self.pointset[i][0] = value
+                self.told_constraint_values[i] = constraint_value
+            
+            if self.n_asked == 0 and self.next_row == self.points:
+                if self.initialized:
+                    self.end_iteration()
+                else:
+                    self.penalize(self.told_constraint_values)
+                    self.init_best_worst()
+        
+        return self.converged()
+    
+    
+    def converged(self):
+        """
+        Returns True if the tolerance condition is satisfied.
+        """
+        return self.error is not None and self.error < self.tol
+    
+    
+    def result(self):
+        """
+        Returns an OptimizeResult describing the current state. Meant for
+        use with 'ask' and 'tell'.
+        """
+        if self.converged():
+            return self.make_result(True, 0, "Tolerance condition satisfied")
+        return self.make_result(
+            False, 1, "Tolerance condition not satisfied")
+    
+    
+    async def f_async(self, x):
+        """
+        Returns the objective function value at @param x, awaiting it if
+        the objective is a coroutine function. Cached and stored values 
+        are returned without awaiting anything.
+        """
+        for cache in (self.cache, self.store):
+            if cache is not None:
+                value = cache.get(x)
+                if value is not MISSING:
+                    if cache is self.store and self.cache is not None:
+                        self.cache.put(x, value)
+                    return value
+        
+        self.nfev += 1
+        if self.vectorized:
+            value = (await _maybe_await(
+                self.fun(self.as_batch(x), *self.args)))[0]
+        else:
+            value = await _maybe_await(self.fun(x, *self.args))
+        for cache in (self.cache, self.store):
+            if cache is not None:
+                cache.put(x, value)
+        return value
+    
+    
+    async def g_async(self, x):
+        """
+        Returns the constraint function value at @param x, awaiting it if
+        the constraint is a coroutine function.
+        """
+        self.ncev += 1
+        if self.vectorized:
+            return (await _maybe_await(
+                self.fconstraint(self.as_batch(x))))[0]
+        return await _maybe_await(self.fconstraint(x))
+    
+    
+    async def evaluate_async(self, x, semaphore):
+        """
+        Returns @param x with its objective and constraint values. At most
+        as many evaluations as @param semaphore allows run at once.
+        """
+        async with semaphore:
+            value = await self.f_async(x)
+            constraint_value = 0.0
+            if self.fconstraint is not None:
+                constraint_value = await self.g_async(x)
+        return x, value, constraint_value
+    
+    
+    async def evaluate_batch_async(self, xs, semaphore):
+        """
+        Returns the objective and constraint values of every decision 
+        vector in @param xs, evaluated concurrently.
+        """
+        results = await asyncio.gather(
+            *[self.evaluate_async(x, semaphore) for x in xs])
+        values = [value for x, value, constraint_value in results]
+        constraint_values = [
+            constraint_value for x, value, constraint_value in results]
+        return values, constraint_values
+    
+    
+    async def initialize_async(self, semaphore):
+        """
+        Evaluates the starting point set concurrently. See 'initialize'.
+        """
+        values, constraint_values = await self.evaluate_batch_async(
+            self.decision_rows(), semaphore)
+        self.set_objectives(values)
+        if self.fconstraint is not None:
+            self.penalize(constraint_values)
+        self.init_best_worst()
+    
+    
+    async def synoptic_leapfrog_async(self, semaphore):
+        """
+        Synoptic leapfrogging step with the generation evaluated 
+        concurrently. See 'synoptic_leapfrog'.
+        """
+        besti = self.besti
+        players = [i for i in range(self.points) if i != besti]
+        punish = self.punishment()
+        
+        candidates = self.leap_generation(besti, players)
+        values, constraint_values = await self.evaluate_batch_async(
+            candidates, semaphore)
+        
+        for i, x, value, constraint_value in zip(
+                players, candidates, values, constraint_values):
+            point = self.penalized_point(x, value, constraint_value, punish)
+            self.replace_point(i, point, constraint_value)
+    
+    
+    def accept(self, x, value, constraint_value):
+        """
+        Replaces the current worst member of the point set with the 
+        evaluated leap @param x. Used by 'iterate_async' where a leap may
+        finish after the point set has changed.
+        """
+        punish = self.punishment()
+        point = self.penalized_point(x, value, constraint_value, punish)
+        self.replace_point(self.worsti, point, constraint_value)
+    
+    
+    def end_iteration(self):
+        """
+        Finds the new best and worst and updates the convergence value.
+        """
+        self.besti, self.worsti = self.get_best_worst()
+        self.error = self.calculate_convergence()
+        self.total_iters += 1
+    
+    
+    async def iterate_async(self, concurrency=1):
+        """
+        Asynchronous generator of iterations. Up to @param concurrency 
+        leaps are evaluated at once; each leaps the worst over the best 
+        as they stand when it starts and replaces the worst as it stands
+        when it finishes, so results are applied in the order they 
+        arrive. With a concurrency of 1 this is the sequential algorithm.
+        In synoptic mode each iteration is a whole generation evaluated
+        with up to @param concurrency evaluations at once.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        if not self.initialized:
+            await self.initialize_async(semaphore)
+        
+        if self.synoptic:
+            while True:
+                await self.synoptic_leapfrog_async(semaphore)
+                self.end_iteration()
+                yield
+        
+        pending = set()
+        try:
+            while True:
+                while len(pending) < concurrency:
+                    x = self.leap(self.besti, self.worsti)
+                    pending.add(asyncio.ensure_future(
+                        self.evaluate_async(x, semaphore)))
+                
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    self.accept(*task.result())
+                    self.end_iteration()
+                    yield
+        finally:
+            for task in pending:
+                task.cancel()
+    
+    
+    async def minimize_async(self, concurrency=1):
+        """
+        Minimizes a function that may be a coroutine function, keeping up
+        to @param concurrency evaluations in flight, until the 
+        convergence criteria are satisfied or the number of iterations 
+        exceeds 'self.maxit'. See 'iterate_async'.
+        """
+        if not self.initialized:
+            await self.initialize_async(asyncio.Semaphore(concurrency))
+        
+        success, status, message = False, 1, "Maximum Iterations Exceeded"
+        iterations = self.iterate_async(concurrency)
+        try:
+            if self.maxit > 0:
+                async for _ in iterations:
+                    if self.error < self.tol:
+                        success, status = True, 0
+                        message  = "Tolerance condition satisfied"
+                        break
+                    
+                    if self.callback is not None:
+                        self.callback(self.pointset[self.besti][1:])
+                    
+                    if self.total_iters >= self.maxit:
+                        break
+        finally:
+            await iterations.aclose()
+        
+        return self.make_result(success, status, message)
+
+
+def _comparable(value):
+    """
+    Returns @param value with arrays and tuples turned into lists so that
+    saved and given options compare equal whatever container holds them.
+    """
+    if hasattr(value, "tolist"):
+        value = value.tolist()
+    if isinstance(value, (list, tuple)):
+        return [_comparable(item) for item in value]
+    return value
+
+
+def _is_coroutine_function(fun):
+    """
+    Returns True if @param fun is a coroutine function or an object with
+    an 'async def __call__'.
+    """
+    return inspect.iscoroutinefunction(fun) or \
+        inspect.iscoroutinefunction(getattr(fun, "__call__", None))
+
+
+async def _maybe_await(value):
+    """
+    Returns @param value, awaiting it first if it is awaitable.
+    """
+    if inspect.isawaitable(value):
+        return await value
+    return value
+
+
+def _call(fun, args, x):
+    """
+    Calls @param fun at @param x with @param args. Defined at module level
+    so that it may be sent to a process pool.
+    """
+    return fun(x, *args)
 
 
-    
 def _main():
     """
     Run a simple test on the optimizer.
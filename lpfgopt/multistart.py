@@ -0,0 +1,130 @@
+"""
+filename: multistart.py
+Package: lpfgopt
+Author: Mark Redd
+Email: redddogjr@gmail.com
+Website: http://www.r3eda.com/
+About:
+Contains minimize_many and iminimize_many which run independent leapfrog
+optimizations of the same problem from several random seeds in a process
+pool. A single run may end in a local optimum; the best of many runs is far
+less likely to.
+
+Example usage:
+
+    from lpfgopt import minimize_many
+
+    solution = minimize_many(fun, bounds, seeds=32, n_jobs=8)
+    print(solution.x, solution.seedval)
+    for run in solution.runs:
+        print(run.seedval, run.fun)
+
+The objective and constraint functions must be picklable (e.g. defined at
+the top level of a module) unless n_jobs is 1.
+"""
+from concurrent.futures import Executor, ProcessPoolExecutor, as_completed
+from lpfgopt.opt_result import OptimizeResult
+
+SUMMARY_KEYS = ["x", "fun", "success", "status", "nit", "nfev", "ncev"]
+
+
+def iminimize_many(fun, bounds, seeds=10, n_jobs=None, **kwargs):
+    """
+    Runs one optimization of @param fun over @param bounds for each seed
+    and yields each solution as soon as its run finishes.
+
+    parameters:
+        - fun     : {callable} objective function
+        - bounds  : {array-like with shape=(n, 2)} variable bounds
+        - seeds   : {int or iterable of int} the random seeds to run. An
+                    int runs the seeds 1 through 'seeds'.
+        - n_jobs  : {int or concurrent.futures.Executor} the number of
+                    worker processes; defaults to the number of CPUs. With
+                    1 the runs are made one after another in this process.
+                    An executor is used as given and left running.
+        - kwargs  : any other option of 'minimize' (e.g. 'use_c_lib')
+
+    yields:
+        - solution : the OptimizeResult of one run with the extra member
+                     'seedval'
+    """
+    seeds = _seed_list(seeds)
+    # a loaded library cannot be sent to another process
+    kwargs.pop("cdll_ptr", None)
+
+    if n_jobs == 1:
+        for seedval in seeds:
+            yield _minimize_seed(fun, bounds, seedval, kwargs)
+        return
+
+    executor = n_jobs if isinstance(n_jobs, Executor) else \
+        ProcessPoolExecutor(max_workers=n_jobs)
+    futures = []
+    try:
+        futures = [
+            executor.submit(_minimize_seed, fun, bounds, seedval, kwargs)
+            for seedval in seeds
+            ]
+        for future in as_completed(futures):
+            yield future.result()
+    finally:
+        for future in futures:
+            future.cancel()
+        if executor is not n_jobs:
+            executor.shutdown()
+
+
+def minimize_many(fun, bounds, seeds=10, n_jobs=None, **kwargs):
+    """
+    Runs one optimization for each seed in a process pool and returns the
+    best. Takes the same parameters as 'iminimize_many'.
+
+    returns:
+        - solution : the OptimizeResult of the run with the lowest
+                     objective function value, preferring successful runs,
+                     with the extra members:
+            - seedval : {int} the seed of the best run
+            - nruns   : {int} the number of runs
+            - runs    : {list of OptimizeResult} a summary of every run in
+                        seed order holding 'seedval', 'x', 'fun',
+                        'success', 'status', 'nit', 'nfev' and 'ncev'
+
+    raises:
+        - ValueError : if there are no seeds to run
+    """
+    seeds = _seed_list(seeds)
+    if not seeds:
+        raise ValueError("at least one seed is required")
+    order = {seedval: i for i, seedval in enumerate(seeds)}
+    rank = lambda run: (run.success, -run.fun, -order[run.seedval])
+
+    best = None
+    runs = []
+    for solution in iminimize_many(fun, bounds, seeds, n_jobs, **kwargs):
+        runs.append(OptimizeResult(
+            seedval=solution.seedval,
+            **{key: solution[key] for key in SUMMARY_KEYS}))
+        if best is None or rank(solution) > rank(best):
+            best = solution
+
+    best.runs = sorted(runs, key=lambda run: order[run.seedval])
+    best.nruns = len(runs)
+    return best
+
+
+def _seed_list(seeds):
+    """
+    Returns @param seeds as a list; an int n gives the seeds 1 through n.
+    """
+    return list(range(1, seeds + 1)) if isinstance(seeds, int) else list(seeds)
+
+
+def _minimize_seed(fun, bounds, seedval, kwargs):
+    """
+    Runs 'minimize' with @param seedval. Defined at module level so that
+    it may be sent to a process pool.
+    """
+    from lpfgopt import minimize
+    solution = minimize(fun, bounds, seedval=seedval, **kwargs)
+    solution.seedval = seedval
+    return solution
@@ -0,0 +1,246 @@
+"""
+filename: np_leapfrog.py
+Package: lpfgopt
+Author: Mark Redd
+Email: redddogjr@gmail.com
+Website: http://www.r3eda.com/
+About:
+Contains the NumpyLeapFrog class, a LeapFrog optimizer that keeps the point
+set in a single contiguous numpy array and vectorizes the per-dimension work
+of each step (leap generation, bound clipping, discrete truncation and the
+convergence sum).
+
+This algorithm is based the Leapfrogging Optimization Algorithm published
+by Dr. R. Russell Rhinehart. The following publications explain the technique:
+
+- Rhinehart, R. R., M. Su, and U. Manimegalai-Sridhar, “Leapfrogging and
+  Synoptic Leapfrogging: a new optimization approach”, Computers & Chemical
+  Engineering, Vol. 40, 11 May 2012, pp. 67-81.
+
+- Manimegalai-Sridhar, U., A. Govindarajan, and R. R. Rhinehart, “Improved
+  Initialization of Players in Leapfrogging Optimization”, Computers &
+  Chemical Engineering, Vol. 60, 2014, 426-429.
+
+- Rhinehart, R. R., “Convergence Criterion in Optimilsation of Stochastic
+  Processes”, Computers & Chemical Engineering, Vol. 68, 4 Sept 2014, pp 1-6.
+"""
+from lpfgopt.leapfrog import LeapFrog
+try:
+    import numpy as np
+except ModuleNotFoundError:
+    np = None
+
+
+class NumpyLeapFrog(LeapFrog):
+    """
+    A LeapFrog optimizer backed by numpy. The point set is stored as one
+    float64 array with shape (points, n + 1) where column 0 holds the
+    objective function values. Takes the same parameters as LeapFrog and
+    produces an OptimizeResult with the same fields; 'x', 'best', 'worst'
+    and 'pointset' are numpy arrays.
+
+    The random numbers are drawn from a numpy Generator seeded with
+    'seedval' so a run is reproducible but will not follow the same path
+    as the pure Python LeapFrog with the same seed.
+    """
+    def __init__(self, fun, bounds, seedval=None, **kwargs):
+        if np is None:
+            raise ImportError("NumpyLeapFrog requires numpy to be installed")
+
+        bounds = np.asarray(bounds, dtype=np.float64)
+        self.lower = bounds[:, 0].copy()
+        self.upper = bounds[:, 1].copy()
+        self.rng = np.random.default_rng(seedval)
+
+        super().__init__(fun, bounds, seedval=seedval, **kwargs)
+
+
+    def rng_state(self):
+        return self.rng.bit_generator.state
+
+
+    def set_rng_state(self, rng_state):
+        self.rng.bit_generator.state = rng_state
+
+
+    def init_pointset(self, pointset=None):
+        """
+        Returns a new (points, n + 1) array with the decision variables
+        copied from @param pointset or drawn uniformly from the bounds.
+        """
+        new_pointset = np.zeros((self.points, self.n_columns))
+
+        if pointset is None:
+            new_pointset[:, 1:] = self.rng.uniform(
+                self.lower, self.upper, size=(self.points, self.n_columns - 1))
+        else:
+            new_pointset[:, 1:] = np.asarray(
+                pointset, dtype=np.float64)[:self.points]
+
+        self.truncate(new_pointset[:, 1:])
+        return new_pointset
+
+
+    def discrete_indices(self, discrete):
+        """
+        Returns the discrete indices as an integer array for fancy
+        indexing.
+        """
+        return np.asarray(discrete, dtype=np.intp).reshape(-1)
+
+
+    def truncate(self, x):
+        """
+        Truncates the discrete columns of @param x (1-d or 2-d) in place.
+        """
+        if self.discrete_idx.size:
+            x[..., self.discrete_idx] = np.trunc(x[..., self.discrete_idx])
+
+
+    def enforce_discrete(self, args):
+        """
+        Returns a copy of @param args with the discrete indices truncated
+        to integer values.
+        """
+        args = np.array(args, dtype=np.float64)
+        self.truncate(args)
+        return args
+
+
+    def init_constraint_cache(self):
+        self.constraint_values = np.zeros(self.points)
+        self.feasible = np.ones(self.points, dtype=bool)
+        self.n_infeasible = 0
+        self.last_constraint_value = 0.0
+
+
+    def set_objectives(self, values):
+        self.pointset[:, 0] = values
+
+
+    def decision_rows(self):
+        return self.pointset[:, 1:]
+
+
+    def as_batch(self, x):
+        return np.asarray(x, dtype=np.float64)[np.newaxis, :]
+
+
+    def penalize(self, constraint_values):
+        """
+        Caches @param constraint_values and penalizes the infeasible 
+        members of the point set with the whole set handled at once. See 
+        LeapFrog.enforce_constraints for details.
+        """
+        big = np.abs(self.pointset[:, 0]).max()
+        constraint_values = np.asarray(constraint_values, dtype=np.float64)
+        infeasible = constraint_values > 0
+        self.constraint_values[:] = constraint_values
+        self.feasible[:] = ~infeasible
+        self.n_infeasible = int(infeasible.sum())
+        if infeasible.any():
+            self.maxcv = max(self.maxcv, constraint_values.max())
+            self.pointset[infeasible, 0] = big + constraint_values[infeasible]
+
+
+    def ask(self, k=None):
+        """
+        Returns a (k, n) array of decision vectors to be evaluated. See 
+        LeapFrog.ask.
+        """
+        xs = super().ask(k)
+        return np.asarray(xs, dtype=np.float64).reshape(-1, self.n_columns - 1)
+
+
+    def objective(self, i):
+        return self.pointset[i, 0]
+
+
+    def leap(self, besti, i):
+        """
+        Returns a new decision vector leapfrogging the point at @param i
+        over the point at @param besti with all of the dimensions handled 
+        at once.
+        """
+        return self.leap_generation(besti, i)
+
+
+    def leap_generation(self, besti, players):
+        """
+        Returns a (len(players), n) array of new decision vectors, one for 
+        each index in @param players, leapfrogging over @param besti.
+        """
+        best = self.pointset[besti, 1:]
+        reflected = 2.0 * best - self.pointset[players, 1:]
+
+        low = np.maximum(np.minimum(best, reflected), self.lower)
+        high = np.minimum(np.maximum(best, reflected), self.upper)
+
+        new_x = self.rng.uniform(low, high)
+        self.truncate(new_x)
+        return new_x
+
+
+    def make_point(self, value, x):
+        new_point = np.empty(self.n_columns)
+        new_point[0] = value
+        new_point[1:] = x
+        return new_point
+
+
+    def leapfrog(self, besti, worsti):
+        """
+        Core step in the leapfrogging algorithm. Generates a new point in
+        place of the worst by "leapfrogging" over the best.
+        """
+        punish = self.punishment()
+        new_point = self.make_point(0.0, self.leap(self.besti, self.worsti))
+        new_point[0] = self.f(new_point[1:])
+
+        self.last_constraint_value = 0.0
+        if self.fconstraint is not None:
+            constraint_value = self.g(new_point[1:])
+            self.last_constraint_value = constraint_value
+            if constraint_value > 0:
+                if constraint_value > self.maxcv:
+                    self.maxcv = constraint_value
+                new_point[0] += constraint_value + punish
+
+        return new_point
+
+
+    def row_view(self, i, start=0):
+        return self.pointset_view()[i, start:]
+
+
+    def pointset_view(self):
+        view = self.pointset.view()
+        view.flags.writeable = False
+        return view
+
+
+    def init_distance_cache(self):
+        self.dist_rows  = np.zeros(self.points)
+        self.dist_norms = np.ones(self.n_columns - 1)
+        self.dist_besti = None
+        self.dist_sum   = 0.0
+
+
+    def row_distance(self, i):
+        point_best = self.pointset[self.dist_besti, 1:]
+        return float(np.abs(
+            (point_best - self.pointset[i, 1:])/self.dist_norms).sum())
+
+
+    def rescan_distance(self):
+        """
+        Rebuilds the cached distances around the current best point with
+        the whole point set handled in one vectorized expression.
+        """
+        self.dist_besti = self.besti
+        point_best = self.pointset[self.besti, 1:]
+        self.dist_norms = np.where(
+            np.abs(point_best) < self.tol, self.tol, point_best)
+        self.dist_rows = np.abs(
+            (point_best - self.pointset[:, 1:])/self.dist_norms).sum(axis=1)
+        self.dist_sum = float(self.dist_rows.sum())
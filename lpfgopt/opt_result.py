@@ -33,6 +33,8 @@ class OptimizeResult(dict):
         Value of objective function at x.
     nfev: int
         Number of evaluations of the objective functions.
+    ncev: int
+        Number of evaluations of the constraint function.
     nit : int
         Number of iterations performed by the optimizer.
     maxcv : float
@@ -0,0 +1,251 @@
+"""
+filename: process_pool.py
+Package: lpfgopt
+Author: Mark Redd
+Email: redddogjr@gmail.com
+Website: http://www.r3eda.com/
+About:
+Contains the SharedMemoryPool class, a pool of persistent worker processes
+that evaluate batches of decision vectors for LeapFrog. The decision vectors
+and the resulting values are passed through a shared memory buffer instead
+of being pickled, and the workers stay alive between optimizations so that
+many short runs do not pay the process start-up cost each time.
+
+Example usage:
+
+    from lpfgopt import minimize, SharedMemoryPool
+
+    with SharedMemoryPool(8) as pool:
+        for bounds in problems:
+            minimize(fun, bounds, synoptic=True, workers=pool)
+
+The objective and constraint functions must be picklable (e.g. defined at
+the top level of a module) since they are sent to each worker once per run.
+They receive each decision vector as a numpy array.
+"""
+import os
+import pickle
+import threading
+import multiprocessing
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+try:
+    import numpy as np
+except ModuleNotFoundError:
+    np = None
+
+ITEMSIZE = 8
+MAX_FUNCTIONS = 16
+
+
+class SharedMemoryPool():
+    """
+    A pool of persistent worker processes for evaluating batches of
+    decision vectors through shared memory.
+
+    parameters:
+        - processes : the number of worker processes; defaults to the
+                      number of CPUs
+        - context   : the multiprocessing start method ('fork', 'spawn'
+                      or 'forkserver'); defaults to the platform default
+
+    The pool may be passed as 'workers' to LeapFrog, NumpyLeapFrog and
+    minimize. It must be closed with 'close()' or used as a context
+    manager.
+    """
+    def __init__(self, processes=None, context=None):
+        if np is None:
+            raise ImportError("SharedMemoryPool requires numpy to be installed")
+
+        ctx = multiprocessing.get_context(context)
+        self.processes = processes or os.cpu_count() or 1
+        self.lock      = threading.Lock()
+        self.shm       = None
+        self.functions = {}
+        self.token     = 0
+        self.conns     = []
+        self.procs     = []
+
+        for i in range(self.processes):
+            parent_conn, child_conn = ctx.Pipe()
+            proc = ctx.Process(target=_worker, args=(child_conn,), daemon=True)
+            proc.start()
+            child_conn.close()
+            self.conns.append(parent_conn)
+            self.procs.append(proc)
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+    def evaluate(self, fun, args, xs, vectorized=False):
+        """
+        Evaluates @param fun at each row of the 2-d array-like @param xs
+        with the extra arguments @param args and returns a list of the
+        values in row order. The rows are split into one contiguous block
+        per worker. A vectorized function is called once per block.
+        """
+        with self.lock:
+            xs = np.asarray(xs, dtype=np.float64)
+            k, n = xs.shape
+            if k == 0:
+                return []
+
+            token = self._send_function(fun, args, vectorized)
+            self._reserve(k * (n + 1) * ITEMSIZE)
+            rows = np.ndarray((k, n), dtype=np.float64, buffer=self.shm.buf)
+            rows[:] = xs
+            del rows
+
+            n_blocks = min(k, self.processes)
+            size = -(-k // n_blocks)
+            blocks = [(i, min(i + size, k)) for i in range(0, k, size)]
+            for conn, (start, stop) in zip(self.conns, blocks):
+                conn.send(("eval", token, self.shm.name, k, n, start, stop))
+
+            errors = [conn.recv() for conn, block in zip(self.conns, blocks)]
+            for error in errors:
+                if error is not None:
+                    raise error
+
+            values = np.ndarray(
+                (k,), dtype=np.float64, buffer=self.shm.buf,
+                offset=k * n * ITEMSIZE)
+            output = values.tolist()
+            del values
+            return output
+
+
+    def close(self):
+        """
+        Stops the worker processes and releases the shared memory.
+        """
+        with self.lock:
+            for conn, proc in zip(self.conns, self.procs):
+                try:
+                    conn.send(("stop",))
+                except (BrokenPipeError, OSError):
+                    pass
+                proc.join()
+                conn.close()
+            self.conns, self.procs = [], []
+            self._release()
+
+
+    def _send_function(self, fun, args, vectorized):
+        """
+        Sends the function being evaluated to every worker unless it has
+        already been sent. @returns the token the workers know it by.
+        The workers forget every function once MAX_FUNCTIONS are held.
+        """
+        key = (id(fun), id(args), vectorized)
+        if key in self.functions:
+            return self.functions[key][0]
+
+        payload = pickle.dumps((fun, args, vectorized))
+        if len(self.functions) >= MAX_FUNCTIONS:
+            for conn in self.conns:
+                conn.send(("clear",))
+            self.functions.clear()
+
+        self.token += 1
+        for conn in self.conns:
+            conn.send(("fun", self.token, payload))
+        # keep references to fun and args so their ids are not reused
+        self.functions[key] = (self.token, fun, args)
+        return self.token
+
+
+    def _reserve(self, nbytes):
+        """
+        Makes sure the shared buffer holds at least @param nbytes. The
+        buffer at least doubles when it grows so resizing is rare.
+        """
+        if self.shm is not None and self.shm.size >= nbytes:
+            return
+        size = nbytes if self.shm is None else max(nbytes, 2 * self.shm.size)
+        self._release()
+        self.shm = SharedMemory(create=True, size=size)
+
+
+    def _release(self):
+        if self.shm is not None:
+            self.shm.close()
+            self.shm.unlink()
+            self.shm = None
+
+
+def _attach(name):
+    """
+    Attaches to an existing shared memory block without handing it to
+    the resource tracker, which belongs to the pool that created it.
+    """
+    try:
+        return SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13 always registers the block on attach
+        shm = SharedMemory(name=name)
+        resource_tracker.unregister(shm._name, "shared_memory")
+        return shm
+
+
+def _worker(conn):
+    """
+    The loop run by each worker process. Messages are tuples whose first
+    element names the request:
+        - ("fun", token, payload)                : store a function
+        - ("clear",)                             : forget all functions
+        - ("eval", token, name, k, n, start, stop)
+                                                 : evaluate rows start:stop
+        - ("stop",)                              : exit
+    """
+    shm = None
+    functions = {}
+    try:
+        while True:
+            message = conn.recv()
+            if message[0] == "stop":
+                break
+            if message[0] == "clear":
+                functions.clear()
+                continue
+            if message[0] == "fun":
+                functions[message[1]] = message[2]
+                continue
+
+            token, name, k, n, start, stop = message[1:]
+            if shm is None or shm.name.lstrip("/") != name.lstrip("/"):
+                if shm is not None:
+                    shm.close()
+                shm = _attach(name)
+            try:
+                if not isinstance(functions[token], tuple):
+                    functions[token] = pickle.loads(functions[token])
+                fun, args, vectorized = functions[token]
+                rows = np.ndarray((k, n), dtype=np.float64, buffer=shm.buf)
+                values = np.ndarray(
+                    (k,), dtype=np.float64, buffer=shm.buf,
+                    offset=k * n * ITEMSIZE)
+                if vectorized:
+                    values[start:stop] = fun(rows[start:stop], *args)
+                else:
+                    for i in range(start, stop):
+                        values[i] = fun(rows[i], *args)
+                del rows, values
+                conn.send(None)
+            except Exception as error:
+                rows = values = None
+                try:
+                    conn.send(error)
+                except Exception:
+                    conn.send(RuntimeError(repr(error)))
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        if shm is not None:
+            shm.close()
@@ -22,6 +22,7 @@ by Dr. R. Russell Rhinehart. The following publications explain the technique:
   Processes”, Computers & Chemical Engineering, Vol. 68, 4 Sept 2014, pp 1-6.
 """
 from lpfgopt.leapfrog import LeapFrog
+from lpfgopt.np_leapfrog import NumpyLeapFrog
 from lpfgopt.c_leapfrog import minimize as c_minimize
 try:
     from scipy.optimize import OptimizeResult
@@ -58,8 +59,12 @@ def leapfrog_method(fun, x0, args, **kwargs):
     kwargs["args"] = args
 
     use_clib = False if "use_clib" not in kwargs else kwargs["use_clib"]
+    use_numpy = False if "use_numpy" not in kwargs else kwargs["use_numpy"]
     if use_clib:
         solution = c_minimize(**kwargs)
+    elif use_numpy:
+        lf = NumpyLeapFrog(**kwargs)
+        solution = lf.minimize()
     else:
         lf = LeapFrog(**kwargs)
         solution = lf.minimize()
@@ -0,0 +1,167 @@
+"""
+filename: step_view.py
+Package: lpfgopt
+Author: Mark Redd
+Email: redddogjr@gmail.com
+Website: http://www.r3eda.com/
+About:
+Contains the StepView class yielded by LeapFrog.steps and SequenceView, the
+read-only view it uses for the point set rows of the pure Python engine.
+A StepView reads the optimizer's state when its members are accessed so
+watching a run costs nothing for the members that are not looked at.
+"""
+from collections.abc import Sequence
+from lpfgopt.opt_result import OptimizeResult
+
+
+class SequenceView(Sequence):
+    """
+    A read-only view of the sequence 'items' from index 'start' on. If
+    'nested' each item is itself returned as a SequenceView.
+    """
+    __slots__ = ("items", "start", "nested")
+
+    def __init__(self, items, start=0, nested=False):
+        self.items  = items
+        self.start  = start
+        self.nested = nested
+
+
+    def __len__(self):
+        return len(self.items) - self.start
+
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("view index out of range")
+        item = self.items[self.start + i]
+        return SequenceView(item) if self.nested else item
+
+
+    def __eq__(self, other):
+        if not isinstance(other, Sequence):
+            return NotImplemented
+        return len(self) == len(other) and \
+            all(a == b for a, b in zip(self, other))
+
+
+    def __repr__(self):
+        return repr(list(self))
+
+
+class StepView():
+    """
+    A read-only view of the state of a LeapFrog optimizer after an
+    iteration. The same view is yielded for every step of a run and its
+    members always describe the current state, so it must be copied
+    (see 'copy') to be kept past the next step.
+
+    members:
+        - nit       : the number of iterations performed
+        - nfev      : the number of objective function evaluations
+        - ncev      : the number of constraint function evaluations
+        - maxcv     : the maximum constraint violation so far
+        - error     : the convergence value
+        - converged : True if the tolerance condition is satisfied
+        - fun       : the best objective function value
+        - x         : the best decision vector
+        - best      : the best member of the point set
+        - worst     : the worst member of the point set
+        - pointset  : the point set
+
+    The vectors are read-only views; numpy arrays for NumpyLeapFrog and
+    SequenceViews otherwise.
+    """
+    __slots__ = ("lf",)
+
+    def __init__(self, lf):
+        self.lf = lf
+
+
+    @property
+    def nit(self):
+        return self.lf.total_iters
+
+
+    @property
+    def nfev(self):
+        return self.lf.nfev
+
+
+    @property
+    def ncev(self):
+        return self.lf.ncev
+
+
+    @property
+    def maxcv(self):
+        return self.lf.maxcv
+
+
+    @property
+    def error(self):
+        return self.lf.error
+
+
+    @property
+    def converged(self):
+        return self.lf.converged()
+
+
+    @property
+    def fun(self):
+        return self.lf.objective(self.lf.besti)
+
+
+    @property
+    def x(self):
+        return self.lf.row_view(self.lf.besti, 1)
+
+
+    @property
+    def best(self):
+        return self.lf.row_view(self.lf.besti)
+
+
+    @property
+    def worst(self):
+        return self.lf.row_view(self.lf.worsti)
+
+
+    @property
+    def pointset(self):
+        return self.lf.pointset_view()
+
+
+    def __repr__(self):
+        return f"StepView(nit={self.nit}, fun={self.fun}, error={self.error})"
+
+
+    def copy(self):
+        """
+        Returns an OptimizeResult holding a copy of the current state
+        without the point set.
+        """
+        return OptimizeResult(
+            nit       = self.nit,
+            nfev      = self.nfev,
+            ncev      = self.ncev,
+            maxcv     = self.maxcv,
+            error     = self.error,
+            converged = self.converged,
+            fun       = self.fun,
+            x         = _copy(self.x),
+            best      = _copy(self.best),
+            worst     = _copy(self.worst),
+        )
+
+
+def _copy(view):
+    """
+    Returns a writable copy of the row @param view.
+    """
+    return view.copy() if hasattr(view, "copy") else list(view)
@@ -0,0 +1,124 @@
+import random
+
+import pytest
+
+from . import *
+from lpfgopt import LeapFrog, NumpyLeapFrog, CLeapFrog
+
+
+def _f(x):
+    return 2.0 * (x[0] - 1.0)**2 + (x[1] - 2.0)**2 + 3.0
+
+def _g(x):
+    return x[0] + 3
+
+_bounds = [[-10.0, 10.0], [-10.0, 10.0]]
+
+_options = {
+    "points"      : 20,
+    "tol"         : 1e-3,
+    "seedval"     : 1235,
+    }
+
+
+def _run(lf, k=None, shuffle=None, g=_g):
+    """
+    Runs an ask/tell loop to convergence, telling each batch in a shuffled
+    order if @param shuffle is a random.Random.
+    """
+    converged = False
+    while not converged:
+        xs = [list(x) for x in lf.ask(k)]
+        if shuffle is not None:
+            shuffle.shuffle(xs)
+        converged = lf.tell(xs, [_f(x) for x in xs],
+                            None if g is None else [g(x) for x in xs])
+    return lf.result()
+
+
+def test_ask_tell_matches_minimize():
+    """
+    Asking for and telling every point in order follows the same path
+    as 'minimize'
+    """
+    for synoptic in (False, True):
+        options = dict(_options, synoptic=synoptic)
+        for lf_class in (LeapFrog, NumpyLeapFrog):
+            serial = lf_class(_f, _bounds, fconstraint=_g, **options).minimize()
+            solution = _run(lf_class(None, _bounds, **options))
+
+            assert solution.success
+            assert (np.asarray(solution.pointset) == serial.pointset).all()
+            assert solution.nit == serial.nit
+            assert solution.nfev == serial.nfev
+            assert solution.ncev == serial.ncev
+
+        serial = c_minimize(_f, _bounds, fconstraint=_g, **options)
+        solution = _run(CLeapFrog(_bounds, **options))
+
+        assert solution.success
+        assert (serial.pointset == solution.pointset).all()
+        assert solution.nit == serial.nit
+        assert solution.nfev == serial.nfev
+
+
+def test_ask_tell_after_constructor():
+    """
+    A synoptic optimizer whose point set was evaluated by the constructor
+    asks for the whole first generation and follows 'minimize'
+    """
+    for lf_class in (LeapFrog, NumpyLeapFrog):
+        options = dict(_options, synoptic=True)
+        serial = lf_class(_f, _bounds, fconstraint=_g, **options).minimize()
+        lf = lf_class(_f, _bounds, fconstraint=_g, **options)
+
+        assert len(lf.ask()) == _options["points"] - 1
+        lf = lf_class(_f, _bounds, fconstraint=_g, **options)
+        solution = _run(lf)
+        assert (np.asarray(solution.pointset) == serial.pointset).all()
+        assert solution.nit == serial.nit
+
+
+def test_ask_tell_out_of_order():
+    """
+    Points may be told in any order and in smaller batches
+    """
+    for lf in (LeapFrog(None, _bounds, synoptic=True, **_options),
+               NumpyLeapFrog(None, _bounds, synoptic=True, **_options),
+               CLeapFrog(_bounds, synoptic=True, **_options),
+               LeapFrog(None, _bounds, **_options)):
+        solution = _run(lf, k=7, shuffle=random.Random(0), g=None)
+
+        assert solution.success
+        assert abs(solution.x[0] - 1.0) < 1e-2
+        assert abs(solution.x[1] - 2.0) < 1e-2
+
+
+def test_ask_tell_unknown_point():
+    """
+    Points that were not asked for are rejected until the point set has
+    been evaluated
+    """
+    lf = LeapFrog(None, _bounds, **_options)
+    lf.ask()
+    with pytest.raises(ValueError):
+        lf.tell([[0.5, 0.5]], [1.0])
+
+    lf = CLeapFrog(_bounds, **_options)
+    lf.ask()
+    with pytest.raises(ValueError):
+        lf.tell([[0.5, 0.5]], [1.0])
+
+    # rejected points and those after them are not counted
+    lf = LeapFrog(None, _bounds, **_options)
+    c_lf = CLeapFrog(_bounds, **_options)
+    for optimizer in (lf, c_lf):
+        xs = [list(x) for x in optimizer.ask()]
+        with pytest.raises(ValueError):
+            optimizer.tell([xs[0], [0.5, 0.5], xs[1]], [1.0, 2.0, 3.0], 
+                           [0.0, 0.0, 0.0])
+    assert (lf.nfev, lf.ncev) == (1, 1)
+    assert (c_lf.result().nfev, c_lf.result().ncev) == (1, 1)
+
+    with pytest.raises(TypeError):
+        LeapFrog(None, _bounds, **_options).minimize()
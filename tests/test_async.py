@@ -0,0 +1,91 @@
+import asyncio
+
+import pytest
+
+from . import *
+from lpfgopt import minimize_async
+
+
+def _f(x):
+    return 2.0 * (x[0] - 1.0)**2 + (x[1] - 2.0)**2 + 3.0
+
+async def _f_async(x):
+    await asyncio.sleep(0)
+    return _f(x)
+
+def _g(x):
+    return x[0] + 3
+
+async def _g_async(x):
+    await asyncio.sleep(0)
+    return _g(x)
+
+_bounds = [[-10.0, 10.0], [-10.0, 10.0]]
+
+_options = {
+    "points"      : 20,
+    "tol"         : 1e-3,
+    "seedval"     : 1235,
+    }
+
+
+def test_async_matches_sequential():
+    """
+    With one evaluation in flight the result is the same as 'minimize'
+    """
+    for options in (
+            _options,
+            dict(_options, use_numpy=True),
+            dict(_options, synoptic=True),
+            dict(_options, synoptic=True, use_numpy=True)):
+        serial = minimize(_f, _bounds, fconstraint=_g, **options)
+        solution = asyncio.run(minimize_async(
+            _f_async, _bounds, fconstraint=_g_async, **options))
+
+        assert (np.asarray(solution.pointset) == serial.pointset).all()
+        assert solution.nit == serial.nit
+        assert solution.nfev == serial.nfev
+        assert solution.ncev == serial.ncev
+
+
+def test_async_concurrency():
+    """
+    Evaluations overlap up to the requested concurrency
+    """
+    in_flight = [0, 0]
+    async def f(x):
+        in_flight[0] += 1
+        in_flight[1] = max(in_flight)
+        await asyncio.sleep(0.001 * (1 + x[0] % 1))
+        in_flight[0] -= 1
+        return _f(x)
+
+    solution = asyncio.run(minimize_async(
+        f, _bounds, concurrency=8, use_numpy=True, **_options))
+
+    assert solution.success
+    assert in_flight[1] == 8
+    assert abs(solution.x[0] - 1.0) < 1e-2 and abs(solution.x[1] - 2.0) < 1e-2
+
+
+def test_async_many_runs():
+    """
+    Several optimizations share one event loop
+    """
+    async def main():
+        return await asyncio.gather(*[
+            minimize_async(_f_async, _bounds, concurrency=4, use_numpy=True,
+                           **dict(_options, seedval=seedval))
+            for seedval in range(5)])
+
+    for solution in asyncio.run(main()):
+        assert solution.success
+        assert abs(solution.x[0] - 1.0) < 1e-2
+
+
+def test_async_requires_minimize_async():
+    """
+    Coroutine objectives cannot be run by the blocking 'minimize'
+    """
+    with pytest.raises(TypeError):
+        minimize(_f_async, _bounds, **_options)
@@ -0,0 +1,74 @@
+from . import *
+from lpfgopt import c_minimize_batch
+
+
+def _f(x, a, b):
+    return (x[0] - a)**2 + 2.0 * (x[1] - b)**2 + 1.0
+
+def _g(x):
+    return x[0] + x[1] - 4.0
+
+
+def test_minimize_batch():
+    """
+    A batch gives the same results as solving each problem on its own
+    """
+    problems = [
+        {"bounds" : [[-10.0, 10.0], [-10.0, 10.0]], "args" : (1.0, 2.0),
+         "seedval" : 1},
+        {"bounds" : [[0.0, 5.0], [-5.0, 0.0]], "args" : (3.0, -1.0),
+         "seedval" : 2},
+        {"bounds" : [[-10.0, 10.0], [-10.0, 10.0]], "args" : (4.0, 4.0),
+         "seedval" : 3},
+        ]
+    options = {"points" : 15, "tol" : 1e-4, "fconstraint" : _g, 
+               "as_list" : True}
+
+    solutions = c_minimize_batch(_f, problems, cdll_ptr=lpfg_lib, **options)
+
+    assert len(solutions) == len(problems)
+    for solution, problem in zip(solutions, problems):
+        single = c_minimize(_f, problem["bounds"], args=problem["args"],
+                            seedval=problem["seedval"], **options)
+        assert solution == single
+
+    assert abs(solutions[0].x[0] - 1.0) < 1e-2
+    assert abs(solutions[1].x[1] + 1.0) < 1e-2
+    assert abs(solutions[2].x[0] + solutions[2].x[1] - 4.0) < 1e-2
+
+
+def test_minimize_batch_threads():
+    """
+    Threads may be requested whether or not the library has OpenMP
+    """
+    problems = [
+        {"bounds" : [[-10.0, 10.0], [-10.0, 10.0]], "args" : (i + 1, -i - 1)}
+        for i in range(8)
+        ]
+    solutions = c_minimize_batch(_f, problems, points=10, tol=1e-4,
+                                 n_threads=4)
+
+    for i, solution in enumerate(solutions):
+        assert solution.success
+        assert abs(solution.x[0] - i - 1) < 1e-2
+        assert abs(solution.x[1] + i + 1) < 1e-2
+
+
+def test_concurrent_calls_reproducible():
+    """
+    Each optimizer draws from its own generator so runs in several threads
+    give the same results as the same seeds run one after another
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    run = lambda seedval: c_minimize(
+        _f, [[-10.0, 10.0], [-10.0, 10.0]], args=(1.0, 2.0), points=15,
+        tol=1e-4, seedval=seedval, cdll_ptr=lpfg_lib, as_list=True)
+
+    seeds = [5, 6, 7, 8] * 2
+    serial = [run(seedval) for seedval in seeds]
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        threaded = list(executor.map(run, seeds))
+
+    assert threaded == serial
+    assert serial[0] == serial[4]
+    assert serial[0].pointset != serial[1].pointset
@@ -0,0 +1,180 @@
+import pytest
+
+from . import *
+from lpfgopt import LeapFrog, NumpyLeapFrog
+
+
+def _f(x):
+    return (x[0] - 1)**2 + (x[1] + 2)**2 + x[0] * x[1]
+
+def _g(x):
+    return x[0] + x[1] - 1
+
+_bounds = [[-10.0, 10.0], [-10.0, 10.0]]
+
+_options = {
+    "tol"         : 1e-6,
+    "seedval"     : 7,
+    "fconstraint" : _g,
+    }
+
+
+class _Stop(Exception):
+    pass
+
+
+def _stop_after(n):
+    calls = [0]
+    def callback(x):
+        calls[0] += 1
+        if calls[0] == n:
+            raise _Stop
+    return callback
+
+
+def test_resume_is_identical(tmp_path):
+    """
+    A run stopped part way continues from its last checkpoint to the same
+    result as a run that was never stopped
+    """
+    for i, options in enumerate((
+            {},
+            {"use_numpy" : True},
+            {"discrete" : [0]},
+            {"synoptic" : True, "points" : 6})):
+        path = tmp_path / f"run{i}.ckpt"
+        serial = minimize(_f, _bounds, **_options, **options)
+
+        with pytest.raises(_Stop):
+            minimize(_f, _bounds, callback=_stop_after(serial.nit // 2),
+                     checkpoint_path=path, checkpoint_every=5, 
+                     fingerprint="f", **_options, **options)
+        calls = [0]
+        def counted(x):
+            calls[0] += 1
+            return _f(x)
+        # the counting wrapper is named as the same objective
+        solution = minimize(counted, _bounds, checkpoint_path=path,
+                            checkpoint_every=5, fingerprint="f", 
+                            **_options, **options)
+
+        assert (np.asarray(solution.pointset) == serial.pointset).all()
+        assert (solution.nit, solution.nfev) == (serial.nit, serial.nfev)
+        assert solution.final_error == serial.final_error
+        assert 0 < calls[0] < serial.nfev - serial.nit // 2
+        assert not path.exists()
+
+
+def test_checkpoint_and_resume(tmp_path):
+    """
+    The state saved by hand is restored by the same engine only
+    """
+    path = tmp_path / "run.ckpt"
+    lf = NumpyLeapFrog(_f, _bounds, **_options)
+    for i in range(10):
+        lf.iterate()
+    lf.checkpoint(path)
+    expected = lf.minimize()
+
+    resumed = NumpyLeapFrog.resume(path, _f, fconstraint=_g)
+    assert resumed.total_iters == 10
+    solution = resumed.minimize()
+    assert (solution.pointset == expected.pointset).all()
+    assert solution.nit == expected.nit
+
+    with pytest.raises(ValueError):
+        LeapFrog.resume(path, _f, fconstraint=_g)
+    with pytest.raises(ValueError):
+        LeapFrog(_f, _bounds, checkpoint_every=10)
+
+    # without Python code to fingerprint, the run fails before it starts
+    with pytest.raises(ValueError):
+        LeapFrog(sum, _bounds, checkpoint_path=path, checkpoint_every=10)
+    lf = LeapFrog(sum, _bounds, checkpoint_path=path, checkpoint_every=10,
+                  fingerprint="sum")
+    assert lf.nfev > 0
+
+
+def test_resume_other_problem(tmp_path):
+    """
+    A checkpoint is not resumed by a run of another problem
+    """
+    path = tmp_path / "run.ckpt"
+    with pytest.raises(_Stop):
+        minimize(_f, _bounds, callback=_stop_after(10), checkpoint_path=path,
+                 checkpoint_every=5, **_options)
+
+    other = lambda x: (x[0] + 3)**2 + x[1]**2
+    for args, options in (
+            ((other, _bounds), _options),
+            ((_f, _bounds), dict(_options, seedval=8)),
+            ((_f, _bounds), dict(_options, points=5)),
+            ((_f, [[-5.0, 5.0], [-5.0, 5.0]]), _options),
+            ((_f, _bounds), dict(_options, discrete=[0])),
+            ((_f, _bounds), dict(_options, synoptic=True))):
+        with pytest.raises(ValueError):
+            minimize(*args, checkpoint_path=path, checkpoint_every=5, 
+                     **options)
+    with pytest.raises(ValueError):
+        LeapFrog.resume(path, _f, fconstraint=_g, points=5)
+
+    solution = LeapFrog.resume(path, _f, fconstraint=_g, maxit=12).minimize()
+    assert solution.nit == 12
+
+
+class _Simulator():
+    def __init__(self):
+        self.ncalls = 0
+
+    def f(self, x):
+        self.ncalls += 1
+        return _f(x)
+
+
+def test_resume_stateful_objective(tmp_path):
+    """
+    A bound method of an object whose state changes while it runs is 
+    resumed by the same method of a new object
+    """
+    path = tmp_path / "run.ckpt"
+    serial = minimize(_Simulator().f, _bounds, **_options)
+    with pytest.raises(_Stop):
+        minimize(_Simulator().f, _bounds, callback=_stop_after(10), 
+                 checkpoint_path=path, checkpoint_every=5, **_options)
+
+    simulator = _Simulator()
+    solution = minimize(simulator.f, _bounds, checkpoint_path=path,
+                        checkpoint_every=5, **_options)
+    assert solution.nit == serial.nit
+    assert solution.pointset == serial.pointset
+    assert 0 < simulator.ncalls < serial.nfev
+
+
+def test_minimize_again():
+    """
+    Only a resumed run counts the iterations it made before; 'minimize' 
+    otherwise makes 'maxit' more iterations
+    """
+    for lf_class in (LeapFrog, NumpyLeapFrog):
+        lf = lf_class(_f, _bounds, seedval=7, maxit=100, tol=-1.0)
+        assert lf.minimize().nit == 100
+        assert lf.minimize().nit == 200
+
+        lf = lf_class(_f, _bounds, seedval=7, maxit=100, tol=-1.0)
+        for i in range(10):
+            lf.iterate()
+        assert lf.minimize().nit == 110
+
+
+def test_independent_random_state():
+    """
+    Each optimizer draws from its own generator so interleaved runs are
+    reproducible by seed
+    """
+    serial = [LeapFrog(_f, _bounds, seedval=s).minimize() for s in (1, 2)]
+    lfs = [LeapFrog(_f, _bounds, seedval=s) for s in (1, 2)]
+    for i in range(20):
+        for lf in lfs:
+            lf.iterate()
+    for lf, expected in zip(lfs, serial):
+        assert lf.minimize().pointset == expected.pointset
@@ -0,0 +1,80 @@
+import asyncio
+
+import pytest
+
+from . import *
+from lpfgopt import minimize_async
+from lpfgopt.eval_cache import EvaluationCache
+
+
+def _f(x):
+    return (x[0] - 3)**2 + (x[1] + 2)**2 + 1.0
+
+_bounds = [[-10.0, 10.0], [-10.0, 10.0]]
+
+_options = {
+    "points"      : 10,
+    "tol"         : 1e-3,
+    "seedval"     : 1235,
+    "discrete"    : [0, 1],
+    }
+
+
+def test_evaluation_cache():
+    """
+    The least recently used value is dropped and repeats within a batch
+    are evaluated once
+    """
+    cache = EvaluationCache(2)
+    calls = []
+    def evaluate(xs):
+        calls.append(list(xs))
+        return [sum(x) for x in xs]
+
+    assert cache.map([[1, 2], [3, 4], [1, 2]], evaluate) == [3, 7, 3]
+    assert calls == [[[1, 2], [3, 4]]]
+    assert cache.get([1, 2]) == 3
+    cache.put([5, 6], 11)
+    assert cache.get([3, 4], None) is None
+    assert (cache.hits, cache.misses, len(cache)) == (2, 3, 2)
+
+    with pytest.raises(ValueError):
+        EvaluationCache(0)
+
+
+def test_cached_runs():
+    """
+    Caching changes neither the path nor the answer of any engine; only 
+    the evaluations that were made are counted
+    """
+    for options in (
+            {},
+            {"use_numpy" : True},
+            {"synoptic" : True},
+            {"synoptic" : True, "use_numpy" : True, "vectorized" : True},
+            {"use_c_lib" : True}):
+        f = _f
+        if options.get("vectorized"):
+            f = lambda xs: [_f(x) for x in xs]
+        calls = [0]
+        def counted(x):
+            calls[0] += 1
+            return f(x)
+
+        serial = minimize(f, _bounds, **_options, **options)
+        solution = minimize(counted, _bounds, cache_size=100, **_options, 
+                            **options)
+
+        assert (np.asarray(solution.pointset) == serial.pointset).all()
+        assert solution.nit == serial.nit
+        assert solution.cache_hits > 0
+        assert solution.cache_hits + solution.cache_misses == serial.nfev
+        assert solution.nfev == solution.cache_misses
+        if not options.get("vectorized"):
+            assert calls[0] == solution.nfev
+        assert solution.x[0] == 3 and solution.x[1] == -2
+
+    solution = asyncio.run(minimize_async(_f, _bounds, cache_size=100, 
+                                          **_options))
+    assert solution.nfev == solution.cache_misses
+    assert solution.cache_hits > 0
@@ -0,0 +1,132 @@
+import asyncio
+import math
+import pickle
+
+import pytest
+
+from . import *
+from lpfgopt import minimize_async, minimize_many, EvaluationStore
+from lpfgopt.eval_store import problem_fingerprint
+
+
+def _f(x, offset=0.0):
+    return (x[0] - 3)**2 + (x[1] + 2)**2 + 1.0 + offset
+
+_bounds = [[-10.0, 10.0], [-10.0, 10.0]]
+
+_options = {
+    "points"      : 10,
+    "tol"         : 1e-3,
+    "seedval"     : 1235,
+    "discrete"    : [0, 1],
+    }
+
+
+def test_evaluation_store(tmp_path):
+    """
+    Values survive reopening the database, are kept apart by fingerprint
+    and NaN is returned as NaN
+    """
+    path = tmp_path / "evaluations.db"
+    store = EvaluationStore(path, "a")
+    store.put([1, 2], 3.0)
+    store.put([0.5, 0.25], float("nan"))
+    assert store.map([[1.0, 2.0], [3, 4], [3, 4]],
+                     lambda xs: [sum(x) for x in xs]) == [3.0, 7, 7]
+    assert (store.hits, store.misses) == (2, 1)
+    store.close()
+
+    store = pickle.loads(pickle.dumps(EvaluationStore(path, "a")))
+    assert store.get([3, 4]) == 7.0
+    assert math.isnan(store.get([0.5, 0.25]))
+    assert len(store) == 3
+    assert EvaluationStore(path, "b").get([1, 2], None) is None
+
+
+def test_problem_fingerprint():
+    """
+    The fingerprint follows the code and the arguments of the objective
+    """
+    assert problem_fingerprint(_f) == problem_fingerprint(_f, ())
+    assert problem_fingerprint(_f) != problem_fingerprint(_f, (1.0,))
+    assert problem_fingerprint(lambda x: x[0] + 1) != \
+        problem_fingerprint(lambda x: x[0] + 2)
+    assert problem_fingerprint("x[0]**2") == problem_fingerprint(" x[0]**2")
+    with pytest.raises(ValueError):
+        problem_fingerprint(math.hypot)
+
+
+def test_fingerprint_closures_and_arrays(tmp_path):
+    """
+    Closures of one factory, defaults and array arguments that differ in
+    one element get different fingerprints; values without a reliable
+    hash are refused
+    """
+    make = lambda a: lambda x: (x[0] - a)**2
+    assert problem_fingerprint(make(1.0)) != problem_fingerprint(make(4.0))
+    assert problem_fingerprint(make(1.0)) == problem_fingerprint(make(1.0))
+
+    def scaled(x, k=2.0):
+        return k * x[0]**2
+    other = lambda x, k=3.0: k * x[0]**2
+    assert problem_fingerprint(scaled) != problem_fingerprint(other)
+
+    a = np.zeros(5000)
+    b = a.copy()
+    b[2500] = 1.0
+    assert problem_fingerprint(_f, (a,)) != problem_fingerprint(_f, (b,))
+
+    handle = object()
+    with pytest.raises(ValueError):
+        problem_fingerprint(lambda x: x[0] if handle else 0.0)
+
+    path = tmp_path / "evaluations.db"
+    options = dict(_options, discrete=[0])
+    first = minimize(make(1.0), [[-10.0, 10.0]], store=path, **options)
+    second = minimize(make(4.0), [[-10.0, 10.0]], store=path, **options)
+    assert first.x[0] == 1.0 and second.x[0] == 4.0
+    assert second.nfev > 0
+
+
+def test_stored_runs(tmp_path):
+    """
+    A repeated run takes every value from the store, follows the same
+    path and makes no evaluations
+    """
+    for i, options in enumerate((
+            {},
+            {"use_numpy" : True},
+            {"synoptic" : True, "cache_size" : 100},
+            {"use_c_lib" : True})):
+        path = tmp_path / f"evaluations{i}.db"
+        first = minimize(_f, _bounds, store=path, **_options, **options)
+        again = minimize(_f, _bounds, store=path, **_options, **options)
+
+        assert first.nfev == first.store_misses
+        assert again.nfev == 0 and again.store_misses == 0
+        assert (np.asarray(again.pointset) == first.pointset).all()
+        assert again.x[0] == 3 and again.x[1] == -2
+
+        other = minimize(_f, _bounds, args=(1.0,), store=path, **_options,
+                         **options)
+        assert other.store_hits < first.store_hits + first.store_misses
+        assert other.fun == first.fun + 1.0
+
+    solution = asyncio.run(minimize_async(_f, _bounds, store=path,
+                                          **_options))
+    assert solution.store_hits > 0
+    assert solution.nfev == solution.store_misses
+
+
+def test_shared_between_processes(tmp_path):
+    """
+    Runs in several processes write to one store at once
+    """
+    path = str(tmp_path / "evaluations.db")
+    options = {k : v for k, v in _options.items() if k != "seedval"}
+    solution = minimize_many(_f, _bounds, seeds=4, n_jobs=4, store=path,
+                             **options)
+    assert solution.success
+    store = EvaluationStore(path, problem_fingerprint(_f))
+    assert len(store) > 0
+    assert store.get(solution.x) == solution.fun
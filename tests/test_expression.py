@@ -0,0 +1,75 @@
+import ctypes
+import math
+import shutil
+
+import pytest
+
+from . import *
+from lpfgopt import compile_expression
+from lpfgopt.expression import to_c
+
+_needs_compiler = pytest.mark.skipif(
+    not (shutil.which("cc") or shutil.which("gcc")), 
+    reason="a C compiler is needed to compile expressions")
+
+_bounds = [[-5.0, 5.0], [-5.0, 5.0]]
+
+_options = {
+    "points"      : 20,
+    "tol"         : 1e-4,
+    "seedval"     : 1235,
+    "as_list"     : True,
+    }
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    return tmp_path / "lpfgopt"
+
+
+def test_to_c_rejects():
+    """
+    Anything outside of the whitelisted syntax is rejected
+    """
+    for expression in (
+            "__import__('os').system('ls')", "x.real", "y[0]", "x[-1]", 
+            "x[0.5]", "x[0] % 2", "x[0] if x[0] > 0 else 1", "exit()",
+            "sin(x[0], x[1])", "max(x[0])", "x[0] +", "'a'", "[x[0]]", 
+            "float('nan')", "os.sin(x[0])"):
+        with pytest.raises(ValueError):
+            to_c(expression)
+
+
+@_needs_compiler
+def test_expression_matches_python():
+    """
+    An expression string follows the same path as the same Python 
+    function
+    """
+    serial = c_minimize(
+        lambda x: (1 - x[0])**2 + 100 * (x[1] - x[0]**2)**2 + math.sin(x[0]),
+        _bounds, fconstraint=lambda x: x[0]**2 + x[1]**2 - 2, **_options)
+    solution = c_minimize(
+        "(1 - x[0])**2 + 100 * (x[1] - x[0]**2)**2 + math.sin(x[0])",
+        _bounds, fconstraint="x[0]**2 + x[1]**2 - 2", **_options)
+
+    assert solution == serial
+    solution = minimize("x[0]**2 + abs(x[1] - pi)", _bounds, use_c_lib=True,
+                        points=20, tol=1e-4, seedval=1235)
+    assert solution.success
+    assert abs(solution.x[1] - math.pi) < 1e-2
+
+
+@_needs_compiler
+def test_expression_cache(cache_dir):
+    """
+    Each expression is compiled once and its library is kept on disk
+    """
+    fun = compile_expression("x[0] * 1.25 + max(x[1], x[2], -e)")
+
+    assert compile_expression("x[0] * 1.25 + max(x[1], x[2], -e)") is fun
+    assert len(list(cache_dir.glob("expr_*"))) == 1
+    x = (ctypes.c_double * 3)(2.0, -4.0, -3.0)
+    assert fun(x, 3) == 2.5 - math.e
+    assert math.isnan(fun(x, 2))
@@ -0,0 +1,22 @@
+from random import Random
+
+from lpfgopt.indexed_heap import IndexedHeap
+
+
+def test_indexed_heap_matches_scan():
+    """
+    The heap tops match a linear scan with first-index tie-breaking
+    """
+    rand = Random(1234)
+    values = [float(rand.randint(0, 20)) for i in range(50)]
+    best_heap = IndexedHeap(len(values), values.__getitem__)
+    worst_heap = IndexedHeap(len(values), values.__getitem__, reverse=True)
+
+    for step in range(2000):
+        assert best_heap.top() == values.index(min(values))
+        assert worst_heap.top() == values.index(max(values))
+
+        i = rand.randrange(len(values))
+        values[i] = float(rand.randint(0, 20))
+        best_heap.update(i)
+        worst_heap.update(i)
@@ -0,0 +1,57 @@
+import pytest
+
+from . import *
+from lpfgopt import minimize_many, iminimize_many
+
+
+def _himmelblau(x):
+    return (x[0]**2 + x[1] - 11)**2 + (x[0] + x[1]**2 - 7)**2
+
+_bounds = [[-5.0, 5.0], [-5.0, 5.0]]
+
+_options = {
+    "points"      : 10,
+    "tol"         : 1e-3,
+    }
+
+
+def test_minimize_many():
+    """
+    The best of the runs is returned with a summary of every run and the
+    number of processes does not change the results
+    """
+    serial = minimize_many(_himmelblau, _bounds, seeds=6, n_jobs=1, **_options)
+    solution = minimize_many(_himmelblau, _bounds, seeds=6, n_jobs=3,
+                             **_options)
+
+    assert solution.nruns == 6
+    assert [run.seedval for run in solution.runs] == [1, 2, 3, 4, 5, 6]
+    assert solution.runs == serial.runs
+    assert solution.seedval == serial.seedval
+    assert solution.fun == min(run.fun for run in solution.runs)
+    assert solution.x == minimize(_himmelblau, _bounds, seedval=solution.seedval,
+                                  **_options).x
+
+
+def test_minimize_many_no_seeds():
+    """
+    There is no best run without any seeds
+    """
+    for seeds in (0, []):
+        with pytest.raises(ValueError):
+            minimize_many(_himmelblau, _bounds, seeds=seeds, n_jobs=1)
+
+
+def test_iminimize_many():
+    """
+    Each run is yielded as it finishes for either backend
+    """
+    for options in (_options, dict(_options, use_c_lib=True)):
+        seeds = [11, 12, 13]
+        solutions = list(iminimize_many(
+            _himmelblau, _bounds, seeds=seeds, n_jobs=2, **options))
+
+        assert sorted(solution.seedval for solution in solutions) == seeds
+        for solution in solutions:
+            assert solution.success
+            assert solution.fun < 1e-2
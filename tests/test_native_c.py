@@ -0,0 +1,96 @@
+import ctypes
+import os
+import shutil
+import subprocess
+
+import pytest
+
+from . import *
+
+_SOURCE = """
+#include <stddef.h>
+
+size_t n_callbacks = 0;
+
+double f(double* x, size_t xlen)
+{
+    return 2.0 * (x[0] - 1.0) * (x[0] - 1.0) + (x[1] - 2.0) * (x[1] - 2.0)
+        + 3.0;
+}
+
+double g(double* x, size_t xlen)
+{
+    return x[0] + 3.0;
+}
+
+void cb(double* x, size_t xlen)
+{
+    n_callbacks++;
+}
+"""
+
+def _f(x):
+    return 2.0 * (x[0] - 1.0) * (x[0] - 1.0) + (x[1] - 2.0) * (x[1] - 2.0) \
+        + 3.0
+
+def _g(x):
+    return x[0] + 3.0
+
+_bounds = [[-10.0, 10.0], [-10.0, 10.0]]
+
+_options = {
+    "points"      : 20,
+    "tol"         : 1e-4,
+    "seedval"     : 1235,
+    "cdll_ptr"    : lpfg_lib,
+    }
+
+
+@pytest.fixture(scope="module")
+def native_lib(tmp_path_factory):
+    """
+    Compiles the native test functions into a shared library.
+    """
+    if shutil.which("gcc") is None or os.name == "nt":
+        pytest.skip("a C compiler is needed to build native functions")
+    root = tmp_path_factory.mktemp("native")
+    source, path = root / "funs.c", root / "funs.so"
+    source.write_text(_SOURCE)
+    subprocess.run(
+        ["gcc", "-shared", "-fPIC", str(source), "-o", str(path)], check=True)
+    return str(path)
+
+
+def test_native_functions(native_lib):
+    """
+    Compiled objectives, constraints and callbacks given in any of the
+    accepted forms follow the same path as the Python functions
+    """
+    lib = ctypes.CDLL(native_lib)
+    address = lambda name: ctypes.cast(getattr(lib, name), ctypes.c_void_p).value
+    serial = c_minimize(_f, _bounds, fconstraint=_g, **_options)
+
+    for f, g, cb in (
+            (lib.f, lib.g, lib.cb),
+            ((native_lib, "f"), (native_lib, "g"), (native_lib, "cb")),
+            (address("f"), address("g"), address("cb"))):
+        n_callbacks = ctypes.c_size_t.in_dll(lib, "n_callbacks")
+        n_callbacks.value = 0
+        solution = c_minimize(f, _bounds, fconstraint=g, callback=cb, 
+                              **_options)
+
+        assert (solution.pointset == serial.pointset).all()
+        assert solution.nfev == serial.nfev
+        assert n_callbacks.value == solution.nit - 1
+
+    solution = minimize(lib.f, _bounds, use_c_lib=True, **_options)
+    assert solution.success
+    assert abs(solution.x[0] - 1.0) < 1e-2 and abs(solution.x[1] - 2.0) < 1e-2
+
+
+def test_native_args(native_lib):
+    """
+    Extra arguments cannot be passed to a native objective
+    """
+    with pytest.raises(ValueError):
+        c_minimize((native_lib, "f"), _bounds, args=(1.0,), **_options)
@@ -0,0 +1,70 @@
+from lpfgopt import NumpyLeapFrog
+from . import *
+
+
+def _f_test(x, offset):
+    return 2.0 * x[0]**2 + x[1]**2 + offset
+
+_g1 = lambda x: x[0] + 3
+
+_options = {
+    "fun"         : _f_test,
+    "bounds"      : [[-10.0, 10.0], [-10.0, 10.0]],
+    "args"        : (3.0,),
+    "points"      : 20,
+    "fconstraint" : _g1,
+    "discrete"    : [0,1],
+    "maxit"       : 5000,
+    "tol"         : 1e-3,
+    "seedval"     : 1235,
+    }
+
+
+def test_numpy_unit():
+    """
+    Constrained and discrete optimization with the numpy engine
+    """
+    lf = NumpyLeapFrog(**_options)
+    assert lf.pointset.shape == (20, 3)
+    assert lf.pointset.dtype == np.float64
+
+    solution = lf.minimize()
+
+    check = [21.0, -3, 0]
+    for i in range(len(solution["best"])):
+        assert solution["best"][i] == check[i], f"Unit test failed on {i}"
+
+
+def test_numpy_result_fields():
+    """
+    The numpy engine returns the same result fields as the Python engine
+    """
+    options = dict(_options, fconstraint=None, discrete=[])
+    np_sol = minimize(**options, use_numpy=True)
+    py_sol = minimize(**options)
+
+    assert sorted(np_sol.keys()) == sorted(py_sol.keys())
+    assert np_sol.success
+    assert np_sol.pointset.shape == (20, 3)
+
+
+def test_numpy_rosenbrock():
+    """
+    Rosenbrock function benchmark with the numpy engine
+    """
+    options = {
+        "points"      : 100,
+        "tol"         : 1e-6,
+        "seedval"     : 4815162342,
+        "use_numpy"   : True,
+        }
+
+    f = lambda x: (1 - x[0])**2 + 100*(x[1] - x[0]**2)**2
+
+    bounds = [
+        [-1.5, 1.5],
+        [-0.5, 2.5]]
+
+    check = [1.0, 1.0]
+
+    run(f, bounds, check, options)
@@ -0,0 +1,77 @@
+import os
+
+import pytest
+
+from . import *
+from lpfgopt import SharedMemoryPool
+
+
+def _f(x):
+    return 2.0 * (x[0] - 1.0)**2 + (x[1] - 2.0)**2 + 3.0
+
+def _f_batch(xs):
+    return [_f(x) for x in xs]
+
+def _g(x):
+    return x[0] + 3
+
+def _pid(x):
+    return float(os.getpid())
+
+def _fail(x):
+    raise ValueError("bad point")
+
+_bounds = [[-10.0, 10.0], [-10.0, 10.0]]
+
+_options = {
+    "points"      : 20,
+    "tol"         : 1e-3,
+    "seedval"     : 1235,
+    "synoptic"    : True,
+    }
+
+
+def test_process_pool_deterministic():
+    """
+    A shared memory pool gives the same result as a serial run
+    """
+    serial = minimize(_f, _bounds, fconstraint=_g, **_options)
+    serial_np = minimize(_f_batch, _bounds, vectorized=True, use_numpy=True,
+                         **_options)
+
+    with SharedMemoryPool(3) as pool:
+        solution = minimize(_f, _bounds, fconstraint=_g, workers=pool,
+                            **_options)
+        solution_np = minimize(_f_batch, _bounds, vectorized=True,
+                               use_numpy=True, workers=pool, **_options)
+
+    assert solution.pointset == serial.pointset
+    assert solution.nfev == serial.nfev
+    assert solution.ncev == serial.ncev
+    assert (solution_np.pointset == serial_np.pointset).all()
+
+
+def test_process_pool_reused():
+    """
+    The same worker processes serve every run given the pool
+    """
+    with SharedMemoryPool(2) as pool:
+        pids = set(pool.evaluate(_pid, (), [[0.0]] * 8))
+        for seedval in range(3):
+            minimize(_f, _bounds, workers=pool, **dict(_options, seedval=seedval))
+        pids_after = set(pool.evaluate(_pid, (), [[0.0]] * 8))
+
+        assert pids == pids_after == {float(p.pid) for p in pool.procs}
+        assert os.getpid() not in pids
+
+
+def test_process_pool_errors():
+    """
+    Exceptions raised by the objective reach the caller and the pool
+    remains usable
+    """
+    with SharedMemoryPool(2) as pool:
+        with pytest.raises(ValueError):
+            minimize(_fail, _bounds, workers=pool, **_options)
+
+        assert pool.evaluate(_f, (), [[1.0, 2.0], [0.0, 2.0]]) == [3.0, 5.0]
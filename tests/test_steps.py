@@ -0,0 +1,65 @@
+import pytest
+
+from . import *
+from lpfgopt import LeapFrog, NumpyLeapFrog
+
+
+def _f(x):
+    return (x[0] - 1)**2 + (x[1] + 2)**2 + x[0] * x[1]
+
+_bounds = [[-10.0, 10.0], [-10.0, 10.0]]
+
+_options = {
+    "tol"         : 1e-6,
+    "seedval"     : 7,
+    }
+
+
+def test_steps_follow_minimize():
+    """
+    Draining the steps is 'minimize'; every step is the same live view
+    """
+    for lf_class in (LeapFrog, NumpyLeapFrog):
+        expected = lf_class(_f, _bounds, **_options).minimize()
+
+        steps = lf_class(_f, _bounds, **_options).steps()
+        views, nits = set(), []
+        with pytest.raises(StopIteration) as done:
+            while True:
+                step = next(steps)
+                views.add(id(step))
+                nits.append(step.nit)
+        solution = done.value.value
+
+        assert len(views) == 1
+        assert nits == list(range(1, expected.nit + 1))
+        assert step.converged and step.fun == expected.fun
+        assert (np.asarray(solution.pointset) == expected.pointset).all()
+        assert list(step.x) == list(expected.x)
+        assert solution.message == expected.message
+
+
+def test_steps_stop_and_views():
+    """
+    Sending True stops the run; the views cannot be written to and a
+    copy keeps the state of its step
+    """
+    for lf_class in (LeapFrog, NumpyLeapFrog):
+        lf = lf_class(_f, _bounds, **_options)
+        steps = lf.steps()
+        step = next(steps)
+        kept = step.copy()
+        for i in range(4):
+            step = steps.send(None)
+        assert step.nit == 5 and kept.nit == 1
+        assert list(step.best) == list(lf.pointset[lf.besti])
+        assert len(step.pointset) == lf.points
+        with pytest.raises((TypeError, ValueError)):
+            step.x[0] = 0.0
+        with pytest.raises((TypeError, ValueError)):
+            step.pointset[0][1] = 0.0
+
+        with pytest.raises(StopIteration) as done:
+            steps.send(True)
+        assert done.value.value.status == 2
+        assert done.value.value.nit == 5
@@ -0,0 +1,69 @@
+from . import *
+
+
+def _f(x):
+    return 2.0 * (x[0] - 1.0)**2 + (x[1] - 2.0)**2 + 3.0
+
+_g = lambda x: x[0] + 3
+
+_bounds = [[-10.0, 10.0], [-10.0, 10.0]]
+
+
+def test_synoptic():
+    """
+    Synoptic leapfrogging with each engine
+    """
+    options = {
+        "points"      : 20,
+        "tol"         : 1e-3,
+        "seedval"     : 4815162342,
+        "synoptic"    : True,
+        }
+    check = [1.0, 2.0]
+
+    run(_f, _bounds, check, options)
+    run(_f, _bounds, check, dict(options, use_numpy=True))
+    run(_f, _bounds, check, dict(options, use_c_lib=True))
+
+
+def test_synoptic_constrained():
+    """
+    Constrained synoptic leapfrogging with each engine
+    """
+    options = {
+        "points"      : 20,
+        "tol"         : 1e-3,
+        "seedval"     : 4815162342,
+        "synoptic"    : True,
+        "fconstraint" : _g,
+        "discrete"    : [0],
+        }
+    check = [-3.0, 2.0]
+
+    run(_f, _bounds, check, options, tol=1e-2)
+    run(_f, _bounds, check, dict(options, use_numpy=True), tol=1e-2)
+    run(_f, _bounds, check, dict(options, use_c_lib=True), tol=1e-2)
+
+
+def test_synoptic_batches():
+    """
+    Each synoptic generation is evaluated as one batch
+    """
+    batches = []
+    def f_batch(xs):
+        batches.append(len(xs))
+        return [_f(x) for x in xs]
+
+    for use_numpy in (False, True):
+        batches.clear()
+        solution = minimize(f_batch, _bounds, points=20, tol=1e-3,
+                            seedval=1235, synoptic=True, vectorized=True,
+                            use_numpy=use_numpy)
+
+        assert batches[0] == 20
+        assert batches[1:] == [19] * solution.nit
+        assert solution.nfev == 20 + 19 * solution.nit
+
+    solution = c_minimize(_f, _bounds, points=20, tol=1e-3, seedval=1235,
+                          synoptic=True)
+    assert solution.nfev == 20 + 19 * solution.nit
@@ -100,6 +100,89 @@ def test_unit_c2():
         assert solution["best"][i] == check[i], f"Unit test failed on {i}"
 
 
+def test_unit_c_numpy_pointset():
+    """
+    A numpy starting point set is handed to the C code as one block and is
+    not changed by the optimization
+    """
+    pointset = np.array(_starting_points)
+    solution = c_minimize(**dict(_options, pointset=pointset))
+
+    assert (solution.pointset == c_minimize(**_options).pointset).all()
+    assert (pointset == np.array(_starting_points)).all()
+    assert len(solution.pointset) == len(_starting_points)
+
+
+def test_unit_c_as_list():
+    """
+    The C results hold numpy arrays unless lists are asked for
+    """
+    solution = c_minimize(**_options)
+    as_list = c_minimize(**_options, as_list=True)
+
+    for key in ("x", "best", "worst", "pointset"):
+        assert isinstance(solution[key], np.ndarray)
+        assert isinstance(as_list[key], list)
+        assert solution[key].tolist() == as_list[key]
+    assert solution.pointset.shape == (len(_starting_points), 2)
+    assert isinstance(minimize(**_options, use_c_lib=True).x, list)
+
+
+def test_unit_c_without_numpy(monkeypatch):
+    """
+    Without numpy the starting point set is flattened in Python and the
+    results are lists
+    """
+    import lpfgopt.c_leapfrog
+    expected = c_minimize(**_options, as_list=True)
+    monkeypatch.setattr(lpfgopt.c_leapfrog, "np", None)
+    solution = c_minimize(**_options)
+
+    assert isinstance(solution.pointset, list)
+    assert solution.pointset == expected.pointset
+
+
+def test_unit_c_numpy_views():
+    """
+    The functions may be passed numpy views of the C arrays instead of
+    lists without changing the result; one view is made per array
+    """
+    views = set()
+    def f(x, offset):
+        assert isinstance(x, np.ndarray) and not x.flags.writeable
+        views.add(id(x))
+        return _f_test(x, offset)
+
+    solution = c_minimize(**dict(_options, fun=f, use_numpy=True), 
+                          as_list=True)
+
+    assert solution == c_minimize(**_options, as_list=True)
+    assert len(views) <= _options["points"]
+
+
+def test_lib_cached():
+    """
+    The C library is loaded and its prototypes declared only once
+    """
+    from lpfgopt import load_leapfrog_lib
+
+    assert load_leapfrog_lib() is lpfg_lib
+    assert lpfg_lib.minimize.argtypes is not None
+    assert lpfg_lib.n_results == 9
+
+
+def test_discrete_indices():
+    """
+    Discrete indices may be given in any order and repeated
+    """
+    for min_ in (minimize, lambda **kw: c_minimize(as_list=True, **kw)):
+        solution = min_(**dict(_options, discrete=[1, 0, 1]))
+
+        assert solution == min_(**_options), f"{min_} changed the result"
+        for x in solution.pointset:
+            assert x[-2:] == [int(i) for i in x[-2:]]
+
+
 def test_c_vs_py():
     """
     General use unit test for the C code. Performs 
@@ -129,3 +212,51 @@ Ctime : {ctime:.12f} fev: {cfev:4d} t/fev: {ctime/cfev}
 Pytime: {pytime:.12f} fev: {pyfev:4d} t/fev: {pytime/pyfev}
 {((pytime/pyfev) - (ctime/cfev))/(pytime/pyfev)*100} % better than Python
 """
+
+
+def test_constraint_cache():
+    """
+    The constraint function is only evaluated when a point changes
+    """
+    for min_ in (minimize, c_minimize):
+        calls = [0]
+        def g(x):
+            calls[0] += 1
+            return _g1(x)
+
+        options = dict(_options, fconstraint=g)
+        solution = min_(**options)
+
+        assert solution.ncev == calls[0], f"{min_} miscounted ncev"
+        assert solution.ncev == solution.nit + _options["points"]
+
+
+def _full_convergence(lf):
+    """
+    Recomputes the convergence value with a full scan of the point set
+    """
+    best = lf.pointset[lf.besti]
+    norm1 = lf.tol if abs(best[0]) < lf.tol else best[0]
+    err = abs((lf.pointset[lf.worsti][0] - best[0])/norm1)
+    for point in lf.pointset:
+        for i in range(1, lf.n_columns):
+            norm1 = lf.tol if abs(best[i]) < lf.tol else best[i]
+            err += abs((best[i] - point[i])/norm1)
+    if any(lf.fconstraint(point[1:]) > 0 for point in lf.pointset):
+        err += 2 * lf.tol
+    return err
+
+
+def test_incremental_convergence():
+    """
+    The incrementally maintained convergence value matches a full rescan
+    """
+    from lpfgopt import NumpyLeapFrog
+    options = dict(_options, discrete=[], pointset=None)
+    for cls in (LeapFrog, NumpyLeapFrog):
+        lf = cls(**options)
+        for i in range(300):
+            lf.iterate()
+            full = _full_convergence(lf)
+            assert abs(lf.error - full) <= 1e-9 * max(1.0, full), \
+                f"{cls.__name__} diverged on iteration {i}"
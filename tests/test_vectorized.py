@@ -0,0 +1,71 @@
+from lpfgopt.leapfrog import LeapFrog
+from lpfgopt import NumpyLeapFrog
+from . import *
+
+
+_bounds = [[-10.0, 10.0], [-10.0, 10.0]]
+
+
+def _f(x):
+    return 2.0 * x[0]**2 + x[1]**2 + 3.0
+
+def _g(x):
+    return x[0] + 3
+
+
+def test_vectorized_matches_scalar():
+    """
+    A vectorized objective follows the same path as the scalar objective
+    """
+    calls = []
+    def f_batch(xs):
+        calls.append(len(xs))
+        return [_f(x) for x in xs]
+
+    def g_batch(xs):
+        return [_g(x) for x in xs]
+
+    options = {"points": 20, "tol": 1e-3, "seedval": 1235, "discrete": [0, 1]}
+    scalar = minimize(_f, _bounds, fconstraint=_g, **options)
+    batched = minimize(f_batch, _bounds, fconstraint=g_batch, vectorized=True,
+                       **options)
+
+    assert calls[0] == 20, "initial point set was not evaluated in one call"
+    assert batched.nfev == scalar.nfev
+    assert batched.best == scalar.best
+    assert batched.pointset == scalar.pointset
+
+
+def test_vectorized_numpy():
+    """
+    The numpy engine hands the objective a (k, n) array
+    """
+    shapes = []
+    def f_batch(X):
+        shapes.append(X.shape)
+        return 2.0 * (X[:, 0] - 1.0)**2 + (X[:, 1] - 2.0)**2 + 3.0
+
+    lf = NumpyLeapFrog(f_batch, _bounds, points=30, tol=1e-3, seedval=1235,
+                       vectorized=True)
+    solution = lf.minimize()
+
+    assert shapes[0] == (30, 2)
+    assert all(shape == (1, 2) for shape in shapes[1:])
+    assert solution.success
+    assert solution.nfev == 30 + solution.nit
+    assert abs(solution.x[0] - 1.0) < 1e-2
+    assert abs(solution.x[1] - 2.0) < 1e-2
+
+
+def test_vectorized_c():
+    """
+    Vectorized objectives may be used with the C library
+    """
+    f_batch = lambda xs: [_f(x) for x in xs]
+    solution = minimize(f_batch, _bounds, seedval=1235, tol=1e-3,
+                        fconstraint=lambda xs: [_g(x) for x in xs],
+                        vectorized=True, use_c_lib=True, cdll_ptr=lpfg_lib)
+
+    assert solution.success
+    assert abs(solution.x[0] + 3.0) < 1e-2
+    assert abs(solution.x[1]) < 1e-2
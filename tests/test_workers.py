@@ -0,0 +1,86 @@
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+from . import *
+
+
+def _f(x):
+    return 2.0 * (x[0] - 1.0)**2 + (x[1] - 2.0)**2 + 3.0
+
+def _f_batch(xs):
+    return [_f(x) for x in xs]
+
+def _g(x):
+    return x[0] + 3
+
+_bounds = [[-10.0, 10.0], [-10.0, 10.0]]
+
+_options = {
+    "points"      : 20,
+    "tol"         : 1e-3,
+    "seedval"     : 1235,
+    "synoptic"    : True,
+    }
+
+
+def test_workers_deterministic():
+    """
+    The number of workers does not change the result for a given seed
+    """
+    serial = minimize(_f, _bounds, fconstraint=_g, **_options)
+
+    for workers in (1, 4, ThreadPoolExecutor(3)):
+        solution = minimize(_f, _bounds, fconstraint=_g, workers=workers,
+                            **_options)
+        assert solution.pointset == serial.pointset, f"{workers} differed"
+        assert solution.nfev == serial.nfev
+        assert solution.ncev == serial.ncev
+
+
+def test_workers_vectorized():
+    """
+    Vectorized objectives are split across the workers
+    """
+    serial = minimize(_f_batch, _bounds, vectorized=True, use_numpy=True,
+                      **_options)
+    solution = minimize(_f_batch, _bounds, vectorized=True, use_numpy=True,
+                        workers=3, **_options)
+
+    assert (solution.pointset == serial.pointset).all()
+    assert solution.nfev == serial.nfev
+
+
+def test_workers_process_pool():
+    """
+    A process pool may be passed in for picklable objectives
+    """
+    serial = minimize(_f, _bounds, **_options)
+    with ProcessPoolExecutor(2) as pool:
+        solution = minimize(_f, _bounds, workers=pool, **_options)
+
+    assert solution.pointset == serial.pointset
+
+
+def test_workers_chunks():
+    """
+    A vectorized batch is split into the number of chunks asked for,
+    or one row per chunk for an executor
+    """
+    serial = minimize(_f_batch, _bounds, vectorized=True, use_numpy=True,
+                      **_options)
+    sizes = []
+    def f_batch(xs):
+        sizes.append(len(xs))
+        return _f_batch(xs)
+
+    with ThreadPoolExecutor(2) as pool:
+        solution = minimize(f_batch, _bounds, vectorized=True, 
+                            use_numpy=True, workers=pool, **_options)
+        assert max(sizes) == 1
+        assert (solution.pointset == serial.pointset).all()
+
+        sizes.clear()
+        solution = minimize(f_batch, _bounds, vectorized=True, 
+                            use_numpy=True, workers=pool, chunks=2, 
+                            **_options)
+        assert max(sizes) > 1
+        assert (solution.pointset == serial.pointset).all()